@@ -1,9 +1,18 @@
 import logging
 
 import click
+from web3 import Web3
 
 from cli.app import create_app
+from scsc.multi_supply_chain import MultiSupplyChain
 from scsc.supply_chain import SupplyChain
+from scsc.traces import (
+    STRATEGIES,
+    AddressKindCache,
+    ParquetTraceSource,
+    TraceCache,
+)
+from scsc.transitive_supply_chain import TransitiveSupplyChain
 
 
 @click.group()
@@ -28,17 +37,72 @@ def main():
 )
 @click.option("--export-dot", type=str, help="Export call graph to DOT file")
 @click.option("--export-json", type=str, help="Export call graph to JSON file")
+@click.option(
+    "--export-snapshot",
+    type=str,
+    help="Export call graph to a binary snapshot file",
+)
 @click.option("--log-level", default="ERROR", type=str, help="Logging level")
+@click.option(
+    "--batch-size",
+    type=int,
+    help="Number of transactions traced per JSON-RPC batch request",
+)
+@click.option(
+    "--address-cache",
+    type=str,
+    help="SQLite file persisting address kinds across runs",
+)
+@click.option(
+    "--trace-cache",
+    type=str,
+    help="SQLite file persisting the traces of finalized blocks",
+)
+@click.option(
+    "--strategy",
+    default="transaction",
+    type=click.Choice(STRATEGIES),
+    help="Trace collection strategy",
+)
+@click.option(
+    "--workers",
+    type=int,
+    help="Number of worker processes the block range is sharded across",
+)
 def analyze(
-    url, address, from_block, to_block, export_dot, export_json, log_level
+    url,
+    address,
+    from_block,
+    to_block,
+    export_dot,
+    export_json,
+    export_snapshot,
+    log_level,
+    batch_size,
+    address_cache,
+    trace_cache,
+    strategy,
+    workers,
 ):
     """Analyze contract calls and generate dependency graph"""
     logging.basicConfig(level=log_level.upper())
     logger = logging.getLogger(__name__)
 
     try:
-        supply_chain = SupplyChain(url, address)
-        supply_chain.collect_calls(from_block, to_block)
+        supply_chain = SupplyChain(
+            url,
+            address,
+            batch_size=batch_size,
+            address_cache=AddressKindCache(path=address_cache),
+            trace_cache=TraceCache(trace_cache) if trace_cache else None,
+        )
+        supply_chain.collect_calls(
+            from_block,
+            to_block,
+            strategy=strategy,
+            workers=workers,
+            progress=_print_progress,
+        )
 
         print(f"Contract address: {address}")
         print("Called addresses:")
@@ -53,10 +117,288 @@ def analyze(
         if export_json:
             supply_chain.export_json(export_json)
             logger.info(f"Call graph exported to JSON file: {export_json}")
+
+        if export_snapshot:
+            supply_chain.export_snapshot(export_snapshot)
+            logger.info(f"Call graph exported to snapshot: {export_snapshot}")
     except Exception as e:
         logger.error(f"analyze: {e}")
 
 
+def _print_progress(done: int, total: int) -> None:
+    click.echo(
+        f"Progress: {done}/{total} blocks ({done / total * 100:.2f}%)",
+        err=True,
+    )
+
+
+def _read_addresses(filename: str) -> list[str]:
+    """
+    Reads the addresses in the first column of a CSV or text file,
+    skipping lines that are not addresses such as headers.
+    """
+    with open(filename, encoding="utf-8-sig") as f:
+        rows = (line.split(",")[0].strip().strip('"') for line in f)
+        return [a for a in rows if Web3.is_address(a)]
+
+
+@main.command(name="analyze-many")
+@click.option(
+    "--url",
+    default="http://localhost:8545",
+    type=str,
+    help="Ethereum node URL",
+)
+@click.option("--address", "addresses", multiple=True, help="Contract address")
+@click.option(
+    "--addresses-file",
+    type=str,
+    help="CSV or text file with contract addresses in the first column",
+)
+@click.option(
+    "--from-block", required=True, type=str, help="Starting block number"
+)
+@click.option(
+    "--to-block", required=True, type=str, help="Ending block number"
+)
+@click.option(
+    "--export-dot",
+    type=str,
+    help="Export call graphs to DOT files in a directory",
+)
+@click.option(
+    "--export-json", type=str, help="Export call graphs to JSON file"
+)
+@click.option("--log-level", default="ERROR", type=str, help="Logging level")
+@click.option(
+    "--batch-size",
+    type=int,
+    help="Number of transactions traced per JSON-RPC batch request",
+)
+@click.option(
+    "--address-cache",
+    type=str,
+    help="SQLite file persisting address kinds across runs",
+)
+@click.option(
+    "--trace-cache",
+    type=str,
+    help="SQLite file persisting the traces of finalized blocks",
+)
+@click.option(
+    "--strategy",
+    default="transaction",
+    type=click.Choice(STRATEGIES),
+    help="Trace collection strategy",
+)
+@click.option(
+    "--compact",
+    is_flag=True,
+    help="Store the call graphs in arrays, for large union graphs",
+)
+def analyze_many(
+    url,
+    addresses,
+    addresses_file,
+    from_block,
+    to_block,
+    export_dot,
+    export_json,
+    log_level,
+    batch_size,
+    address_cache,
+    trace_cache,
+    strategy,
+    compact,
+):
+    """Analyze the calls of several contracts in one trace pass"""
+    logging.basicConfig(level=log_level.upper())
+    logger = logging.getLogger(__name__)
+
+    try:
+        addresses = list(addresses)
+        if addresses_file:
+            addresses += _read_addresses(addresses_file)
+        if not addresses:
+            raise click.UsageError(
+                "Provide --address or --addresses-file with contract addresses"
+            )
+        supply_chains = MultiSupplyChain(
+            url,
+            addresses,
+            batch_size=batch_size,
+            address_cache=AddressKindCache(path=address_cache),
+            trace_cache=TraceCache(trace_cache) if trace_cache else None,
+            compact=compact,
+        )
+        supply_chains.collect_calls(from_block, to_block, strategy=strategy)
+
+        for address, deps in supply_chains.get_all_dependencies().items():
+            print(f"Contract address: {address}")
+            print(f"Total addresses: {len(deps)}")
+        print(
+            f"Total addresses in union: "
+            f"{len(supply_chains.union.get_all_contracts())}"
+        )
+
+        if export_dot:
+            supply_chains.export_dot(export_dot)
+            logger.info(f"Call graphs exported to DOT files: {export_dot}")
+
+        if export_json:
+            supply_chains.export_json(export_json)
+            logger.info(f"Call graphs exported to JSON file: {export_json}")
+    except Exception as e:
+        logger.error(f"analyze-many: {e}")
+
+
+@main.command(name="expand")
+@click.option(
+    "--url",
+    default="http://localhost:8545",
+    type=str,
+    help="Ethereum node URL",
+)
+@click.option("--address", required=True, type=str, help="Contract address")
+@click.option(
+    "--from-block", required=True, type=str, help="Starting block number"
+)
+@click.option(
+    "--to-block", required=True, type=str, help="Ending block number"
+)
+@click.option(
+    "--hops",
+    default=2,
+    type=int,
+    help="Number of hops of dependencies whose own calls are traced",
+)
+@click.option(
+    "--max-contracts",
+    default=100,
+    type=int,
+    help="Maximum number of contracts traced",
+)
+@click.option(
+    "--workers", default=8, type=int, help="Contracts traced in parallel"
+)
+@click.option("--export-dot", type=str, help="Export call graph to DOT file")
+@click.option("--export-json", type=str, help="Export call graph to JSON file")
+@click.option("--log-level", default="ERROR", type=str, help="Logging level")
+@click.option(
+    "--address-cache",
+    type=str,
+    help="SQLite file persisting address kinds across runs",
+)
+@click.option(
+    "--trace-cache",
+    type=str,
+    help="SQLite file persisting the traces of finalized blocks",
+)
+@click.option(
+    "--strategy",
+    default="transaction",
+    type=click.Choice(STRATEGIES),
+    help="Trace collection strategy",
+)
+def expand(
+    url,
+    address,
+    from_block,
+    to_block,
+    hops,
+    max_contracts,
+    workers,
+    export_dot,
+    export_json,
+    log_level,
+    address_cache,
+    trace_cache,
+    strategy,
+):
+    """Expand the dependencies of a contract transitively"""
+    logging.basicConfig(level=log_level.upper())
+    logger = logging.getLogger(__name__)
+
+    try:
+        supply_chain = TransitiveSupplyChain(
+            url,
+            address,
+            address_cache=AddressKindCache(path=address_cache),
+            trace_cache=TraceCache(trace_cache) if trace_cache else None,
+        )
+        layers = supply_chain.expand(
+            from_block,
+            to_block,
+            max_hops=hops,
+            max_contracts=max_contracts,
+            workers=workers,
+            strategy=strategy,
+        )
+
+        print(f"Contract address: {address}")
+        for dep in supply_chain.get_all_dependencies():
+            print(f"{layers[dep]} {dep}")
+        print(f"Total addresses: {len(layers) - 1}")
+
+        if export_dot:
+            supply_chain.export_dot(export_dot)
+            logger.info(f"Call graph exported to DOT file: {export_dot}")
+
+        if export_json:
+            supply_chain.export_json(export_json)
+            logger.info(f"Call graph exported to JSON file: {export_json}")
+    except Exception as e:
+        logger.error(f"expand: {e}")
+
+
+@main.command(name="analyze-parquet")
+@click.option(
+    "--parquet",
+    required=True,
+    type=str,
+    help="cryo traces Parquet file or glob pattern",
+)
+@click.option("--address", required=True, type=str, help="Contract address")
+@click.option("--from-block", type=str, help="Starting block number")
+@click.option("--to-block", type=str, help="Ending block number")
+@click.option("--export-dot", type=str, help="Export call graph to DOT file")
+@click.option("--export-json", type=str, help="Export call graph to JSON file")
+@click.option("--log-level", default="ERROR", type=str, help="Logging level")
+def analyze_parquet(
+    parquet,
+    address,
+    from_block,
+    to_block,
+    export_dot,
+    export_json,
+    log_level,
+):
+    """Analyze contract calls from cryo trace dumps without a node"""
+    logging.basicConfig(level=log_level.upper())
+    logger = logging.getLogger(__name__)
+
+    try:
+        source = ParquetTraceSource(parquet)
+        cg = source.get_call_graph(address, from_block, to_block)
+        deps = [a for a in cg.get_all_contracts() if a != cg.contract_address]
+
+        print(f"Contract address: {address}")
+        print("Called addresses:")
+        for dep in deps:
+            print(dep)
+        print(f"Total addresses: {len(deps)}")
+
+        if export_dot:
+            cg.export_dot(export_dot)
+            logger.info(f"Call graph exported to DOT file: {export_dot}")
+
+        if export_json:
+            cg.export_json(export_json)
+            logger.info(f"Call graph exported to JSON file: {export_json}")
+    except Exception as e:
+        logger.error(f"analyze-parquet: {e}")
+
+
 @main.command(name="web")
 @click.option(
     "--url",
@@ -1,3 +1,5 @@
+from scsc.multi_supply_chain import MultiSupplyChain
 from scsc.supply_chain import SupplyChain
+from scsc.transitive_supply_chain import TransitiveSupplyChain
 
-__all__ = ["SupplyChain"]
+__all__ = ["SupplyChain", "MultiSupplyChain", "TransitiveSupplyChain"]
@@ -1,3 +1,12 @@
+from scsc.graph.analytics import GraphAnalytics
 from scsc.graph.call_graph import CallGraph
+from scsc.graph.compact_call_graph import CompactCallGraph
+from scsc.graph.snapshot import read_snapshot, write_snapshot
 
-__all__ = ["CallGraph"]
+__all__ = [
+    "CallGraph",
+    "CompactCallGraph",
+    "GraphAnalytics",
+    "read_snapshot",
+    "write_snapshot",
+]
@@ -0,0 +1,201 @@
+from typing import Callable, Dict, List, Optional, Tuple
+
+import networkx as nx
+import numpy as np
+from scipy import sparse
+from scipy.sparse import csgraph
+
+
+class GraphAnalytics:
+    """
+    Derived metrics of a call graph, cached until the graph changes.
+
+    Metrics that only depend on which edges exist, such as components
+    and reachability, are kept while calls are added to existing edges,
+    and metrics weighted by call counts, such as PageRank, are recomputed
+    after any change. The graph is read through `iter_edges`, so both
+    `CallGraph` and `CompactCallGraph` are supported, and PageRank and
+    reachability run on a SciPy sparse adjacency matrix.
+    """
+
+    def __init__(self, cg):
+        """
+        Initializes the analytics of a call graph. Changes made to the
+        graph through its methods invalidate the cached metrics, changes
+        made directly to its `networkx` graph do not.
+        """
+        self.cg = cg
+        self._cache: Dict[Tuple, object] = {}
+        self._versions = (-1, -1)
+
+    def _cached(self, key: Tuple, weighted: bool, compute: Callable):
+        """
+        Returns a cached metric, dropping the metrics that the changes to
+        the graph since they were computed invalidate.
+        """
+        versions = (self.cg.structure_version, self.cg.version)
+        if versions != self._versions:
+            if versions[0] != self._versions[0]:
+                self._cache.clear()
+            else:
+                self._cache = {
+                    k: v for k, v in self._cache.items() if not k[0]
+                }
+            self._versions = versions
+        key = (weighted, *key)
+        if key not in self._cache:
+            self._cache[key] = compute()
+        return self._cache[key]
+
+    def _matrix(self) -> Tuple[List[str], Dict[str, int], sparse.csr_array]:
+        """
+        Returns the contracts, their indexes and the adjacency matrix
+        weighted by the number of calls of each edge.
+        """
+
+        def compute():
+            nodes = self.cg.get_all_contracts()
+            index = {a: i for i, a in enumerate(nodes)}
+            rows, cols, weights = [], [], []
+            for u, v, types in self.cg.iter_edges():
+                rows.append(index[u])
+                cols.append(index[v])
+                weights.append(sum(types.values()))
+            matrix = sparse.csr_array(
+                (
+                    np.asarray(weights, dtype=float),
+                    (np.asarray(rows, dtype=np.int64), np.asarray(cols)),
+                ),
+                shape=(len(nodes), len(nodes)),
+            )
+            return nodes, index, matrix
+
+        return self._cached(("matrix",), True, compute)
+
+    def pagerank(
+        self,
+        alpha: float = 0.85,
+        weighted: bool = True,
+        tol: float = 1.0e-6,
+        max_iter: int = 100,
+    ) -> Dict[str, float]:
+        """
+        Returns the PageRank of each contract, computed by power iteration
+        on the sparse adjacency matrix. Edges are weighted by their number
+        of calls if `weighted` is set. Contracts that call nothing spread
+        their rank uniformly, as in `networkx.pagerank`.
+        Raises:
+            RuntimeError: If the iteration does not converge
+        """
+
+        def compute():
+            nodes, _, matrix = self._matrix()
+            n = len(nodes)
+            if n == 0:
+                return {}
+            if not weighted:
+                matrix = (matrix > 0).astype(float)
+            out = np.asarray(matrix.sum(axis=1)).ravel()
+            dangling = out == 0
+            scale = np.divide(1.0, out, out=np.zeros(n), where=~dangling)
+            transition = (sparse.diags_array(scale) @ matrix).T.tocsr()
+            rank = np.full(n, 1.0 / n)
+            for _ in range(max_iter):
+                previous = rank
+                rank = (
+                    alpha * (transition @ rank + rank[dangling].sum() / n)
+                    + (1 - alpha) / n
+                )
+                if np.abs(rank - previous).sum() < n * tol:
+                    return dict(zip(nodes, rank.tolist(), strict=True))
+            raise RuntimeError(
+                f"PageRank did not converge in {max_iter} iterations."
+            )
+
+        return self._cached(("pagerank", alpha, tol, max_iter), True, compute)
+
+    def reachable(self, address: Optional[str] = None) -> List[str]:
+        """
+        Returns the contracts reachable from a contract through calls,
+        excluding itself, by default from the contract of the graph.
+        Raises:
+            ValueError: If the address is not in the graph
+        """
+        if address is None:
+            address = self.cg.contract_address
+
+        def compute():
+            nodes, index, matrix = self._matrix()
+            if address not in index:
+                raise ValueError(f"Address not in the call graph: {address}")
+            order = csgraph.breadth_first_order(
+                matrix,
+                index[address],
+                directed=True,
+                return_predecessors=False,
+            )
+            return [nodes[i] for i in order[1:]]
+
+        return self._cached(("reachable", address), False, compute)
+
+    def strongly_connected_components(self) -> List[List[str]]:
+        """
+        Returns the groups of contracts that call each other in a cycle,
+        largest first. Contracts that are not in a cycle are left out.
+        """
+
+        def compute():
+            nodes, _, matrix = self._matrix()
+            if not nodes:
+                return []
+            _, labels = csgraph.connected_components(
+                matrix, directed=True, connection="strong"
+            )
+            components: Dict[int, List[str]] = {}
+            for a, label in zip(nodes, labels.tolist(), strict=True):
+                components.setdefault(label, []).append(a)
+            return sorted(
+                (c for c in components.values() if len(c) > 1),
+                key=len,
+                reverse=True,
+            )
+
+        return self._cached(("scc",), False, compute)
+
+    def single_points_of_failure(
+        self, address: Optional[str] = None
+    ) -> Dict[str, List[str]]:
+        """
+        Returns the contracts that every call path from a contract, by
+        default the contract of the graph, goes through to reach other
+        contracts, mapped to the contracts that depend on them that way.
+        Raises:
+            ValueError: If the address is not in the graph
+        """
+        if address is None:
+            address = self.cg.contract_address
+
+        def compute():
+            if address not in self._matrix()[1]:
+                raise ValueError(f"Address not in the call graph: {address}")
+            dominators = nx.immediate_dominators(self.cg.G, address)
+            dependents: Dict[str, List[str]] = {}
+            for node in dominators:
+                dominator = dominators[node]
+                while dominator != address:
+                    dependents.setdefault(dominator, []).append(node)
+                    dominator = dominators[dominator]
+            return dependents
+
+        return self._cached(("spof", address), False, compute)
+
+    def articulation_points(self) -> List[str]:
+        """
+        Returns the contracts whose removal disconnects the graph,
+        ignoring the direction of the calls.
+        """
+
+        def compute():
+            return list(nx.articulation_points(self.cg.G.to_undirected()))
+
+        return self._cached(("articulation",), False, compute)
@@ -1,38 +1,139 @@
 import json
-from typing import Any, Dict, List
+from collections import Counter
+from typing import Any, Dict, Iterable, Iterator, List, Mapping, Tuple
 
 import networkx as nx
+import numpy as np
 from networkx.drawing.nx_pydot import write_dot
 
+from scsc.graph.analytics import GraphAnalytics
+from scsc.graph.snapshot import read_snapshot, write_snapshot
+
 
 class CallGraph:
     """
     Represents a call graph for a smart contract.
     """
 
-    def __init__(self, contract_address: str):
+    def __init__(self, contract_address: str | None):
         """
-        Initializes the CallGraph with a contract address.
+        Initializes the CallGraph with a contract address,
+        or None for the graph of several contracts.
         """
         self.G = nx.DiGraph()
         self.contract_address = contract_address
+        # Incremented on every change, and on changes to the set of edges
+        self.version = 0
+        self.structure_version = 0
+        self._analytics = None
+
+    @property
+    def analytics(self) -> GraphAnalytics:
+        """
+        Cached metrics of the graph, see `GraphAnalytics`.
+        """
+        if self._analytics is None:
+            self._analytics = GraphAnalytics(self)
+        return self._analytics
 
-    def _add_labeled_edge(self, u, v, label):
+    def _add_labeled_edge(self, u, v, label, count=1):
+        self.version += 1
         if self.G.has_edge(u, v):
             # If edge already exists, update the label count
             types = self.G[u][v].setdefault("types", {})
-            types[label] = types.get(label, 0) + 1
+            types[label] = types.get(label, 0) + count
         else:
             # New edge with initial label count
-            self.G.add_edge(u, v, types={label: 1})
+            self.G.add_edge(u, v, types={label: count})
+            self.structure_version += 1
 
     def add_call(
-        self, from_address: str, to_address: str, call_type: str
+        self,
+        from_address: str,
+        to_address: str,
+        call_type: str,
+        count: int = 1,
+    ) -> None:
+        """
+        Adds a call edge to the graph, or `count` calls of the same type.
+        """
+        self._add_labeled_edge(from_address, to_address, call_type, count)
+
+    def add_calls(self, calls: Iterable[Dict[str, str]]) -> None:
+        """
+        Adds calls in dict format, counting the calls of each edge and
+        type first so that each of them is written to the graph once.
+        """
+        self.add_edge_counts(
+            Counter((c["from"], c["to"], c["type"]) for c in calls)
+        )
+
+    def add_edge_counts(
+        self, counts: Mapping[Tuple[str, str, str], int]
+    ) -> None:
+        """
+        Adds the counts of calls of (from, to, type) triples.
+        """
+        for (u, v, call_type), count in counts.items():
+            self._add_labeled_edge(u, v, call_type, count)
+
+    @classmethod
+    def from_edge_counts(
+        cls,
+        contract_address: str | None,
+        counts: Mapping[Tuple[str, str, str], int],
+    ) -> "CallGraph":
+        """
+        Creates a call graph from the counts of calls of
+        (from, to, type) triples, e.g. `CallBuffer.edge_counts()`.
+        """
+        cg = cls(contract_address)
+        cg.add_edge_counts(counts)
+        return cg
+
+    def remove_call(
+        self,
+        from_address: str,
+        to_address: str,
+        call_type: str,
+        count: int = 1,
     ) -> None:
         """
-        Adds a call edge to the graph.
+        Removes `count` calls of a type from an edge. The edge is removed
+        once it has no calls left, and its endpoints once they have no
+        edges left.
+        """
+        if not self.G.has_edge(from_address, to_address):
+            return
+        self.version += 1
+        types = self.G[from_address][to_address].setdefault("types", {})
+        remaining = types.get(call_type, 0) - count
+        if remaining > 0:
+            types[call_type] = remaining
+        else:
+            types.pop(call_type, None)
+        if not types:
+            self.structure_version += 1
+            self.G.remove_edge(from_address, to_address)
+            for node in {from_address, to_address}:
+                if self.G.degree(node) == 0:
+                    self.G.remove_node(node)
+
+    def merge(self, other: "CallGraph") -> None:
+        """
+        Adds the calls of another call graph, summing the counts
+        of the call types of common edges.
         """
-        self._add_labeled_edge(from_address, to_address, call_type)
+        for u, v, types in other.iter_edges():
+            for call_type, count in types.items():
+                self._add_labeled_edge(u, v, call_type, count)
+
+    def iter_edges(self) -> Iterator[Tuple[str, str, Dict[str, int]]]:
+        """
+        Yields the edges with the count of each of their call types.
+        """
+        for u, v, data in self.G.edges(data=True):
+            yield u, v, data.get("types", {})
 
     def get_all_contracts(self) -> List[str]:
         """
@@ -76,3 +177,34 @@ class CallGraph:
         """
         with open(filename, "w") as f:
             json.dump(self.to_json(), f)
+
+    def export_snapshot(self, filename: str) -> None:
+        """
+        Exports the graph to a binary snapshot, see `write_snapshot`.
+        """
+        write_snapshot(self, filename)
+
+    @classmethod
+    def load_snapshot(cls, filename: str) -> "CallGraph":
+        """
+        Loads a graph exported with `export_snapshot`.
+        """
+        contract_address, nodes, sources, targets, counts = read_snapshot(
+            filename
+        )
+        types: List[Dict[str, int]] = [{} for _ in range(len(sources))]
+        for call_type, column in counts.items():
+            edges = np.flatnonzero(column)
+            for edge, count in zip(
+                edges.tolist(), column[edges].tolist(), strict=True
+            ):
+                types[edge][call_type] = count
+        cg = cls(contract_address)
+        cg.G.add_nodes_from(nodes)
+        cg.G.add_edges_from(
+            (nodes[u], nodes[v], {"types": t})
+            for u, v, t in zip(
+                sources.tolist(), targets.tolist(), types, strict=True
+            )
+        )
+        return cg
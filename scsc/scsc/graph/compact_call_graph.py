@@ -0,0 +1,352 @@
+import json
+from array import array
+from collections import Counter
+from typing import (
+    Any,
+    Dict,
+    Iterable,
+    Iterator,
+    List,
+    Mapping,
+    Optional,
+    Tuple,
+)
+
+import networkx as nx
+import numpy as np
+from networkx.drawing.nx_pydot import write_dot
+
+from scsc.graph.analytics import GraphAnalytics
+from scsc.graph.call_graph import CallGraph
+from scsc.graph.snapshot import read_snapshot, write_snapshot
+
+
+class CompactCallGraph:
+    """
+    Call graph with the same API as `CallGraph`, stored in arrays for
+    graphs with many edges, such as the union graphs of whole protocols.
+
+    Addresses are interned into node IDs and the edges are kept as COO
+    arrays of source and target IDs, with one count column per call type.
+    Successors and predecessors are looked up in CSR indexes built on
+    demand, and the `networkx` graph is only built when `G` is accessed.
+    """
+
+    def __init__(self, contract_address: str | None):
+        """
+        Initializes the CompactCallGraph with a contract address,
+        or None for the graph of several contracts.
+        """
+        self.contract_address = contract_address
+        self._ids: Dict[str, int] = {}
+        self._nodes: List[str] = []
+        self._degrees = array("I")
+        # Edge index of each (source, target) pair, keyed by
+        # source << 32 | target
+        self._edges: Dict[int, int] = {}
+        self._sources = array("I")
+        self._targets = array("I")
+        self._counts: Dict[str, array] = {}
+        self._csr: Optional[Tuple[np.ndarray, ...]] = None
+        self._graph: Optional[nx.DiGraph] = None
+        # Incremented on every change, and on changes to the set of edges
+        self.version = 0
+        self.structure_version = 0
+        self._analytics = None
+
+    @property
+    def analytics(self) -> GraphAnalytics:
+        """
+        Cached metrics of the graph, see `GraphAnalytics`.
+        """
+        if self._analytics is None:
+            self._analytics = GraphAnalytics(self)
+        return self._analytics
+
+    def _intern(self, address: str) -> int:
+        i = self._ids.get(address)
+        if i is None:
+            i = self._ids[address] = len(self._nodes)
+            self._nodes.append(address)
+            self._degrees.append(0)
+        return i
+
+    def _changed(self, structure: bool) -> None:
+        self.version += 1
+        if structure:
+            self.structure_version += 1
+            self._csr = None
+        self._graph = None
+
+    def add_call(
+        self,
+        from_address: str,
+        to_address: str,
+        call_type: str,
+        count: int = 1,
+    ) -> None:
+        """
+        Adds a call edge to the graph, or `count` calls of the same type.
+        """
+        u, v = self._intern(from_address), self._intern(to_address)
+        key = u << 32 | v
+        edge = self._edges.get(key)
+        if edge is None:
+            edge = self._edges[key] = len(self._sources)
+            self._sources.append(u)
+            self._targets.append(v)
+            for column in self._counts.values():
+                column.append(0)
+            self._degrees[u] += 1
+            self._degrees[v] += 1
+            self._changed(True)
+        column = self._counts.get(call_type)
+        if column is None:
+            column = self._counts[call_type] = array(
+                "Q", bytes(8 * len(self._sources))
+            )
+        column[edge] += count
+        self._changed(False)
+
+    def add_calls(self, calls: Iterable[Dict[str, str]]) -> None:
+        """
+        Adds calls in dict format, counting the calls of each edge and
+        type first so that each of them is written to the graph once.
+        """
+        self.add_edge_counts(
+            Counter((c["from"], c["to"], c["type"]) for c in calls)
+        )
+
+    def add_edge_counts(
+        self, counts: Mapping[Tuple[str, str, str], int]
+    ) -> None:
+        """
+        Adds the counts of calls of (from, to, type) triples.
+        """
+        for (u, v, call_type), count in counts.items():
+            self.add_call(u, v, call_type, count)
+
+    @classmethod
+    def from_edge_counts(
+        cls,
+        contract_address: str | None,
+        counts: Mapping[Tuple[str, str, str], int],
+    ) -> "CompactCallGraph":
+        """
+        Creates a call graph from the counts of calls of
+        (from, to, type) triples, e.g. `CallBuffer.edge_counts()`.
+        """
+        cg = cls(contract_address)
+        cg.add_edge_counts(counts)
+        return cg
+
+    def remove_call(
+        self,
+        from_address: str,
+        to_address: str,
+        call_type: str,
+        count: int = 1,
+    ) -> None:
+        """
+        Removes `count` calls of a type from an edge. The edge is removed
+        once it has no calls left, and its endpoints once they have no
+        edges left.
+        """
+        u, v = self._ids.get(from_address), self._ids.get(to_address)
+        if u is None or v is None:
+            return
+        edge = self._edges.get(u << 32 | v)
+        if edge is None:
+            return
+        column = self._counts.get(call_type)
+        if column is not None:
+            column[edge] = max(column[edge] - count, 0)
+        if not any(c[edge] for c in self._counts.values()):
+            self._remove_edge(edge)
+            self._changed(True)
+        else:
+            self._changed(False)
+
+    def _remove_edge(self, edge: int) -> None:
+        """
+        Removes an edge by moving the last edge into its slot.
+        """
+        u, v = self._sources[edge], self._targets[edge]
+        del self._edges[u << 32 | v]
+        self._degrees[u] -= 1
+        self._degrees[v] -= 1
+        last = len(self._sources) - 1
+        if edge != last:
+            self._sources[edge] = self._sources[last]
+            self._targets[edge] = self._targets[last]
+            for column in self._counts.values():
+                column[edge] = column[last]
+            self._edges[self._sources[edge] << 32 | self._targets[edge]] = edge
+        for column in (self._sources, self._targets, *self._counts.values()):
+            column.pop()
+
+    def merge(self, other: "CallGraph | CompactCallGraph") -> None:
+        """
+        Adds the calls of another call graph, summing the counts
+        of the call types of common edges.
+        """
+        for u, v, types in other.iter_edges():
+            for call_type, count in types.items():
+                self.add_call(u, v, call_type, count)
+
+    def iter_edges(self) -> Iterator[Tuple[str, str, Dict[str, int]]]:
+        """
+        Yields the edges with the count of each of their call types.
+        """
+        nodes, counts = self._nodes, self._counts
+        for edge, (u, v) in enumerate(
+            zip(self._sources, self._targets, strict=True)
+        ):
+            yield nodes[u], nodes[v], {
+                call_type: column[edge]
+                for call_type, column in counts.items()
+                if column[edge]
+            }
+
+    def get_all_contracts(self) -> List[str]:
+        """
+        Returns a list of all contracts in the graph.
+        """
+        return [
+            a for a, d in zip(self._nodes, self._degrees, strict=True) if d
+        ]
+
+    def _index(self) -> Tuple[np.ndarray, ...]:
+        """
+        Builds the CSR indexes of the successors and predecessors.
+        """
+        if self._csr is None:
+            n = len(self._nodes)
+            sources = np.frombuffer(self._sources, dtype=np.uint32)
+            targets = np.frombuffer(self._targets, dtype=np.uint32)
+            by_source = np.argsort(sources, kind="stable")
+            by_target = np.argsort(targets, kind="stable")
+            self._csr = (
+                np.concatenate(
+                    ([0], np.cumsum(np.bincount(sources, None, n)))
+                ),
+                targets[by_source],
+                np.concatenate(
+                    ([0], np.cumsum(np.bincount(targets, None, n)))
+                ),
+                sources[by_target],
+            )
+        return self._csr
+
+    def _node(self, address: str) -> int:
+        i = self._ids.get(address)
+        if i is None or not self._degrees[i]:
+            raise nx.NetworkXError(
+                f"The node {address} is not in the digraph."
+            )
+        return i
+
+    def get_callee_contracts(self, address: str) -> List[str]:
+        """
+        Returns a list of contracts called by the given address.
+        """
+        i = self._node(address)
+        indptr, indices, _, _ = self._index()
+        return [self._nodes[j] for j in indices[indptr[i] : indptr[i + 1]]]
+
+    def get_caller_contracts(self, address: str) -> List[str]:
+        """
+        Returns a list of contracts that called the given address.
+        """
+        i = self._node(address)
+        _, _, indptr, indices = self._index()
+        return [self._nodes[j] for j in indices[indptr[i] : indptr[i + 1]]]
+
+    @property
+    def G(self) -> nx.DiGraph:
+        """
+        The call graph as a `networkx` graph, built on first access after
+        each change. Changes made to it are not reflected in the arrays.
+        """
+        if self._graph is None:
+            G = nx.DiGraph()
+            G.add_nodes_from(self.get_all_contracts())
+            G.add_edges_from(
+                (u, v, {"types": types}) for u, v, types in self.iter_edges()
+            )
+            self._graph = G
+        return self._graph
+
+    def get_graph(self) -> nx.DiGraph:
+        """
+        Returns the graph object.
+        """
+        return self.G.graph
+
+    def export_dot(self, filename: str) -> None:
+        """
+        Exports the graph to a DOT file.
+        """
+        write_dot(self.G, filename)
+
+    def to_json(self) -> Dict[str, Any]:
+        """
+        Converts the graph to the same JSON serializable format as
+        `CallGraph.to_json`, without building the `networkx` graph.
+        """
+        return {
+            "directed": True,
+            "multigraph": False,
+            "graph": {},
+            "nodes": [{"id": a} for a in self.get_all_contracts()],
+            "edges": [
+                {"types": types, "source": u, "target": v}
+                for u, v, types in self.iter_edges()
+            ],
+        }
+
+    def export_json(self, filename: str) -> None:
+        """
+        Exports the graph to a JSON file.
+        """
+        with open(filename, "w") as f:
+            json.dump(self.to_json(), f)
+
+    def export_snapshot(self, filename: str) -> None:
+        """
+        Exports the graph to a binary snapshot, see `write_snapshot`.
+        """
+        write_snapshot(self, filename)
+
+    @classmethod
+    def load_snapshot(cls, filename: str) -> "CompactCallGraph":
+        """
+        Loads a graph exported with `export_snapshot`, copying the edge
+        columns of the snapshot into the arrays of the graph as they are.
+        """
+        contract_address, nodes, sources, targets, counts = read_snapshot(
+            filename
+        )
+        n = len(nodes)
+        cg = cls(contract_address)
+        cg._nodes = nodes
+        cg._ids = {a: i for i, a in enumerate(nodes)}
+        cg._degrees = array(
+            "I",
+            (
+                np.bincount(sources, minlength=n)
+                + np.bincount(targets, minlength=n)
+            )
+            .astype(np.uint32)
+            .tobytes(),
+        )
+        keys = sources.astype(np.uint64) << np.uint64(32) | targets
+        cg._edges = dict(zip(keys.tolist(), range(len(keys)), strict=True))
+        cg._sources = array("I", sources.tobytes())
+        cg._targets = array("I", targets.tobytes())
+        cg._counts = {
+            call_type: array("Q", column.tobytes())
+            for call_type, column in counts.items()
+        }
+        cg._changed(True)
+        return cg
@@ -0,0 +1,113 @@
+from typing import Dict, List, Optional, Tuple
+
+import numpy as np
+
+try:
+    import pyarrow as pa
+except ImportError:  # pragma: no cover - optional dependency
+    pa = None
+
+# Version of the snapshot layout, stored in the schema metadata
+FORMAT_VERSION = b"1"
+
+# Prefix of the columns holding the call counts of each type
+TYPE_PREFIX = "types."
+
+
+def _require_pyarrow() -> None:
+    if pa is None:
+        raise ImportError(
+            "pyarrow is required for graph snapshots: "
+            "pip install scsc[parquet]"
+        )
+
+
+def _column(values: "pa.Array") -> "pa.LargeListArray":
+    """
+    Wraps an array into a list column of a single row.
+    """
+    return pa.LargeListArray.from_arrays(
+        pa.array([0, len(values)], pa.int64()), values
+    )
+
+
+def write_snapshot(cg, filename: str) -> None:
+    """
+    Writes a call graph to an Arrow IPC file.
+
+    The file holds a single row with the list of nodes, the source and
+    target node indexes of each edge and one count column per call type,
+    so that each of them is a contiguous buffer that can be mapped back
+    without copying it. The contract address is kept in the metadata.
+    Raises:
+        ImportError: If pyarrow is not installed
+    """
+    _require_pyarrow()
+    nodes = cg.get_all_contracts()
+    index = {a: i for i, a in enumerate(nodes)}
+    sources: List[int] = []
+    targets: List[int] = []
+    # Edge indexes and counts of each call type
+    types: Dict[str, Tuple[List[int], List[int]]] = {}
+    for edge, (u, v, edge_types) in enumerate(cg.iter_edges()):
+        sources.append(index[u])
+        targets.append(index[v])
+        for call_type, count in edge_types.items():
+            edges, counts = types.setdefault(call_type, ([], []))
+            edges.append(edge)
+            counts.append(count)
+
+    columns = {
+        "nodes": _column(pa.array(nodes, pa.string())),
+        "sources": _column(pa.array(sources, pa.uint32())),
+        "targets": _column(pa.array(targets, pa.uint32())),
+    }
+    for call_type, (edges, counts) in types.items():
+        column = np.zeros(len(sources), dtype=np.uint64)
+        column[edges] = counts
+        columns[TYPE_PREFIX + call_type] = _column(pa.array(column))
+    metadata = {b"scsc.snapshot": FORMAT_VERSION}
+    if cg.contract_address is not None:
+        metadata[b"contract_address"] = cg.contract_address.encode()
+    table = pa.table(columns).replace_schema_metadata(metadata)
+    with pa.ipc.new_file(filename, table.schema) as writer:
+        writer.write_table(table)
+
+
+def read_snapshot(
+    filename: str,
+) -> Tuple[
+    Optional[str], List[str], np.ndarray, np.ndarray, Dict[str, np.ndarray]
+]:
+    """
+    Reads a call graph written by `write_snapshot`. The file is
+    memory-mapped and the edge columns are returned as numpy views of it.
+    Returns:
+        The contract address, the nodes, the source and target node
+        indexes of the edges and the call counts of each type
+    Raises:
+        ImportError: If pyarrow is not installed
+        ValueError: If the file is not a call graph snapshot
+    """
+    _require_pyarrow()
+    with pa.memory_map(filename) as source:
+        table = pa.ipc.open_file(source).read_all()
+    metadata = table.schema.metadata or {}
+    if metadata.get(b"scsc.snapshot") != FORMAT_VERSION:
+        raise ValueError(f"Not a call graph snapshot: {filename}")
+    contract_address = metadata.get(b"contract_address")
+
+    def values(name: str) -> "pa.Array":
+        return table[name].chunk(0).values
+
+    return (
+        contract_address.decode() if contract_address else None,
+        values("nodes").to_pylist(),
+        values("sources").to_numpy(),
+        values("targets").to_numpy(),
+        {
+            name[len(TYPE_PREFIX) :]: values(name).to_numpy()
+            for name in table.column_names
+            if name.startswith(TYPE_PREFIX)
+        },
+    )
@@ -0,0 +1,130 @@
+import json
+import logging
+import os
+
+from web3 import Web3
+
+from scsc.graph import CallGraph, CompactCallGraph
+from scsc.traces import AddressKindCache, TraceCache, TraceCollector
+from scsc.utils import (
+    validate_and_convert_address,
+    validate_and_convert_block_range,
+)
+
+
+class MultiSupplyChain:
+    """
+    Collects the call graphs of several contracts over the same block
+    range, tracing each relevant transaction or block once.
+    """
+
+    def __init__(
+        self,
+        url: str,
+        contract_addresses: list[str],
+        batch_size: int | None = None,
+        address_cache: AddressKindCache | None = None,
+        max_depth: int | None = None,
+        trace_cache: TraceCache | None = None,
+        w3: Web3 | None = None,
+        compact: bool = False,
+    ):
+        """
+        Initializes the MultiSupplyChain with a URL and contract addresses.
+        The collector and graph options are the same as for `SupplyChain`.
+        Raises:
+            ValueError: If a contract address is invalid
+        """
+        self.logger = logging.getLogger(self.__class__.__name__)
+        self.tc = TraceCollector(
+            url,
+            batch_size=batch_size,
+            address_cache=address_cache,
+            max_depth=max_depth,
+            trace_cache=trace_cache,
+            w3=w3,
+        )
+        addresses = dict.fromkeys(
+            validate_and_convert_address(a) for a in contract_addresses
+        )
+        graph_class = CompactCallGraph if compact else CallGraph
+        self.graphs = {a: graph_class(a) for a in addresses}
+        self.union = graph_class(None)
+        self.logger.info(
+            f"Initialized MultiSupplyChain for {len(self.graphs)} contracts."
+        )
+
+    def collect_calls(
+        self,
+        from_block: str | int,
+        to_block: str | int,
+        strategy: str = "transaction",
+    ) -> None:
+        """
+        Collects the calls of all contracts and adds them to their call
+        graphs and to the union graph.
+        Args:
+            from_block: Block number in decimal or hex format
+            to_block: Block number in decimal or hex format
+            strategy: Collection strategy, one of `scsc.traces.STRATEGIES`
+        Raises:
+            ValueError: If from_block is greater than to_block
+                or no contract address is valid
+        """
+        self.logger.info(
+            f"Collecting calls from block {from_block} to {to_block}."
+        )
+        from_block_hex, to_block_hex = validate_and_convert_block_range(
+            from_block, to_block
+        )
+        calls = self.tc.get_calls_from_many(
+            from_block_hex, to_block_hex, list(self.graphs), strategy=strategy
+        )
+        # A frame below several of the contracts is the same object in each
+        # of their lists, and is only added once to the union graph.
+        unique = {}
+        for address, contract_calls in calls.items():
+            self.graphs[address].add_calls(contract_calls)
+            unique.update((id(c), c) for c in contract_calls)
+        self.union.add_calls(unique.values())
+        self.logger.info(f"Collected {len(unique)} calls.")
+
+    def get_all_dependencies(self) -> dict[str, list[str]]:
+        """
+        Returns the contracts in the call graph of each contract,
+        excluding the contract itself.
+        """
+        return {
+            address: [a for a in cg.get_all_contracts() if a != address]
+            for address, cg in self.graphs.items()
+        }
+
+    def export_dot(self, directory: str) -> None:
+        """
+        Exports the call graph of each contract to `<address>.dot`
+        and the union graph to `union.dot` in a directory.
+        """
+        self.logger.info(f"Exporting call graphs to DOT files: {directory}.")
+        os.makedirs(directory, exist_ok=True)
+        for address, cg in self.graphs.items():
+            cg.export_dot(os.path.join(directory, f"{address}.dot"))
+        self.union.export_dot(os.path.join(directory, "union.dot"))
+
+    def to_json(self) -> dict:
+        """
+        Converts the call graphs to a JSON serializable format.
+        """
+        return {
+            "contracts": {
+                address: cg.to_json() for address, cg in self.graphs.items()
+            },
+            "union": self.union.to_json(),
+        }
+
+    def export_json(self, filename: str) -> None:
+        """
+        Exports the call graphs to a JSON file.
+        """
+        self.logger.info(f"Exporting call graphs to JSON file: {filename}.")
+        with open(filename, "w") as f:
+            json.dump(self.to_json(), f)
@@ -1,8 +1,74 @@
 import logging
+from collections import Counter, defaultdict
+from multiprocessing import Pool
+from typing import AsyncIterator, Callable, Iterator
 
-from scsc.graph import CallGraph
-from scsc.traces import TraceCollector
-from scsc.utils import validate_and_convert_address, validate_and_convert_block
+from web3 import Web3
+
+from scsc.graph import CallGraph, CompactCallGraph
+from scsc.traces import (
+    AddressKindCache,
+    AsyncTraceCollector,
+    TraceCache,
+    TraceCollector,
+)
+from scsc.traces.call_buffer import CallBuffer
+from scsc.utils import (
+    validate_and_convert_address,
+    validate_and_convert_block,
+    validate_and_convert_block_range,
+)
+
+# Number of shards per worker process, so that faster workers pick up
+# the shards of slower ones
+SHARDS_PER_WORKER = 4
+
+# Trace collector of a worker process, created once per process
+_shard_collector: TraceCollector | None = None
+
+
+def _init_shard_worker(
+    url: str,
+    batch_size: int | None,
+    max_depth: int | None,
+    filter_workers: int,
+    address_cache: tuple[int, str | None],
+    trace_cache: tuple[str, int, int] | None,
+) -> None:
+    """
+    Creates the trace collector of a worker process. The caches are
+    given by their arguments and reopened in the process, so that the
+    workers share their persistent tiers with the parent process.
+    """
+    global _shard_collector
+    _shard_collector = TraceCollector(
+        url,
+        batch_size=batch_size,
+        address_cache=AddressKindCache(*address_cache),
+        filter_workers=filter_workers,
+        max_depth=max_depth,
+        trace_cache=TraceCache(*trace_cache) if trace_cache else None,
+    )
+
+
+def _collect_shard(
+    shard: tuple[int, int, str, str, str],
+) -> tuple[int, CallGraph, dict]:
+    """
+    Collects the calls of a shard of a block range in a worker process.
+    Returns the number of blocks of the shard, its partial call graph and
+    its calls counted per block.
+    """
+    start, end, contract_address, strategy, validation_block = shard
+    calls = _shard_collector.get_call_buffer(
+        hex(start),
+        hex(end),
+        contract_address,
+        strategy=strategy,
+        validation_block=validation_block,
+    )
+    cg = CallGraph.from_edge_counts(contract_address, calls.edge_counts())
+    return end - start + 1, cg, calls.block_edge_counts()
 
 
 class SupplyChain:
@@ -11,23 +77,90 @@ class SupplyChain:
     and processes call data from a blockchain.
     """
 
-    def __init__(self, url: str, contract_address: str):
+    def __init__(
+        self,
+        url: str,
+        contract_address: str,
+        batch_size: int | None = None,
+        max_concurrency: int = 16,
+        address_cache: AddressKindCache | None = None,
+        max_depth: int | None = None,
+        trace_cache: TraceCache | None = None,
+        w3: Web3 | None = None,
+        compact: bool = False,
+    ):
         """
         Initializes the SupplyChain with a URL and contract address.
+        Transactions are traced in JSON-RPC batches of `batch_size`
+        if it is given. The async methods keep at most `max_concurrency`
+        requests in flight. Both collectors share `address_cache`.
+        Calls nested deeper than `max_depth` are ignored if it is given.
+        Traces of finalized blocks are kept in `trace_cache` if it is given.
+        The synchronous collector reuses the connected `w3` if it is given,
+        e.g. from `scsc.utils.get_web3`. The call graph is a
+        `CompactCallGraph` if `compact` is set.
         """
         self.logger = logging.getLogger(self.__class__.__name__)
-        self.tc = TraceCollector(url)
+        self.url = url
+        if address_cache is None:
+            address_cache = AddressKindCache()
+        self.tc = TraceCollector(
+            url,
+            batch_size=batch_size,
+            address_cache=address_cache,
+            max_depth=max_depth,
+            trace_cache=trace_cache,
+            w3=w3,
+        )
+        # The async collector opens its own HTTP session, so it is only
+        # created by the async methods and released by `close_async`.
+        if max_concurrency < 1:
+            raise ValueError(
+                f"max_concurrency must be a positive integer: {max_concurrency}"
+            )
+        self.max_concurrency = max_concurrency
+        self._atc: AsyncTraceCollector | None = None
         contract_address = validate_and_convert_address(contract_address)
-        self.cg = CallGraph(contract_address)
+        self._graph_class = CompactCallGraph if compact else CallGraph
+        self.cg = self._graph_class(contract_address)
+        # Calls added to the graph per block, so that blocks can be removed
+        # when the window slides. Calls of unknown blocks are kept at None.
+        self._block_calls: defaultdict[int | None, Counter] = defaultdict(
+            Counter
+        )
+        self._window: tuple[int, int, str] | None = None
         self.logger.info(
             f"Initialized SupplyChain for contract {contract_address}."
         )
 
+    @property
+    def atc(self) -> AsyncTraceCollector:
+        """
+        Async trace collector, created on first use.
+        """
+        if self._atc is None:
+            self._atc = AsyncTraceCollector(
+                self.url,
+                max_concurrency=self.max_concurrency,
+                address_cache=self.tc.address_cache,
+                max_depth=self.tc.max_depth,
+            )
+        return self._atc
+
+    async def close_async(self) -> None:
+        """
+        Closes the async trace collector if it was created.
+        """
+        if self._atc is not None:
+            await self._atc.close()
+            self._atc = None
+
     def get_network(
         self,
         from_block: str | int | None,
         to_block: str | int | None,
         blocks: int = 10,
+        strategy: str = "transaction",
     ) -> dict:
         """
         Collects calls from the last 10 blocks and returns the call graph in JSON format.
@@ -38,7 +171,31 @@ class SupplyChain:
             from_block = latest_block - blocks
             to_block = latest_block
 
-        self.collect_calls(from_block, to_block)
+        self.update_window(from_block, to_block, strategy=strategy)
+        return self._network(from_block, to_block)
+
+    async def get_network_async(
+        self,
+        from_block: str | int | None,
+        to_block: str | int | None,
+        blocks: int = 10,
+    ) -> dict:
+        """
+        Async variant of `get_network` that does not block the event loop.
+        """
+        if from_block is None and to_block is None:
+            self.logger.info("Collecting calls from the last n blocks.")
+            latest_block = await self.atc.w3.eth.block_number
+            from_block = latest_block - blocks
+            to_block = latest_block
+
+        await self.update_window_async(from_block, to_block)
+        return self._network(from_block, to_block)
+
+    def _network(self, from_block: str | int, to_block: str | int) -> dict:
+        """
+        Returns the call graph of a block range in JSON format.
+        """
         edges = self.cg.to_json()["edges"]
         return {
             "contract_address": self.cg.contract_address,
@@ -50,34 +207,385 @@ class SupplyChain:
         }
 
     def collect_calls(
-        self, from_block: str | int, to_block: str | int
+        self,
+        from_block: str | int,
+        to_block: str | int,
+        strategy: str = "transaction",
+        workers: int | None = None,
+        progress: Callable[[int, int], None] | None = None,
+        validation_block: str | int | None = None,
     ) -> None:
         """
         Collects calls from the blockchain and adds them to the call graph.
         Args:
             from_block: Block number in decimal or hex format
             to_block: Block number in decimal or hex format
+            strategy: Collection strategy, one of `scsc.traces.STRATEGIES`
+            workers: Number of worker processes the block range is sharded
+                across, each with its own trace collector. The range is
+                collected in this process if None or 1.
+            progress: Called with the number of collected blocks and the
+                total number of blocks after each shard. Progress is logged
+                if None.
+            validation_block: Block number in decimal or hex format at
+                which the addresses are checked to be contracts, to_block
+                if None
         Raises:
             ValueError: If from_block is greater than to_block
+                or workers is not positive
         """
         self.logger.info(
             f"Collecting calls from block {from_block} to {to_block}."
         )
-        from_block_hex = validate_and_convert_block(from_block)
-        to_block_hex = validate_and_convert_block(to_block)
-
-        if int(from_block_hex, 16) > int(to_block_hex, 16):
-            raise ValueError(
-                f"from_block ({from_block}) must be less than or equal to to_block ({to_block})"
+        from_block_hex, to_block_hex = self._convert_block_range(
+            from_block, to_block
+        )
+        if workers is not None and workers < 1:
+            raise ValueError(f"workers must be a positive integer: {workers}")
+        validation_block_hex = (
+            to_block_hex
+            if validation_block is None
+            else validate_and_convert_block(validation_block)
+        )
+        if workers is not None and workers > 1:
+            self._collect_calls_parallel(
+                from_block_hex,
+                to_block_hex,
+                strategy,
+                workers,
+                progress or self._log_progress,
+                validation_block_hex,
             )
+            return
+        calls = self.tc.get_call_buffer(
+            from_block_hex,
+            to_block_hex,
+            self.cg.contract_address,
+            strategy=strategy,
+            validation_block=validation_block_hex,
+        )
+        self._add_call_buffer(calls)
 
-        calls = self.tc.get_calls_from(
+    def stream_calls(
+        self,
+        from_block: str | int,
+        to_block: str | int,
+        strategy: str = "transaction",
+    ) -> Iterator[dict]:
+        """
+        Collects calls like `collect_calls`, adding each call to the call
+        graph as soon as its transaction or block is traced, and yields it.
+        If the iteration stops early, the calls yielded so far stay in the
+        call graph.
+        Args:
+            from_block: Block number in decimal or hex format
+            to_block: Block number in decimal or hex format
+            strategy: Collection strategy, one of `scsc.traces.STRATEGIES`
+        Raises:
+            ValueError: If from_block is greater than to_block
+        """
+        from_block_hex, to_block_hex = self._convert_block_range(
+            from_block, to_block
+        )
+        for c in self.tc.iter_calls(
+            from_block_hex,
+            to_block_hex,
+            self.cg.contract_address,
+            strategy=strategy,
+        ):
+            self._add_call(c)
+            yield c
+
+    async def stream_calls_async(
+        self, from_block: str | int, to_block: str | int
+    ) -> AsyncIterator[dict]:
+        """
+        Async variant of `stream_calls` that traces transactions
+        concurrently and yields calls in completion order.
+        Raises:
+            ValueError: If from_block is greater than to_block
+            ConnectionError: If the Ethereum node is not reachable
+        """
+        from_block_hex, to_block_hex = self._convert_block_range(
+            from_block, to_block
+        )
+        await self.atc.connect()
+        async for c in self.atc.iter_calls(
             from_block_hex, to_block_hex, self.cg.contract_address
+        ):
+            self._add_call(c)
+            yield c
+
+    def _collect_calls_parallel(
+        self,
+        from_block: str,
+        to_block: str,
+        strategy: str,
+        workers: int,
+        progress: Callable[[int, int], None],
+        validation_block: str,
+    ) -> None:
+        """
+        Shards a block range across worker processes and merges
+        their partial call graphs into the call graph.
+        """
+        contract_address = self.cg.contract_address
+        if not self.tc._validate_contract(contract_address, validation_block):
+            raise ValueError("Invalid contract address or bytecode.")
+
+        start, end = int(from_block, 16), int(to_block, 16)
+        total = end - start + 1
+        size = -(-total // (workers * SHARDS_PER_WORKER))
+        shards = [
+            (
+                a,
+                min(a + size - 1, end),
+                contract_address,
+                strategy,
+                validation_block,
+            )
+            for a in range(start, end + 1, size)
+        ]
+        self.logger.info(
+            f"Collecting {len(shards)} shards with {workers} workers."
+        )
+
+        done = 0
+        n_calls = 0
+        with Pool(
+            processes=workers,
+            initializer=_init_shard_worker,
+            initargs=self._shard_worker_args(),
+        ) as pool:
+            for blocks, cg, block_calls in pool.imap_unordered(
+                _collect_shard, shards
+            ):
+                self.cg.merge(cg)
+                for block, counts in block_calls.items():
+                    self._block_calls[block].update(counts)
+                    n_calls += counts.total()
+                done += blocks
+                progress(done, total)
+        self.logger.info(f"Collected {n_calls} calls.")
+
+    def _shard_worker_args(self) -> tuple:
+        """
+        Returns the arguments of `_init_shard_worker` that rebuild the
+        trace collector of this supply chain in a worker process.
+        """
+        address_cache = self.tc.address_cache
+        trace_cache = self.tc.trace_cache
+        return (
+            self.url,
+            self.tc.batch_size,
+            self.tc.max_depth,
+            self.tc.filter_workers,
+            (address_cache.maxsize, address_cache.path),
+            (
+                (
+                    trace_cache.path,
+                    trace_cache.max_bytes,
+                    trace_cache.finality_depth,
+                )
+                if trace_cache is not None
+                else None
+            ),
         )
-        for c in calls:
-            self.cg.add_call(c["from"], c["to"], c["type"])
+
+    def _log_progress(self, done: int, total: int) -> None:
+        """
+        Logs the progress of a sharded collection.
+        """
+        self.logger.info(
+            f"Progress: {done}/{total} blocks ({done / total * 100:.2f}%)"
+        )
+
+    async def collect_calls_async(
+        self,
+        from_block: str | int,
+        to_block: str | int,
+        validation_block: str | int | None = None,
+    ) -> None:
+        """
+        Async variant of `collect_calls` that traces transactions concurrently.
+        Args:
+            from_block: Block number in decimal or hex format
+            to_block: Block number in decimal or hex format
+            validation_block: Block number in decimal or hex format at
+                which the addresses are checked to be contracts, to_block
+                if None
+        Raises:
+            ValueError: If from_block is greater than to_block
+            ConnectionError: If the Ethereum node is not reachable
+        """
+        self.logger.info(
+            f"Collecting calls from block {from_block} to {to_block}."
+        )
+        from_block_hex, to_block_hex = self._convert_block_range(
+            from_block, to_block
+        )
+        validation_block_hex = (
+            to_block_hex
+            if validation_block is None
+            else validate_and_convert_block(validation_block)
+        )
+        await self.atc.connect()
+        calls = await self.atc.get_calls_from(
+            from_block_hex,
+            to_block_hex,
+            self.cg.contract_address,
+            validation_block=validation_block_hex,
+        )
+        self._add_calls(calls)
+
+    def update_window(
+        self,
+        from_block: str | int,
+        to_block: str | int,
+        strategy: str = "transaction",
+        validation_block: str | int | None = None,
+    ) -> None:
+        """
+        Updates the call graph to the calls of a block range. If the range
+        overlaps the range of the previous update, only the blocks that
+        entered the range are collected and the calls of the blocks that
+        left it are removed. Otherwise the graph is rebuilt.
+        Args:
+            from_block: Block number in decimal or hex format
+            to_block: Block number in decimal or hex format
+            strategy: Collection strategy, one of `scsc.traces.STRATEGIES`
+            validation_block: Block number in decimal or hex format at
+                which the addresses of the collected blocks are checked
+                to be contracts, to_block if None
+        Raises:
+            ValueError: If from_block is greater than to_block
+        """
+        window, ranges, validation_block = self._window_ranges(
+            from_block, to_block, strategy, validation_block
+        )
+        for start, end in ranges:
+            self.collect_calls(
+                start,
+                end,
+                strategy=strategy,
+                validation_block=validation_block,
+            )
+        self._window = window
+
+    async def update_window_async(
+        self,
+        from_block: str | int,
+        to_block: str | int,
+        validation_block: str | int | None = None,
+    ) -> None:
+        """
+        Async variant of `update_window` with the transaction strategy.
+        Raises:
+            ValueError: If from_block is greater than to_block
+            ConnectionError: If the Ethereum node is not reachable
+        """
+        window, ranges, validation_block = self._window_ranges(
+            from_block, to_block, "transaction", validation_block
+        )
+        for start, end in ranges:
+            await self.collect_calls_async(
+                start, end, validation_block=validation_block
+            )
+        self._window = window
+
+    def _window_ranges(
+        self,
+        from_block: str | int,
+        to_block: str | int,
+        strategy: str,
+        validation_block: str | int | None,
+    ) -> tuple[tuple[int, int, str], list[tuple[int, int]], str | int]:
+        """
+        Starts moving the window to a block range, removing the calls of
+        the blocks that left it or resetting the graph if the range does
+        not overlap the previous one. Returns the new window, the block
+        ranges to collect and the block at which their addresses are
+        checked. The window is unset until the caller collected the
+        ranges, so that the graph is rebuilt if the collection fails.
+        """
+        from_block_hex, to_block_hex = self._convert_block_range(
+            from_block, to_block
+        )
+        start, end = int(from_block_hex, 16), int(to_block_hex, 16)
+        if validation_block is None:
+            validation_block = to_block_hex
+        if (
+            self._window is None
+            or self._window[2] != strategy
+            or start > self._window[1]
+            or end < self._window[0]
+            or None in self._block_calls
+        ):
+            self.reset()
+            ranges = [(start, end)]
+        else:
+            old_start, old_end, _ = self._window
+            self._remove_blocks(
+                [b for b in self._block_calls if b < start or b > end]
+            )
+            ranges = []
+            if start < old_start:
+                ranges.append((start, old_start - 1))
+            if end > old_end:
+                ranges.append((old_end + 1, end))
+        self._window = None
+        return (start, end, strategy), ranges, validation_block
+
+    def reset(self) -> None:
+        """
+        Removes all calls from the call graph.
+        """
+        self.cg = self._graph_class(self.cg.contract_address)
+        self._block_calls.clear()
+        self._window = None
+
+    def _remove_blocks(self, blocks: list) -> None:
+        """
+        Removes the calls of the given blocks from the call graph.
+        """
+        for block in blocks:
+            for (u, v, call_type), count in self._block_calls.pop(
+                block
+            ).items():
+                self.cg.remove_call(u, v, call_type, count)
+        self.logger.info(f"Removed the calls of {len(blocks)} blocks.")
+
+    def _convert_block_range(
+        self, from_block: str | int, to_block: str | int
+    ) -> tuple[str, str]:
+        """
+        Validates a block range and converts it to hex format.
+        """
+        return validate_and_convert_block_range(from_block, to_block)
+
+    def _add_calls(self, calls: list) -> None:
+        """
+        Adds collected calls to the call graph.
+        """
+        self._add_call_buffer(CallBuffer.from_calls(calls))
+
+    def _add_call_buffer(self, calls: CallBuffer) -> None:
+        """
+        Adds collected calls to the call graph, writing each edge and type
+        once, and counts them per block.
+        """
+        self.cg.add_edge_counts(calls.edge_counts())
+        for block, counts in calls.block_edge_counts().items():
+            self._block_calls[block].update(counts)
         self.logger.info(f"Collected {len(calls)} calls.")
 
+    def _add_call(self, c: dict) -> None:
+        """
+        Adds a collected call to the call graph.
+        """
+        self.cg.add_call(c["from"], c["to"], c["type"])
+        self._block_calls[c.get("block")][(c["from"], c["to"], c["type"])] += 1
+
     def get_all_dependencies(self) -> list:
         """
         Collects all contracts in the call graph excluding the main contract address.
@@ -102,3 +610,28 @@ class SupplyChain:
         """
         self.logger.info(f"Exporting call graph to JSON file: {filename}.")
         self.cg.export_json(filename)
+
+    def export_snapshot(self, filename: str) -> None:
+        """
+        Exports the call graph to a binary snapshot file.
+        """
+        self.logger.info(f"Exporting call graph to snapshot: {filename}.")
+        self.cg.export_snapshot(filename)
+
+    def load_snapshot(self, filename: str) -> None:
+        """
+        Replaces the call graph with one exported with `export_snapshot`.
+        The calls of the snapshot are not known per block, so the sliding
+        window is reset.
+        Raises:
+            ValueError: If the snapshot is of another contract
+        """
+        self.logger.info(f"Loading call graph from snapshot: {filename}.")
+        cg = self._graph_class.load_snapshot(filename)
+        if cg.contract_address != self.cg.contract_address:
+            raise ValueError(
+                f"Snapshot of another contract: {cg.contract_address}"
+            )
+        self.cg = cg
+        self._block_calls.clear()
+        self._window = None
@@ -1,3 +1,15 @@
-from scsc.traces.trace_collector import TraceCollector
+from scsc.traces.address_cache import AddressKind, AddressKindCache
+from scsc.traces.async_trace_collector import AsyncTraceCollector
+from scsc.traces.parquet_trace_source import ParquetTraceSource
+from scsc.traces.trace_cache import TraceCache
+from scsc.traces.trace_collector import STRATEGIES, TraceCollector
 
-__all__ = ["TraceCollector"]
+__all__ = [
+    "TraceCollector",
+    "AsyncTraceCollector",
+    "AddressKind",
+    "AddressKindCache",
+    "TraceCache",
+    "ParquetTraceSource",
+    "STRATEGIES",
+]
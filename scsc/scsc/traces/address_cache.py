@@ -0,0 +1,164 @@
+import sqlite3
+import threading
+from collections import OrderedDict
+from enum import Enum
+from typing import Dict, Optional, Tuple
+
+
+class AddressKind(str, Enum):
+    """
+    Kind of account found at an address.
+    """
+
+    CONTRACT = "contract"
+    EOA = "eoa"
+    PRECOMPILE = "precompile"
+    EMPTY = "empty"
+
+
+# Precompiled contracts on Ethereum mainnet: 0x01-0x11 and P256VERIFY.
+PRECOMPILES = frozenset(f"0x{i:040x}" for i in [*range(0x01, 0x12), 0x100])
+
+
+def block_number(block: str | int) -> Optional[int]:
+    """
+    Converts a block identifier to an integer.
+    Returns None for tags such as "latest".
+    """
+    if isinstance(block, int):
+        return block
+    try:
+        return int(block, 16) if block.startswith("0x") else int(block)
+    except ValueError:
+        return None
+
+
+class AddressKindCache:
+    """
+    LRU cache of address kinds with an optional persistent SQLite tier.
+
+    Each entry records the block at which the kind was observed. Code
+    deployed at a block is assumed to stay there, so a contract is known
+    for any later block, while an address without code is only known
+    for earlier blocks. Precompiles are answered without any lookup.
+    """
+
+    def __init__(self, maxsize: int = 100_000, path: Optional[str] = None):
+        """
+        Initializes the cache.
+
+        Args:
+            maxsize: Maximum number of addresses kept in memory
+            path: SQLite file of the persistent tier, disabled if None
+        """
+        if maxsize < 1:
+            raise ValueError(f"maxsize must be a positive integer: {maxsize}")
+        self.maxsize = maxsize
+        self.path = path
+        self._entries: OrderedDict[str, Tuple[AddressKind, int]] = (
+            OrderedDict()
+        )
+        self._lock = threading.Lock()
+        self._db = None
+        if path is not None:
+            self._db = sqlite3.connect(path, check_same_thread=False)
+            self._db.execute(
+                "CREATE TABLE IF NOT EXISTS address_kind "
+                "(address TEXT PRIMARY KEY, kind TEXT, block INTEGER)"
+            )
+            self._db.commit()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    @staticmethod
+    def _key(address: str) -> str:
+        return address.lower()
+
+    @staticmethod
+    def _is_valid(kind: AddressKind, seen_at: int, block: int) -> bool:
+        if kind == AddressKind.CONTRACT:
+            return block >= seen_at
+        return block <= seen_at
+
+    def get(self, address: str, block: str | int) -> Optional[AddressKind]:
+        """
+        Returns the kind of an address at a block, or None if unknown.
+        """
+        key = self._key(address)
+        if key in PRECOMPILES:
+            return AddressKind.PRECOMPILE
+        number = block_number(block)
+        if number is None:
+            return None
+
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                self._entries.move_to_end(key)
+            elif self._db is not None:
+                row = self._db.execute(
+                    "SELECT kind, block FROM address_kind WHERE address = ?",
+                    (key,),
+                ).fetchone()
+                if row is not None:
+                    entry = (AddressKind(row[0]), row[1])
+                    self._store(key, entry)
+
+        if entry is None or not self._is_valid(*entry, number):
+            return None
+        return entry[0]
+
+    def put(self, address: str, kind: AddressKind, block: str | int) -> None:
+        """
+        Records the kind of an address observed at a block.
+        """
+        self.put_many({address: kind}, block)
+
+    def put_many(
+        self, kinds: Dict[str, AddressKind], block: str | int
+    ) -> None:
+        """
+        Records the kinds of several addresses observed at the same block
+        and writes them to the persistent tier in one transaction.
+        """
+        number = block_number(block)
+        if number is None:
+            return
+
+        rows = []
+        with self._lock:
+            for address, kind in kinds.items():
+                key = self._key(address)
+                if key in PRECOMPILES:
+                    continue
+                seen_at = number
+                entry = self._entries.get(key)
+                if entry is not None and entry[0] == kind:
+                    # Keep the observation that is valid for the most blocks
+                    if kind == AddressKind.CONTRACT:
+                        seen_at = min(seen_at, entry[1])
+                    else:
+                        seen_at = max(seen_at, entry[1])
+                self._store(key, (kind, seen_at))
+                rows.append((key, kind.value, seen_at))
+            if self._db is not None and rows:
+                self._db.executemany(
+                    "INSERT OR REPLACE INTO address_kind VALUES (?, ?, ?)",
+                    rows,
+                )
+                self._db.commit()
+
+    def _store(self, key: str, entry: Tuple[AddressKind, int]) -> None:
+        self._entries[key] = entry
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.maxsize:
+            self._entries.popitem(last=False)
+
+    def close(self) -> None:
+        """
+        Closes the persistent tier.
+        """
+        if self._db is not None:
+            self._db.close()
+            self._db = None
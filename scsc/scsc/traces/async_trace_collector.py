@@ -0,0 +1,388 @@
+import asyncio
+from typing import (
+    Any,
+    AsyncIterator,
+    Awaitable,
+    Callable,
+    Dict,
+    Iterable,
+    List,
+    Optional,
+    Set,
+    Tuple,
+)
+
+from web3 import AsyncWeb3
+from web3.types import RPCEndpoint
+
+from scsc.traces.address_cache import AddressKind, AddressKindCache
+from scsc.traces.base_trace_collector import (
+    ADDRESS_BATCH_SIZE,
+    BaseTraceCollector,
+)
+
+
+class AsyncTraceCollector(BaseTraceCollector):
+    """
+    Collects traces with AsyncWeb3, keeping at most
+    `max_concurrency` requests in flight.
+    """
+
+    def __init__(
+        self,
+        url: str,
+        max_concurrency: int = 16,
+        address_cache: Optional[AddressKindCache] = None,
+        max_depth: Optional[int] = None,
+    ):
+        """
+        Initializes the AsyncTraceCollector with a URL.
+
+        Args:
+            url: Ethereum node URL
+            max_concurrency: Maximum number of concurrent requests
+            address_cache: Cache of address kinds, possibly shared with
+                other collectors. A new in-memory cache is used if None.
+            max_depth: Maximum depth of the extracted calls below the
+                top-level call of a transaction. Unlimited if None.
+        """
+        super().__init__(address_cache, max_depth)
+
+        if max_concurrency < 1:
+            raise ValueError(
+                f"max_concurrency must be a positive integer: {max_concurrency}"
+            )
+        self.max_concurrency = max_concurrency
+
+        self.w3 = AsyncWeb3(AsyncWeb3.AsyncHTTPProvider(url))
+
+    async def connect(self) -> None:
+        """
+        Checks the connection to the Ethereum node.
+        """
+        if not await self.w3.is_connected():
+            raise ConnectionError("Failed to connect to the Ethereum node.")
+        self.logger.info("Connected to the Ethereum node.")
+
+    async def close(self) -> None:
+        """
+        Closes the HTTP session of the provider.
+        """
+        await self.w3.provider.disconnect()
+
+    async def _validate_contract(self, address: str, block: str) -> bool:
+        """
+        Validates contract address and checks if it's different from x0
+        """
+        if not AsyncWeb3.is_address(address):
+            self.logger.error(f"Invalid contract address format: {address}")
+            return False
+
+        kind = self.address_cache.get(address, block)
+        if kind is None:
+            try:
+                code = await self.w3.eth.get_code(
+                    address, block_identifier=block
+                )
+                if self._check_code(address, code):
+                    kind = AddressKind.CONTRACT
+                else:
+                    nonce = await self.w3.eth.get_transaction_count(
+                        address, block
+                    )
+                    kind = self._codeless_kind(nonce)
+            except Exception as e:
+                self.logger.error(f"Error validating contract: {e}")
+                return False
+            self.address_cache.put(address, kind, block)
+        return kind == AddressKind.CONTRACT
+
+    async def _batch(
+        self, request: Callable[[Any], Awaitable[Any]], items: List[Any]
+    ) -> Optional[List[Any]]:
+        """
+        Sends one request per item in a single JSON-RPC batch.
+        Returns None if the batch fails or does not answer every item.
+        """
+        try:
+            async with self.w3.batch_requests() as batch:
+                for item in items:
+                    batch.add(request(item))
+                results = list(await batch.async_execute())
+        except Exception as e:
+            self.logger.error(f"Error sending batch request: {e}")
+            return None
+        if len(results) != len(items):
+            self.logger.error(
+                f"Batch request returned {len(results)} responses "
+                f"for {len(items)} requests"
+            )
+            return None
+        return results
+
+    async def _prefetch_address_kinds(
+        self,
+        addresses: Iterable[str],
+        block: str,
+        semaphore: asyncio.Semaphore,
+    ) -> None:
+        """
+        Classifies the addresses missing from the address cache with
+        batched eth_getCode and eth_getTransactionCount requests.
+        """
+        missing = self._missing_addresses(addresses, block)
+
+        async def classify(chunk: List[str]) -> None:
+            async with semaphore:
+                codes = await self._batch(
+                    lambda a: self.w3.eth.get_code(a, block_identifier=block),
+                    chunk,
+                )
+                if codes is None:
+                    return
+                kinds, codeless = self._code_kinds(chunk, codes)
+                if codeless:
+                    nonces = await self._batch(
+                        lambda a: self.w3.eth.get_transaction_count(a, block),
+                        codeless,
+                    )
+                    if nonces is not None:
+                        for a, nonce in zip(codeless, nonces, strict=True):
+                            kinds[a] = self._codeless_kind(nonce)
+            self.address_cache.put_many(kinds, block)
+
+        await asyncio.gather(
+            *(
+                classify(missing[i : i + ADDRESS_BATCH_SIZE])
+                for i in range(0, len(missing), ADDRESS_BATCH_SIZE)
+            )
+        )
+
+    async def _trace_filter_chunk(
+        self,
+        start: int,
+        end: int,
+        contract_address: str,
+        semaphore: asyncio.Semaphore,
+    ) -> Dict[str, Optional[int]]:
+        """
+        Filters the transactions of one chunk of blocks, page by page.
+        A chunk that fails because the request timed out or the
+        response was too large is split in two and retried.
+        Raises:
+            RuntimeError: If a single block cannot be filtered, or on
+                any other error
+        """
+        tx_blocks = {}
+        after = 0
+        try:
+            while True:
+                async with semaphore:
+                    # AsyncWeb3 has no tracing module,
+                    # so the request is sent as is.
+                    res = await self.w3.manager.coro_request(
+                        RPCEndpoint("trace_filter"),
+                        [
+                            self._trace_filter_params(
+                                start, end, contract_address, after
+                            )
+                        ],
+                    )
+                res = res or []
+                tx_blocks.update(self._tx_blocks_from_traces(res))
+                if len(res) < self.filter_page_size:
+                    return tx_blocks
+                after += len(res)
+        except Exception as e:
+            if start == end:
+                raise RuntimeError(
+                    f"Error filtering transactions in block {start}: {e}"
+                ) from e
+            if not self._should_split(e):
+                raise RuntimeError(
+                    f"Error filtering transactions from block {start} "
+                    f"to {end}: {e}"
+                ) from e
+            self.logger.warning(
+                f"Error filtering transactions from block {start} \
+                to {end}, splitting the range: {e}"
+            )
+        mid = (start + end) // 2
+        first, second = await asyncio.gather(
+            self._trace_filter_chunk(start, mid, contract_address, semaphore),
+            self._trace_filter_chunk(
+                mid + 1, end, contract_address, semaphore
+            ),
+        )
+        return {**first, **second}
+
+    async def _trace_filter(
+        self, from_block: str, to_block: str, contract_address: str
+    ) -> Dict[str, Optional[int]]:
+        """
+        Maps the transactions in which the contract address sends calls
+        to their block numbers. The block range is split into chunks that
+        are filtered concurrently after the first one.
+        Raises:
+            RuntimeError: If a chunk of the range cannot be filtered
+        """
+        self.logger.info(
+            f"Filtering transactions from block {from_block} \
+              to {to_block} for contract {contract_address}."
+        )
+        semaphore = asyncio.Semaphore(self.max_concurrency)
+        chunks = self._block_chunks(from_block, to_block)
+        # The first chunk is filtered alone, so that a node that cannot
+        # filter at all fails after a single request
+        results = [
+            await self._trace_filter_chunk(
+                start, end, contract_address, semaphore
+            )
+            for start, end in chunks[:1]
+        ]
+        results += await asyncio.gather(
+            *(
+                self._trace_filter_chunk(
+                    start, end, contract_address, semaphore
+                )
+                for start, end in chunks[1:]
+            )
+        )
+        tx_blocks = {h: b for res in results for h, b in res.items()}
+        self.logger.info(f"Found {len(tx_blocks)} transactions.")
+        return tx_blocks
+
+    async def _filter_txs_from(
+        self, from_block: str, to_block: str, contract_address: str
+    ) -> Set[str]:
+        """
+        Filters transactions from a given block range and contract address.
+        """
+        return set(
+            await self._trace_filter(from_block, to_block, contract_address)
+        )
+
+    async def _get_calls_from_tx(
+        self, tx_hash: str, semaphore: asyncio.Semaphore
+    ) -> Dict[str, Any]:
+        """
+        Gets calls from a transaction hash.
+        """
+        async with semaphore:
+            self.logger.info(f"Tracing transaction {tx_hash}.")
+            try:
+                res = await self.w3.geth.debug.trace_transaction(
+                    tx_hash, {"tracer": "callTracer"}
+                )
+            except Exception as e:
+                self.logger.error(f"Error tracing transaction {tx_hash}: {e}")
+                return {}
+            return res
+
+    async def get_calls(
+        self,
+        tx_hashes: Set[str] | Dict[str, Optional[int]],
+        contract_address: str,
+    ) -> List[Dict[str, str]]:
+        """
+        Gets calls for a given set of transaction hashes and contract address.
+        The calls are tagged with the block of their transaction if the
+        hashes are mapped to their block numbers.
+        """
+        self.logger.info(f"Getting calls for contract {contract_address}.")
+        tx_blocks = tx_hashes if isinstance(tx_hashes, dict) else {}
+        semaphore = asyncio.Semaphore(self.max_concurrency)
+        hashes = list(tx_hashes)
+        results = await asyncio.gather(
+            *(self._get_calls_from_tx(h, semaphore) for h in hashes)
+        )
+        calls = []
+        for h, res in zip(hashes, results, strict=True):
+            if res:
+                self._extract_calls(
+                    res, contract_address, calls, tx_blocks.get(h)
+                )
+        self.logger.info(f"Extracted {len(calls)} calls.")
+        return calls
+
+    async def _filter_contract_calls(
+        self, calls: List[Dict[str, str]], to_block
+    ) -> List[Dict[str, str]]:
+        """
+        Filters calls to contract addresses, classifying the addresses
+        missing from the address cache in batches first.
+        """
+        semaphore = asyncio.Semaphore(self.max_concurrency)
+
+        async def validate(address: str) -> bool:
+            async with semaphore:
+                return await self._validate_contract(address, to_block)
+
+        addresses = list({a for c in calls for a in (c["to"], c["from"])})
+        await self._prefetch_address_kinds(addresses, to_block, semaphore)
+        results = await asyncio.gather(*(validate(a) for a in addresses))
+        valid = {a for a, ok in zip(addresses, results, strict=True) if ok}
+        return [c for c in calls if c["to"] in valid and c["from"] in valid]
+
+    async def get_calls_from(
+        self,
+        from_block: str,
+        to_block: str,
+        contract_address: str,
+        validation_block: Optional[str] = None,
+    ) -> List[Dict[str, str]]:
+        """
+        Gets calls from a given block range and contract address, tagged
+        with their block number. The addresses are checked to be contracts
+        at `validation_block`, to_block if None.
+        """
+        self.logger.info(
+            f"Getting calls from block {from_block} \
+            to {to_block} for contract {contract_address}."
+        )
+        if validation_block is None:
+            validation_block = to_block
+        if not await self._validate_contract(
+            contract_address, validation_block
+        ):
+            raise ValueError("Invalid contract address or bytecode.")
+        tx_blocks = await self._trace_filter(
+            from_block, to_block, contract_address
+        )
+        calls = await self.get_calls(tx_blocks, contract_address)
+        return await self._filter_contract_calls(calls, validation_block)
+
+    async def iter_calls(
+        self, from_block: str, to_block: str, contract_address: str
+    ) -> AsyncIterator[Dict[str, str]]:
+        """
+        Yields the calls of a given block range and contract address as
+        each transaction is traced, in completion order, with the same
+        results as `get_calls_from`. Pending traces are cancelled if the
+        iteration stops early.
+        Raises:
+            ValueError: If the contract address is invalid
+        """
+        if not await self._validate_contract(contract_address, to_block):
+            raise ValueError("Invalid contract address or bytecode.")
+        tx_blocks = await self._trace_filter(
+            from_block, to_block, contract_address
+        )
+        semaphore = asyncio.Semaphore(self.max_concurrency)
+
+        async def trace(h: str) -> Tuple[Optional[int], Dict[str, Any]]:
+            return tx_blocks[h], await self._get_calls_from_tx(h, semaphore)
+
+        tasks = [asyncio.ensure_future(trace(h)) for h in tx_blocks]
+        try:
+            for task in asyncio.as_completed(tasks):
+                block, res = await task
+                if not res:
+                    continue
+                calls = []
+                self._extract_calls(res, contract_address, calls, block)
+                for c in await self._filter_contract_calls(calls, to_block):
+                    yield c
+        finally:
+            for task in tasks:
+                task.cancel()
@@ -0,0 +1,367 @@
+import logging
+from typing import Any, Dict, Iterable, List, Optional, Set, Tuple
+
+from hexbytes import HexBytes
+from requests.exceptions import Timeout
+from web3 import Web3
+from web3.exceptions import TimeExhausted, Web3RPCError
+
+from scsc.traces.address_cache import (
+    AddressKind,
+    AddressKindCache,
+    block_number,
+)
+
+# Number of addresses classified per JSON-RPC batch request
+# when no batch size is configured.
+ADDRESS_BATCH_SIZE = 100
+# Number of blocks per trace_filter request when discovering transactions
+TRACE_FILTER_CHUNK_SIZE = 500
+# Number of traces per trace_filter page
+TRACE_FILTER_PAGE_SIZE = 10_000
+# JSON-RPC error code of requests exceeding a limit of the node
+LIMIT_EXCEEDED_CODE = -32005
+# Fragments of the error messages of nodes for requests that timed out
+# or whose response was too large, which may succeed on fewer blocks
+SPLIT_ERROR_MESSAGES = (
+    "timeout",
+    "timed out",
+    "time-out",
+    "too large",
+    "too big",
+    "exceed",
+    "more than",
+)
+
+
+class BaseTraceCollector:
+    """
+    Node-independent logic shared by the synchronous
+    and asynchronous trace collectors.
+    """
+
+    def __init__(
+        self,
+        address_cache: Optional[AddressKindCache] = None,
+        max_depth: Optional[int] = None,
+    ):
+        """
+        Initializes the logger, the address cache and the reference bytecode.
+        Calls nested more than `max_depth` levels below the top-level call
+        of a transaction are ignored if it is given.
+        """
+        if max_depth is not None and max_depth < 0:
+            raise ValueError(
+                f"max_depth must be a non-negative integer: {max_depth}"
+            )
+        self.max_depth = max_depth
+        self.logger = logging.getLogger(self.__class__.__name__)
+        self.address_cache = (
+            address_cache if address_cache is not None else AddressKindCache()
+        )
+        self.filter_chunk_size = TRACE_FILTER_CHUNK_SIZE
+        self.filter_page_size = TRACE_FILTER_PAGE_SIZE
+
+        # Reference bytecode for "x0" - this should be the actual bytecode
+        self.x0_bytecode = "x0"  # Replace with actual x0 bytecode
+
+    def _check_code(self, address: str, code: bytes) -> bool:
+        """
+        Checks that the code deployed at an address is a valid contract.
+        """
+        if len(code) == 0:
+            self.logger.error(f"No code at address: {address}")
+            return False
+
+        if code.hex() == self.x0_bytecode:
+            self.logger.info(f"Contract at {address} matches x0 contract")
+            return False
+
+        return True
+
+    @staticmethod
+    def _codeless_kind(nonce: int) -> AddressKind:
+        """
+        Classifies an address without valid code from its nonce.
+        """
+        return AddressKind.EOA if nonce > 0 else AddressKind.EMPTY
+
+    def _missing_addresses(
+        self, addresses: Iterable[str], block: str
+    ) -> List[str]:
+        """
+        Returns the valid addresses missing from the address cache.
+        """
+        return [
+            a
+            for a in addresses
+            if Web3.is_address(a) and self.address_cache.get(a, block) is None
+        ]
+
+    def _code_kinds(
+        self, addresses: List[str], codes: List[bytes]
+    ) -> Tuple[Dict[str, AddressKind], List[str]]:
+        """
+        Classifies addresses from their code. Returns the kinds of the
+        contracts and the addresses without valid code, whose kind
+        depends on their nonce.
+        """
+        kinds = {}
+        codeless = []
+        for a, code in zip(addresses, codes, strict=True):
+            if self._check_code(a, code):
+                kinds[a] = AddressKind.CONTRACT
+            else:
+                codeless.append(a)
+        return kinds, codeless
+
+    def _tx_blocks_from_traces(
+        self, res: List[Dict[str, Any]]
+    ) -> Dict[str, Optional[int]]:
+        """
+        Maps the hashes of the transactions containing call traces
+        to their block numbers.
+        """
+        return {
+            (
+                r["transactionHash"].to_0x_hex()
+                if type(r["transactionHash"]) is HexBytes
+                else r["transactionHash"]
+            ): r.get("blockNumber")
+            for r in res
+            if r["type"] == "call"
+        }
+
+    @staticmethod
+    def _should_split(e: Exception) -> bool:
+        """
+        Checks if a failed trace_filter request may succeed on a smaller
+        block range, i.e. if it timed out or its response was too large.
+        Other errors, e.g. an unsupported method, are not retried.
+        """
+        if isinstance(e, (TimeoutError, Timeout, TimeExhausted)):
+            return True
+        if isinstance(e, Web3RPCError) and isinstance(e.rpc_response, dict):
+            error = e.rpc_response.get("error")
+            if (
+                isinstance(error, dict)
+                and error.get("code") == LIMIT_EXCEEDED_CODE
+            ):
+                return True
+        message = str(e).lower()
+        return any(m in message for m in SPLIT_ERROR_MESSAGES)
+
+    def _block_chunks(
+        self, from_block: str | int, to_block: str | int
+    ) -> List[Tuple[int, int]]:
+        """
+        Splits a block range into chunks of `filter_chunk_size` blocks.
+        """
+        start, end = block_number(from_block), block_number(to_block)
+        return [
+            (a, min(a + self.filter_chunk_size - 1, end))
+            for a in range(start, end + 1, self.filter_chunk_size)
+        ]
+
+    def _trace_filter_params(
+        self,
+        start: int,
+        end: int,
+        contract_address: str | List[str],
+        after: int,
+    ) -> Dict[str, Any]:
+        """
+        Builds the parameters of one trace_filter page
+        for one or several contract addresses.
+        """
+        return {
+            "fromBlock": hex(start),
+            "toBlock": hex(end),
+            "fromAddress": (
+                [contract_address]
+                if isinstance(contract_address, str)
+                else list(contract_address)
+            ),
+            "after": after,
+            "count": self.filter_page_size,
+        }
+
+    def _compact_frame(
+        self, frame: Dict[str, Any], checksum: bool = False
+    ) -> Dict[str, Any]:
+        """
+        Copies the fields of a callTracer frame and its subcalls that are
+        needed to extract calls, optionally converting the addresses to
+        checksum format.
+        """
+        address = Web3.to_checksum_address if checksum else str
+        root = {}
+        stack = [(frame, root)]
+        while stack:
+            raw, out = stack.pop()
+            out["from"] = address(raw["from"])
+            out["to"] = address(raw["to"]) if raw.get("to") else None
+            out["type"] = raw["type"]
+            if raw.get("calls"):
+                out["calls"] = [{} for _ in raw["calls"]]
+                stack.extend(zip(raw["calls"], out["calls"], strict=True))
+        return root
+
+    def _checksum_frame(self, frame: Dict[str, Any]) -> Dict[str, Any]:
+        """
+        Converts the addresses of a raw callTracer frame and its subcalls
+        to checksum format, as web3 does for debug_traceTransaction.
+        """
+        return self._compact_frame(frame, checksum=True)
+
+    def _parity_frame(self, trace: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+        """
+        Converts a flat Parity trace to a callTracer frame without subcalls.
+        Returns None for traces that are not calls, such as block rewards.
+        """
+        action = trace["action"]
+        if trace["type"] == "call":
+            return {
+                "from": action["from"],
+                "to": action["to"],
+                "type": action["callType"].upper(),
+            }
+        if trace["type"] == "create":
+            result = trace.get("result") or {}
+            return {
+                "from": action["from"],
+                "to": result.get("address"),
+                "type": action.get("creationMethod", "create").upper(),
+            }
+        if trace["type"] == "suicide":
+            return {
+                "from": action["address"],
+                "to": action["refundAddress"],
+                "type": "SELFDESTRUCT",
+            }
+        return None
+
+    def _parity_call_trees(
+        self,
+        traces: List[Dict[str, Any]],
+        tx_hashes: Optional[Set[str]] = None,
+    ) -> List[Dict[str, Any]]:
+        """
+        Rebuilds callTracer-style call trees from flat Parity traces,
+        attaching every trace to the parent given by its `traceAddress`
+        prefix. Returns one tree per transaction, restricted to
+        `tx_hashes` if given.
+        """
+        frames = {}
+        for trace in traces:
+            tx_hash = trace.get("transactionHash")
+            if tx_hash is None:
+                continue
+            if type(tx_hash) is HexBytes:
+                tx_hash = tx_hash.to_0x_hex()
+            if tx_hashes is not None and tx_hash not in tx_hashes:
+                continue
+            frame = self._parity_frame(trace)
+            if frame is not None:
+                frames[(tx_hash, tuple(trace["traceAddress"]))] = frame
+
+        roots = []
+        for tx_hash, path in sorted(frames, key=lambda key: key[1]):
+            frame = frames[(tx_hash, path)]
+            if not path:
+                roots.append(frame)
+                continue
+            parent = frames.get((tx_hash, path[:-1]))
+            if parent is not None:
+                parent.setdefault("calls", []).append(frame)
+        return roots
+
+    def _extract_all_subcalls(
+        self, call: Dict[str, Any], calls: List[Dict[str, str]]
+    ) -> None:
+        """
+        Extracts a call and all of its subcalls in depth-first order.
+        """
+        self._walk_frames(call, None, calls)
+
+    def _extract_calls(
+        self,
+        call: Dict[str, Any],
+        contract_address: str,
+        calls: List[Dict[str, str]],
+        block: Optional[int] = None,
+    ) -> None:
+        """
+        Extracts the calls made by the contract and everything they call,
+        visiting each frame of the call tree once. The calls are tagged
+        with the number of their block if it is given.
+        """
+        self._walk_frames(call, contract_address.lower(), calls, block)
+
+    def _extract_calls_many(
+        self,
+        call: Dict[str, Any],
+        calls: Dict[str, List[Dict[str, str]]],
+        block: Optional[int] = None,
+    ) -> None:
+        """
+        Extracts the calls of several contracts from a call tree in a
+        single walk. `calls` maps the lowercase address of each contract
+        to its list of calls, and a frame is appended to the list of every
+        contract that made it or one of its ancestors.
+        """
+        stack = [(call, (), 0)]
+        while stack:
+            frame, senders, depth = stack.pop()
+            sender = frame["from"].lower()
+            if sender in calls and sender not in senders:
+                senders = (*senders, sender)
+            if senders:
+                c = {
+                    "from": frame["from"],
+                    "to": frame["to"],
+                    "type": frame["type"],
+                }
+                if block is not None:
+                    c["block"] = block
+                for a in senders:
+                    calls[a].append(c)
+            if self.max_depth is not None and depth >= self.max_depth:
+                continue
+            stack.extend(
+                (subcall, senders, depth + 1)
+                for subcall in reversed(frame.get("calls", []))
+            )
+
+    def _walk_frames(
+        self,
+        call: Dict[str, Any],
+        contract_address: Optional[str],
+        calls: List[Dict[str, str]],
+        block: Optional[int] = None,
+    ) -> None:
+        """
+        Walks a call tree with an explicit stack, appending every frame
+        made by `contract_address` or nested below such a frame. All
+        frames are appended if `contract_address` is None. Frames deeper
+        than `max_depth` are skipped.
+        """
+        stack = [(call, contract_address is None, 0)]
+        while stack:
+            frame, inside, depth = stack.pop()
+            inside = inside or frame["from"].lower() == contract_address
+            if inside:
+                c = {
+                    "from": frame["from"],
+                    "to": frame["to"],
+                    "type": frame["type"],
+                }
+                if block is not None:
+                    c["block"] = block
+                calls.append(c)
+            if self.max_depth is not None and depth >= self.max_depth:
+                continue
+            stack.extend(
+                (subcall, inside, depth + 1)
+                for subcall in reversed(frame.get("calls", []))
+            )
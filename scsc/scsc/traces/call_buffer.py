@@ -0,0 +1,201 @@
+from array import array
+from collections import Counter
+from typing import Dict, Iterable, Iterator, List, Optional, Set, Tuple
+
+import numpy as np
+
+# Call types with a fixed code, other types get the next free codes
+CALL_TYPES = (
+    "CALL",
+    "STATICCALL",
+    "DELEGATECALL",
+    "CALLCODE",
+    "CREATE",
+    "CREATE2",
+    "SELFDESTRUCT",
+)
+
+# Block column value of calls without a block number
+NO_BLOCK = -1
+
+
+class CallBuffer:
+    """
+    Columnar store of extracted calls.
+
+    Addresses are interned into integer IDs and call types into one-byte
+    codes, so each call takes a few bytes in four array columns instead of
+    a dict of hex strings. The buffer can be filled by the extractors of
+    `BaseTraceCollector` in place of a list, since it accepts call dicts
+    through `append`, and aggregates its calls into edge counts with
+    vectorized numpy group-bys instead of building them back.
+    """
+
+    def __init__(self):
+        self._ids: Dict[Optional[str], int] = {}
+        self.addresses: List[Optional[str]] = []
+        self._type_ids = {t: i for i, t in enumerate(CALL_TYPES)}
+        self.types: List[str] = list(CALL_TYPES)
+        self.senders = array("I")
+        self.receivers = array("I")
+        self.codes = array("B")
+        self.blocks = array("q")
+
+    @classmethod
+    def from_calls(cls, calls: Iterable[Dict[str, str]]) -> "CallBuffer":
+        """
+        Creates a buffer holding calls in dict format.
+        """
+        buffer = cls()
+        buffer.extend(calls)
+        return buffer
+
+    def __len__(self) -> int:
+        return len(self.codes)
+
+    def __iter__(self) -> Iterator[Dict[str, str]]:
+        """
+        Yields the calls in dict format, in insertion order.
+        """
+        addresses, types = self.addresses, self.types
+        for s, r, t, b in zip(
+            self.senders, self.receivers, self.codes, self.blocks, strict=True
+        ):
+            c = {"from": addresses[s], "to": addresses[r], "type": types[t]}
+            if b != NO_BLOCK:
+                c["block"] = b
+            yield c
+
+    def to_list(self) -> List[Dict[str, str]]:
+        """
+        Returns the calls in dict format.
+        """
+        return list(self)
+
+    def intern(self, address: Optional[str]) -> int:
+        """
+        Returns the ID of an address, assigning the next one if it is new.
+        """
+        i = self._ids.get(address)
+        if i is None:
+            i = self._ids[address] = len(self.addresses)
+            self.addresses.append(address)
+        return i
+
+    def _type_code(self, call_type: str) -> int:
+        code = self._type_ids.get(call_type)
+        if code is None:
+            code = self._type_ids[call_type] = len(self.types)
+            self.types.append(call_type)
+        return code
+
+    def add(
+        self,
+        from_address: str,
+        to_address: Optional[str],
+        call_type: str,
+        block: Optional[int] = None,
+    ) -> None:
+        """
+        Adds a call.
+        """
+        self.receivers.append(self.intern(to_address))
+        self.senders.append(self.intern(from_address))
+        self.codes.append(self._type_code(call_type))
+        self.blocks.append(NO_BLOCK if block is None else block)
+
+    def append(self, c: Dict[str, str]) -> None:
+        """
+        Adds a call in dict format.
+        """
+        self.add(c["from"], c["to"], c["type"], c.get("block"))
+
+    def extend(self, calls: Iterable[Dict[str, str]]) -> None:
+        """
+        Adds calls in dict format.
+        """
+        for c in calls:
+            self.append(c)
+
+    def _columns(self) -> Tuple[np.ndarray, ...]:
+        """
+        Views the columns as numpy arrays without copying them.
+        """
+        return (
+            np.frombuffer(self.senders, dtype=np.uint32),
+            np.frombuffer(self.receivers, dtype=np.uint32),
+            np.frombuffer(self.codes, dtype=np.uint8),
+            np.frombuffer(self.blocks, dtype=np.int64),
+        )
+
+    def retain(self, valid: Set[Optional[str]]) -> None:
+        """
+        Keeps only the calls whose sender and receiver are both in
+        `valid`. Each address is looked up once.
+        """
+        mask = np.fromiter(
+            (a in valid for a in self.addresses),
+            dtype=bool,
+            count=len(self.addresses),
+        )
+        senders, receivers, codes, blocks = self._columns()
+        keep = mask[senders] & mask[receivers]
+        self.senders = array("I", senders[keep].tobytes())
+        self.receivers = array("I", receivers[keep].tobytes())
+        self.codes = array("B", codes[keep].tobytes())
+        self.blocks = array("q", blocks[keep].tobytes())
+
+    def _edges(self) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Returns the unique (sender, receiver, code) keys of the calls
+        and the index of the key of each call.
+        """
+        senders, receivers, codes, _ = self._columns()
+        keys = (
+            senders.astype(np.uint64) * len(self.addresses) + receivers
+        ) * len(self.types) + codes
+        return np.unique(keys, return_inverse=True)
+
+    def _edge(self, key: int) -> Tuple[Optional[str], Optional[str], str]:
+        key, code = divmod(int(key), len(self.types))
+        sender, receiver = divmod(key, len(self.addresses))
+        return (
+            self.addresses[sender],
+            self.addresses[receiver],
+            self.types[code],
+        )
+
+    def edge_counts(self) -> Counter:
+        """
+        Counts the calls of each (from, to, type) triple.
+        """
+        if not len(self):
+            return Counter()
+        keys, inverse = self._edges()
+        counts = np.bincount(inverse, minlength=len(keys))
+        return Counter(
+            {self._edge(k): int(n) for k, n in zip(keys, counts, strict=True)}
+        )
+
+    def block_edge_counts(self) -> Dict[Optional[int], Counter]:
+        """
+        Counts the calls of each (from, to, type) triple per block,
+        with None as the block of calls without a block number.
+        """
+        if not len(self):
+            return {}
+        keys, inverse = self._edges()
+        blocks = self._columns()[3]
+        first = int(blocks.min())
+        pairs, counts = np.unique(
+            (blocks - first) * len(keys) + inverse, return_counts=True
+        )
+        edges = [self._edge(k) for k in keys]
+        block_counts: Dict[Optional[int], Counter] = {}
+        for pair, n in zip(pairs.tolist(), counts.tolist(), strict=True):
+            block, edge = divmod(pair, len(keys))
+            block += first
+            block_counts.setdefault(
+                None if block == NO_BLOCK else block, Counter()
+            )[edges[edge]] = n
+        return block_counts
@@ -0,0 +1,319 @@
+import glob
+import logging
+from typing import Dict, List, Optional
+
+from web3 import Web3
+
+from scsc.graph import CallGraph
+from scsc.utils import (
+    validate_and_convert_address,
+    validate_and_convert_block,
+)
+
+try:
+    import pyarrow as pa
+    import pyarrow.compute as pc
+    import pyarrow.parquet as pq
+except ImportError:  # pragma: no cover - optional dependency
+    pa = None
+
+# Columns of the cryo traces dataset needed to extract calls, with the
+# types they are normalized to since they vary across cryo versions
+COLUMNS = {
+    "action_from": "large_binary",
+    "action_to": "large_binary",
+    "action_type": "string",
+    "action_call_type": "string",
+    "action_creation_method": "string",
+    "action_refund_address": "large_binary",
+    "result_address": "large_binary",
+    "trace_address": "string",
+    "transaction_hash": "large_binary",
+    "block_number": "uint64",
+}
+
+# Columns that only some datasets have, read as nulls if missing: the
+# method of contract creations, e.g. create2, and the address that
+# receives the balance of a selfdestruct
+OPTIONAL_COLUMNS = ("action_creation_method", "action_refund_address")
+
+
+def _path_keys(tx_hashes: "pa.Array", trace_addresses: "pa.Array"):
+    """
+    Keys identifying traces by transaction hash and trace address.
+    """
+    return pc.binary_join_element_wise(
+        tx_hashes,
+        pc.cast(trace_addresses, pa.large_binary()),
+        pa.scalar(b":", pa.large_binary()),
+    )
+
+
+class ParquetTraceSource:
+    """
+    Extracts calls from cryo traces datasets stored as Parquet files,
+    without any request to an Ethereum node.
+
+    The files are memory-mapped and the calls made by a contract are
+    selected with vectorized Arrow operations: the frames sent by the
+    contract are the roots, and every frame of the same transaction whose
+    `trace_address` starts with the path of a root belongs to its subtree.
+    Unlike the node-backed collectors, callees are not checked to be
+    contracts, since the dataset does not say which addresses have code.
+    """
+
+    def __init__(
+        self,
+        paths: str | List[str],
+        max_depth: Optional[int] = None,
+    ):
+        """
+        Loads the traces of Parquet files.
+
+        Args:
+            paths: Parquet file, glob pattern or list of Parquet files
+            max_depth: Calls nested more than `max_depth` levels below the
+                top-level call of a transaction are ignored if it is given
+        Raises:
+            ImportError: If pyarrow is not installed
+            ValueError: If no file is given or max_depth is negative
+        """
+        if pa is None:
+            raise ImportError(
+                "pyarrow is required to read Parquet traces: "
+                "pip install scsc[parquet]"
+            )
+        if max_depth is not None and max_depth < 0:
+            raise ValueError(
+                f"max_depth must be a non-negative integer: {max_depth}"
+            )
+        if isinstance(paths, str):
+            paths = sorted(glob.glob(paths)) or [paths]
+        if not paths:
+            raise ValueError("No Parquet file to read.")
+
+        self.logger = logging.getLogger(self.__class__.__name__)
+        self.max_depth = max_depth
+        self.table = self._load(paths)
+        self._checksums: Dict[bytes, str] = {}
+        self.logger.info(
+            f"Loaded {self.table.num_rows} traces from {len(paths)} files."
+        )
+
+    def _load(self, paths: List[str]) -> "pa.Table":
+        """
+        Reads the needed columns of the files, keeping the transaction
+        traces and their depth below the top-level call.
+        """
+        schema = pa.schema(
+            (name, pa.type_for_alias(t)) for name, t in COLUMNS.items()
+        )
+        table = pa.concat_tables(self._read(path, schema) for path in paths)
+        # Block rewards and withdrawals are not part of a transaction
+        table = table.filter(pc.is_valid(table["transaction_hash"]))
+
+        trace_address = table["trace_address"]
+        depth = pc.if_else(
+            pc.equal(trace_address, ""),
+            0,
+            pc.add(pc.count_substring(trace_address, "_"), 1),
+        )
+        table = table.append_column("depth", depth)
+        if self.max_depth is not None:
+            table = table.filter(pc.less_equal(depth, self.max_depth))
+        return table
+
+    @staticmethod
+    def _read(path: str, schema: "pa.Schema") -> "pa.Table":
+        """
+        Reads the needed columns of a file, filling the optional columns
+        it does not have with nulls.
+        """
+        names = set(pq.read_schema(path).names)
+        columns = [
+            name
+            for name in COLUMNS
+            if name in names or name not in OPTIONAL_COLUMNS
+        ]
+        table = pq.read_table(path, columns=columns, memory_map=True)
+        for name in OPTIONAL_COLUMNS:
+            if name not in names:
+                table = table.append_column(
+                    schema.field(name),
+                    pa.nulls(table.num_rows, schema.field(name).type),
+                )
+        return table.select(list(COLUMNS)).cast(schema)
+
+    def _checksum(self, address: bytes) -> str:
+        """
+        Converts a raw address to checksum format, as the node-backed
+        collectors return them, computing it once per address.
+        """
+        checksum = self._checksums.get(address)
+        if checksum is None:
+            checksum = Web3.to_checksum_address(address)
+            self._checksums[address] = checksum
+        return checksum
+
+    def _block_range(
+        self,
+        from_block: Optional[str | int],
+        to_block: Optional[str | int],
+    ) -> "pa.Table":
+        """
+        Returns the traces between two blocks, both bounds included.
+        """
+        table = self.table
+        if from_block is not None:
+            start = int(validate_and_convert_block(from_block), 16)
+            table = table.filter(
+                pc.greater_equal(table["block_number"], start)
+            )
+        if to_block is not None:
+            end = int(validate_and_convert_block(to_block), 16)
+            table = table.filter(pc.less_equal(table["block_number"], end))
+        return table
+
+    @staticmethod
+    def _paths(table: "pa.Table", depth: int) -> "pa.Array":
+        """
+        Keys of the ancestors `depth` levels below the top-level call of
+        the traces of a table, which are the traces themselves if they are
+        not that deep.
+        """
+        trace_address = pc.if_else(
+            pc.less(table["depth"], depth),
+            table["trace_address"],
+            pc.binary_join(
+                pc.list_slice(
+                    pc.split_pattern(table["trace_address"], "_"), 0, depth
+                ),
+                "_",
+            ),
+        )
+        return _path_keys(table["transaction_hash"], trace_address)
+
+    def _subtrees(
+        self, table: "pa.Table", contract_address: str
+    ) -> "pa.Table":
+        """
+        Selects the traces made by a contract or nested below them.
+        """
+        sender = pa.scalar(
+            bytes.fromhex(contract_address[2:]), pa.large_binary()
+        )
+        roots = table.filter(pc.equal(table["action_from"], sender))
+        if roots.num_rows == 0:
+            return roots
+        table = table.filter(
+            pc.is_in(
+                table["transaction_hash"],
+                value_set=pc.unique(roots["transaction_hash"]),
+            )
+        )
+        root_paths = pc.unique(
+            _path_keys(roots["transaction_hash"], roots["trace_address"])
+        )
+        mask = pc.equal(table["action_from"], sender)
+        min_depth = pc.min(roots["depth"]).as_py()
+        max_depth = pc.max(table["depth"]).as_py()
+        for depth in range(min_depth, max_depth):
+            mask = pc.or_(
+                mask,
+                pc.is_in(self._paths(table, depth), value_set=root_paths),
+            )
+        return table.filter(mask)
+
+    def get_calls_from(
+        self,
+        contract_address: str,
+        from_block: Optional[str | int] = None,
+        to_block: Optional[str | int] = None,
+    ) -> List[Dict[str, str]]:
+        """
+        Returns the calls made by the contract and everything they call,
+        in the same format as `TraceCollector.get_calls_from`.
+
+        Args:
+            contract_address: Contract address
+            from_block: Block number in decimal or hex format,
+                or None to start at the first block of the files
+            to_block: Block number in decimal or hex format,
+                or None to end at the last block of the files
+        Raises:
+            ValueError: If the contract address or a block is invalid
+        """
+        contract_address = validate_and_convert_address(contract_address)
+        frames = self._subtrees(
+            self._block_range(from_block, to_block), contract_address
+        )
+        # Calls go to action_to, creations to the created contract and
+        # selfdestructs to the refund address, as in the Parity strategy
+        to = pc.coalesce(
+            frames["action_to"],
+            frames["result_address"],
+            frames["action_refund_address"],
+        )
+        call_type = pc.utf8_upper(
+            pc.replace_substring(
+                pc.coalesce(
+                    frames["action_call_type"],
+                    frames["action_creation_method"],
+                    frames["action_type"],
+                ),
+                "_",
+                "",
+            )
+        )
+        call_type = pc.replace_substring(call_type, "SUICIDE", "SELFDESTRUCT")
+
+        calls = []
+        for sender, receiver, t, block in zip(
+            frames["action_from"].to_pylist(),
+            to.to_pylist(),
+            call_type.to_pylist(),
+            frames["block_number"].to_pylist(),
+            strict=True,
+        ):
+            # Failed contract creations have no address
+            if receiver is None:
+                continue
+            calls.append(
+                {
+                    "from": self._checksum(sender),
+                    "to": self._checksum(receiver),
+                    "type": t,
+                    "block": block,
+                }
+            )
+        self.logger.info(f"Extracted {len(calls)} calls of {contract_address}")
+        return calls
+
+    def get_calls_from_many(
+        self,
+        contract_addresses: List[str],
+        from_block: Optional[str | int] = None,
+        to_block: Optional[str | int] = None,
+    ) -> Dict[str, List[Dict[str, str]]]:
+        """
+        Returns the calls of several contracts, keyed by address.
+        """
+        return {
+            address: self.get_calls_from(address, from_block, to_block)
+            for address in contract_addresses
+        }
+
+    def get_call_graph(
+        self,
+        contract_address: str,
+        from_block: Optional[str | int] = None,
+        to_block: Optional[str | int] = None,
+    ) -> CallGraph:
+        """
+        Builds the call graph of a contract from the traces.
+        """
+        cg = CallGraph(validate_and_convert_address(contract_address))
+        cg.add_calls(
+            self.get_calls_from(contract_address, from_block, to_block)
+        )
+        return cg
@@ -0,0 +1,228 @@
+import json
+import sqlite3
+import threading
+import zlib
+from typing import Any, Dict, List, Optional
+
+from web3 import Web3
+
+try:
+    import zstandard
+except ImportError:  # pragma: no cover - optional dependency
+    zstandard = None
+
+# Number of blocks below the head after which a block is considered final
+FINALITY_DEPTH = 64
+
+# Codec prefixes of the stored payloads
+_ZSTD = b"Z"
+_ZLIB = b"z"
+
+
+def tx_key(tx_hash: str, config: Dict[str, Any]) -> str:
+    """
+    Cache key of the trace of a transaction with a tracer configuration.
+    """
+    return f"tx:{tx_hash.lower()}:{json.dumps(config, sort_keys=True)}"
+
+
+def block_key(block: int, config: Dict[str, Any]) -> str:
+    """
+    Cache key of the traces of a block with a tracer configuration.
+    """
+    return f"block:{block}:{json.dumps(config, sort_keys=True)}"
+
+
+class TraceCache:
+    """
+    Persistent SQLite cache of traces, keyed by transaction hash or block
+    number and tracer configuration.
+
+    Payloads are stored as zstd-compressed JSON, or zlib-compressed JSON
+    if the zstandard package is not installed. Only traces of blocks at
+    least `finality_depth` blocks below the head are written, since those
+    never change. The least recently used entries are evicted once the
+    payloads exceed `max_bytes`. The total size and the recency clock are
+    kept in the database, so that processes sharing the file, e.g. the
+    shard workers of a `SupplyChain`, share the size limit.
+    """
+
+    def __init__(
+        self,
+        path: str,
+        max_bytes: int = 1 << 30,
+        finality_depth: int = FINALITY_DEPTH,
+    ):
+        """
+        Initializes the cache.
+
+        Args:
+            path: SQLite file of the cache
+            max_bytes: Maximum total size of the compressed payloads
+            finality_depth: Number of blocks below the head after which
+                traces are cached
+        """
+        if max_bytes < 1:
+            raise ValueError(
+                f"max_bytes must be a positive integer: {max_bytes}"
+            )
+        if finality_depth < 0:
+            raise ValueError(
+                f"finality_depth must be a non-negative integer: "
+                f"{finality_depth}"
+            )
+        self.path = path
+        self.max_bytes = max_bytes
+        self.finality_depth = finality_depth
+        self._lock = threading.Lock()
+        self._db = sqlite3.connect(path, check_same_thread=False)
+        self._db.execute(
+            "CREATE TABLE IF NOT EXISTS trace "
+            "(key TEXT PRIMARY KEY, payload BLOB, size INTEGER, used INTEGER)"
+        )
+        self._db.execute(
+            "CREATE INDEX IF NOT EXISTS trace_used ON trace (used)"
+        )
+        # Single row with the total size of the payloads and the last
+        # recency tick, initialized from the entries of older files
+        self._db.execute(
+            "CREATE TABLE IF NOT EXISTS trace_meta "
+            "(id INTEGER PRIMARY KEY, size INTEGER, clock INTEGER)"
+        )
+        self._db.execute(
+            "INSERT OR IGNORE INTO trace_meta "
+            "SELECT 0, COALESCE(SUM(size), 0), COALESCE(MAX(used), 0) "
+            "FROM trace"
+        )
+        self._db.commit()
+
+    def __len__(self) -> int:
+        with self._lock:
+            return self._db.execute("SELECT COUNT(*) FROM trace").fetchone()[0]
+
+    @property
+    def size(self) -> int:
+        """
+        Total size of the compressed payloads in bytes.
+        """
+        with self._lock:
+            return self._db.execute("SELECT size FROM trace_meta").fetchone()[
+                0
+            ]
+
+    def is_final(self, block: Optional[int], head: int) -> bool:
+        """
+        Checks if a block is deep enough below `head` to be cached.
+        """
+        return block is not None and block <= head - self.finality_depth
+
+    @staticmethod
+    def _encode(value: Any) -> bytes:
+        data = Web3.to_json(value).encode()
+        if zstandard is not None:
+            return _ZSTD + zstandard.ZstdCompressor().compress(data)
+        return _ZLIB + zlib.compress(data)
+
+    @staticmethod
+    def _decode(payload: bytes) -> Optional[Any]:
+        codec, data = payload[:1], payload[1:]
+        if codec == _ZSTD:
+            if zstandard is None:
+                return None
+            data = zstandard.ZstdDecompressor().decompress(data)
+        elif codec == _ZLIB:
+            data = zlib.decompress(data)
+        else:
+            return None
+        return json.loads(data)
+
+    def get(self, key: str) -> Optional[Any]:
+        """
+        Returns the cached traces of a key, or None if they are not cached.
+        """
+        return self.get_many([key]).get(key)
+
+    def get_many(self, keys: List[str]) -> Dict[str, Any]:
+        """
+        Returns the cached traces of the given keys that are cached
+        and marks them as recently used.
+        """
+        found = {}
+        with self._lock:
+            for key in keys:
+                row = self._db.execute(
+                    "SELECT payload FROM trace WHERE key = ?", (key,)
+                ).fetchone()
+                if row is None:
+                    continue
+                value = self._decode(row[0])
+                if value is None:
+                    continue
+                self._db.execute(
+                    "UPDATE trace SET used = ? WHERE key = ?",
+                    (self._tick(), key),
+                )
+                found[key] = value
+            self._db.commit()
+        return found
+
+    def put(self, key: str, value: Any) -> None:
+        """
+        Stores the traces of a key. The caller is responsible for only
+        storing traces of final blocks, see `is_final`.
+        """
+        self.put_many({key: value})
+
+    def put_many(self, values: Dict[str, Any]) -> None:
+        """
+        Stores the traces of several keys in one transaction
+        and evicts the least recently used entries if needed.
+        """
+        if not values:
+            return
+        rows = [(key, self._encode(value)) for key, value in values.items()]
+        with self._lock:
+            for key, payload in rows:
+                # The tick takes the write lock of the database first, so
+                # that the size read below is not changed by other writers
+                used = self._tick()
+                old = self._db.execute(
+                    "SELECT size FROM trace WHERE key = ?", (key,)
+                ).fetchone()
+                self._db.execute(
+                    "INSERT OR REPLACE INTO trace VALUES (?, ?, ?, ?)",
+                    (key, payload, len(payload), used),
+                )
+                self._add_size(len(payload) - (old[0] if old else 0))
+            self._evict()
+            self._db.commit()
+
+    def _tick(self) -> int:
+        """
+        Advances the recency clock shared by the users of the file.
+        """
+        self._db.execute("UPDATE trace_meta SET clock = clock + 1")
+        return self._db.execute("SELECT clock FROM trace_meta").fetchone()[0]
+
+    def _add_size(self, delta: int) -> None:
+        self._db.execute("UPDATE trace_meta SET size = size + ?", (delta,))
+
+    def _evict(self) -> None:
+        (size,) = self._db.execute("SELECT size FROM trace_meta").fetchone()
+        while size > self.max_bytes:
+            row = self._db.execute(
+                "SELECT key, size FROM trace ORDER BY used LIMIT 1"
+            ).fetchone()
+            if row is None:
+                break
+            self._db.execute("DELETE FROM trace WHERE key = ?", (row[0],))
+            self._add_size(-row[1])
+            size -= row[1]
+
+    def close(self) -> None:
+        """
+        Closes the cache.
+        """
+        if self._db is not None:
+            self._db.close()
+            self._db = None
@@ -1,24 +1,120 @@
-import logging
-from typing import Any, Dict, List, Set
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from typing import (
+    Any,
+    Callable,
+    Dict,
+    Iterable,
+    Iterator,
+    List,
+    Optional,
+    Set,
+    Tuple,
+)
 
-from hexbytes import HexBytes
 from web3 import Web3
+from web3.method import Method, default_root_munger
+from web3.module import Module
+from web3.types import RPCEndpoint
 
+from scsc.traces.address_cache import (
+    AddressKind,
+    AddressKindCache,
+    block_number,
+)
+from scsc.traces.base_trace_collector import (
+    ADDRESS_BATCH_SIZE,
+    BaseTraceCollector,
+)
+from scsc.traces.call_buffer import CallBuffer
+from scsc.traces.trace_cache import TraceCache, block_key, tx_key
 
-class TraceCollector:
-    def __init__(self, url: str):
+# Strategies for collecting the calls of a block range:
+# - "transaction": debug_traceTransaction for each transaction found
+#   with trace_filter
+# - "parity": trace_block for each block found with trace_filter, with
+#   call trees rebuilt from the flat Parity traces
+# - "block": debug_traceBlockByNumber for every block of the range,
+#   without trace_filter, for contracts active in most blocks
+STRATEGIES = ("transaction", "parity", "block")
+
+# Tracer configurations, also used to key the trace cache
+CALL_TRACER = {"tracer": "callTracer"}
+PARITY_TRACER = {"method": "trace_block"}
+
+# Guards the attachment of modules to Web3 instances shared by threads
+_attach_lock = threading.Lock()
+
+
+class DebugBlockTracing(Module):
+    """
+    Web3 module for debug_traceBlockByNumber, which web3 does not provide.
+    """
+
+    trace_block_by_number: Method[Callable[..., List[Dict[str, Any]]]] = (
+        Method(
+            RPCEndpoint("debug_traceBlockByNumber"),
+            mungers=[default_root_munger],
+        )
+    )
+
+
+class TraceCollector(BaseTraceCollector):
+    def __init__(
+        self,
+        url: str,
+        batch_size: int | None = None,
+        address_cache: Optional[AddressKindCache] = None,
+        filter_workers: int = 4,
+        max_depth: Optional[int] = None,
+        trace_cache: Optional[TraceCache] = None,
+        w3: Optional[Web3] = None,
+    ):
         """
         Initializes the TraceCollector with a URL and log level.
+
+        Args:
+            url: Ethereum node URL, unused if `w3` is given
+            batch_size: Number of transactions traced per JSON-RPC batch
+                request. Transactions are traced one by one if None.
+            address_cache: Cache of address kinds, possibly shared with
+                other collectors. A new in-memory cache is used if None.
+            filter_workers: Number of block chunks filtered concurrently
+                with trace_filter.
+            max_depth: Maximum depth of the extracted calls below the
+                top-level call of a transaction. Unlimited if None.
+            trace_cache: Persistent cache of the traces of final blocks.
+                Traces are always fetched from the node if None.
+            w3: Connected Web3 instance to reuse, e.g. from
+                `scsc.utils.get_web3`. A new one is created if None.
         """
-        self.logger = logging.getLogger(self.__class__.__name__)
+        super().__init__(address_cache, max_depth)
+        self.trace_cache = trace_cache
+        # Number of transaction call trees traced or read from the cache
+        self.traced_txs = 0
 
-        self.w3 = Web3(Web3.HTTPProvider(url))
-        if not self.w3.is_connected():
-            raise ConnectionError("Failed to connect to the Ethereum node.")
-        self.logger.info("Connected to the Ethereum node.")
+        if batch_size is not None and batch_size < 1:
+            raise ValueError(
+                f"batch_size must be a positive integer: {batch_size}"
+            )
+        self.batch_size = batch_size
+        if filter_workers < 1:
+            raise ValueError(
+                f"filter_workers must be a positive integer: {filter_workers}"
+            )
+        self.filter_workers = filter_workers
 
-        # Reference bytecode for "x0" - this should be the actual bytecode
-        self.x0_bytecode = "x0"  # Replace with actual x0 bytecode
+        if w3 is None:
+            w3 = Web3(Web3.HTTPProvider(url))
+            if not w3.is_connected():
+                raise ConnectionError(
+                    "Failed to connect to the Ethereum node."
+                )
+            self.logger.info("Connected to the Ethereum node.")
+        self.w3 = w3
+        with _attach_lock:
+            if not hasattr(self.w3, "debug_block"):
+                self.w3.attach_modules({"debug_block": DebugBlockTracing})
 
     def _validate_contract(self, address: str, block: str) -> bool:
         """
@@ -28,55 +124,161 @@ class TraceCollector:
             self.logger.error(f"Invalid contract address format: {address}")
             return False
 
-        try:
-            code = self.w3.eth.get_code(address, block_identifier=block)
-            if len(code) == 0:
-                self.logger.error(f"No code at address: {address}")
+        kind = self.address_cache.get(address, block)
+        if kind is None:
+            try:
+                code = self.w3.eth.get_code(address, block_identifier=block)
+                if self._check_code(address, code):
+                    kind = AddressKind.CONTRACT
+                else:
+                    nonce = self.w3.eth.get_transaction_count(address, block)
+                    kind = self._codeless_kind(nonce)
+            except Exception as e:
+                self.logger.error(f"Error validating contract: {e}")
                 return False
+            self.address_cache.put(address, kind, block)
+        return kind == AddressKind.CONTRACT
 
-            if code.hex() == self.x0_bytecode:
-                self.logger.info(f"Contract at {address} matches x0 contract")
-                return False
+    def _batch(
+        self, request: Callable[[Any], Any], items: List[Any]
+    ) -> Optional[List[Any]]:
+        """
+        Sends one request per item in a single JSON-RPC batch.
+        Returns None if the batch fails or does not answer every item.
+        """
+        try:
+            with self.w3.batch_requests() as batch:
+                for item in items:
+                    batch.add(request(item))
+                results = list(batch.execute())
+        except Exception as e:
+            self.logger.error(f"Error sending batch request: {e}")
+            return None
+        if len(results) != len(items):
+            self.logger.error(
+                f"Batch request returned {len(results)} responses "
+                f"for {len(items)} requests"
+            )
+            return None
+        return results
 
-            return True
+    def _prefetch_address_kinds(
+        self, addresses: Iterable[str], block: str
+    ) -> None:
+        """
+        Classifies the addresses missing from the address cache with
+        batched eth_getCode and eth_getTransactionCount requests.
+        """
+        missing = self._missing_addresses(addresses, block)
+        self.logger.info(f"Classifying {len(missing)} addresses.")
+        size = self.batch_size or ADDRESS_BATCH_SIZE
+        for i in range(0, len(missing), size):
+            chunk = missing[i : i + size]
+            codes = self._batch(
+                lambda a: self.w3.eth.get_code(a, block_identifier=block),
+                chunk,
+            )
+            if codes is None:
+                continue
+            kinds, codeless = self._code_kinds(chunk, codes)
+            nonces = self._batch(
+                lambda a: self.w3.eth.get_transaction_count(a, block),
+                codeless,
+            )
+            if nonces is not None:
+                for a, nonce in zip(codeless, nonces, strict=True):
+                    kinds[a] = self._codeless_kind(nonce)
+            self.address_cache.put_many(kinds, block)
+
+    def _trace_filter_chunk(
+        self, start: int, end: int, contract_address: str | List[str]
+    ) -> Dict[str, Optional[int]]:
+        """
+        Filters the transactions of one chunk of blocks, page by page.
+        A chunk that fails because the request timed out or the
+        response was too large is split in two and retried.
+        Raises:
+            RuntimeError: If a single block cannot be filtered, or on
+                any other error
+        """
+        tx_blocks = {}
+        after = 0
+        try:
+            while True:
+                res = self.w3.tracing.trace_filter(
+                    self._trace_filter_params(
+                        start, end, contract_address, after
+                    )
+                )
+                res = res or []
+                tx_blocks.update(self._tx_blocks_from_traces(res))
+                if len(res) < self.filter_page_size:
+                    return tx_blocks
+                after += len(res)
         except Exception as e:
-            self.logger.error(f"Error validating contract: {e}")
-            return False
+            if start == end:
+                raise RuntimeError(
+                    f"Error filtering transactions in block {start}: {e}"
+                ) from e
+            if not self._should_split(e):
+                raise RuntimeError(
+                    f"Error filtering transactions from block {start} "
+                    f"to {end}: {e}"
+                ) from e
+            self.logger.warning(
+                f"Error filtering transactions from block {start} \
+                to {end}, splitting the range: {e}"
+            )
+        mid = (start + end) // 2
+        return {
+            **self._trace_filter_chunk(start, mid, contract_address),
+            **self._trace_filter_chunk(mid + 1, end, contract_address),
+        }
 
-    def _filter_txs_from(
-        self, from_block: str, to_block: str, contract_address: str
-    ) -> Set[str]:
+    def _trace_filter(
+        self,
+        from_block: str,
+        to_block: str,
+        contract_address: str | List[str],
+    ) -> Dict[str, Optional[int]]:
         """
-        Filters transactions from a given block range and contract address.
+        Maps the transactions in which one of the contract addresses
+        sends calls to their block numbers. The block range is split into chunks
+        that are filtered concurrently after the first one.
+        Raises:
+            RuntimeError: If a chunk of the range cannot be filtered
         """
         self.logger.info(
             f"Filtering transactions from block {from_block} \
               to {to_block} for contract {contract_address}."
         )
-        filter_params = {
-            "fromBlock": from_block,
-            "toBlock": to_block,
-            "fromAddress": [contract_address],
-        }
+        chunks = self._block_chunks(from_block, to_block)
+        # The first chunk is filtered alone, so that a node that cannot
+        # filter at all fails after a single request
+        tx_blocks = (
+            self._trace_filter_chunk(*chunks[0], contract_address)
+            if chunks
+            else {}
+        )
+        executor = ThreadPoolExecutor(max_workers=self.filter_workers)
         try:
-            res = self.w3.tracing.trace_filter(filter_params)
-        except Exception as e:
-            self.logger.error(f"Error filtering transactions: {e}")
-            return set()
-
-        if res is None:
-            return set()
-        tx_hashes = {
-            (
-                r["transactionHash"].to_0x_hex()
-                if type(r["transactionHash"]) is HexBytes
-                else r["transactionHash"]
-            )
-            for r in res
-            if r["type"] == "call"
-        }
-        self.logger.info(f"Found {len(tx_hashes)} transactions.")
-        return tx_hashes
+            for res in executor.map(
+                lambda c: self._trace_filter_chunk(*c, contract_address),
+                chunks[1:],
+            ):
+                tx_blocks.update(res)
+        finally:
+            executor.shutdown(cancel_futures=True)
+        self.logger.info(f"Found {len(tx_blocks)} transactions.")
+        return tx_blocks
+
+    def _filter_txs_from(
+        self, from_block: str, to_block: str, contract_address: str
+    ) -> Set[str]:
+        """
+        Filters transactions from a given block range and contract address.
+        """
+        return set(self._trace_filter(from_block, to_block, contract_address))
 
     def _get_calls_from_tx(self, tx_hash: str) -> Dict[str, Any]:
         """
@@ -84,86 +286,489 @@ class TraceCollector:
         """
         self.logger.info(f"Tracing transaction {tx_hash}.")
         try:
-            res = self.w3.geth.debug.trace_transaction(
-                tx_hash, {"tracer": "callTracer"}
-            )
+            res = self.w3.geth.debug.trace_transaction(tx_hash, CALL_TRACER)
         except Exception as e:
             self.logger.error(f"Error tracing transaction {tx_hash}: {e}")
             return {}
         return res
 
-    def _extract_all_subcalls(
-        self, call: Dict[str, Any], calls: List[Dict[str, str]]
-    ) -> None:
+    def _get_calls_from_txs(
+        self, tx_hashes: List[str]
+    ) -> List[Dict[str, Any]]:
         """
-        Recursively extracts all subcalls from a call.
+        Gets calls from several transaction hashes in one JSON-RPC batch.
+        If the batch fails, the transactions are traced one by one so that
+        errors are handled per transaction as in `_get_calls_from_tx`.
         """
-        calls.append(
-            {"from": call["from"], "to": call["to"], "type": call["type"]}
+        self.logger.info(f"Tracing batch of {len(tx_hashes)} transactions.")
+        res = self._batch(
+            lambda h: self.w3.geth.debug.trace_transaction(h, CALL_TRACER),
+            tx_hashes,
         )
-        for subcall in call.get("calls", []):
-            self._extract_all_subcalls(subcall, calls)
+        if res is not None:
+            return res
+        self.logger.info("Tracing batch transactions one by one.")
+        return [self._get_calls_from_tx(h) for h in tx_hashes]
 
-    def _extract_calls(
+    def _get_cached(
+        self, items: Iterable[Any], key: Callable[[Any], str]
+    ) -> Dict[Any, Any]:
+        """
+        Looks up the traces of the given transactions or blocks
+        in the trace cache.
+        """
+        if self.trace_cache is None:
+            return {}
+        keys = {item: key(item) for item in items}
+        found = self.trace_cache.get_many(list(keys.values()))
+        cached = {item: found[k] for item, k in keys.items() if k in found}
+        if cached:
+            self.logger.info(f"Found {len(cached)} cached traces.")
+        return cached
+
+    def _put_cached(
         self,
-        call: Dict[str, Any],
-        contract_address: str,
-        calls: List[Dict[str, str]],
-    ) -> None:
+        traces: Dict[str, Tuple[Optional[int], Any]],
+        head: Optional[int] = None,
+    ) -> Optional[int]:
         """
-        Extracts calls from a call and its subcalls.
+        Stores traces, given with the number of their block,
+        in the trace cache if their block is final.
+        Returns the latest block number used to check finality, fetched
+        if `head` is None, so that the iterators writing the cache batch
+        by batch fetch it once.
         """
-        if call["from"].lower() == contract_address.lower():
-            calls.append(
-                {"from": call["from"], "to": call["to"], "type": call["type"]}
-            )
-            for subcall in call.get("calls", []):
-                self._extract_all_subcalls(subcall, calls)
-        for subcall in call.get("calls", []):
-            self._extract_calls(subcall, contract_address, calls)
+        if self.trace_cache is None or not traces:
+            return head
+        if head is None:
+            try:
+                head = self.w3.eth.block_number
+            except Exception as e:
+                self.logger.error(f"Error getting the latest block: {e}")
+                return None
+        self.trace_cache.put_many(
+            {
+                k: value
+                for k, (block, value) in traces.items()
+                if self.trace_cache.is_final(block, head)
+            }
+        )
+        return head
+
+    def _iter_tx_frames(
+        self, tx_hashes: Set[str] | Dict[str, Optional[int]]
+    ) -> Iterator[Tuple[Optional[int], Dict[str, Any]]]:
+        """
+        Traces transactions, reading and writing the trace cache, and
+        yields their block number, if known, and their call tree.
+        The traces of each batch are written to the cache before they are
+        yielded, so that they are kept if the iteration stops early.
+        """
+        tx_blocks = tx_hashes if isinstance(tx_hashes, dict) else {}
+        cached = self._get_cached(tx_hashes, lambda h: tx_key(h, CALL_TRACER))
+        for h, res in cached.items():
+            yield tx_blocks.get(h), res
+
+        missing = [h for h in tx_hashes if h not in cached]
+        size = self.batch_size or 1
+        head = None
+        for i in range(0, len(missing), size):
+            chunk = missing[i : i + size]
+            if self.batch_size is None:
+                results = [self._get_calls_from_tx(h) for h in chunk]
+            else:
+                results = self._get_calls_from_txs(chunk)
+            frames = [
+                (h, res) for h, res in zip(chunk, results, strict=True) if res
+            ]
+            if self.trace_cache is not None:
+                head = self._put_cached(
+                    {
+                        tx_key(h, CALL_TRACER): (
+                            tx_blocks.get(h),
+                            self._compact_frame(res),
+                        )
+                        for h, res in frames
+                    },
+                    head,
+                )
+            for h, res in frames:
+                yield tx_blocks.get(h), res
 
     def get_calls(
-        self, tx_hashes: Set[str], contract_address: str
+        self,
+        tx_hashes: Set[str] | Dict[str, Optional[int]],
+        contract_address: str,
     ) -> List[Dict[str, str]]:
         """
         Gets calls for a given set of transaction hashes and contract address.
+        If `tx_hashes` maps the hashes to their block numbers, the traces
+        of final blocks are written to the trace cache.
         """
         self.logger.info(f"Getting calls for contract {contract_address}.")
         calls = []
-        for h in tx_hashes:
-            res = self._get_calls_from_tx(h)
-            if res:
-                self._extract_calls(res, contract_address, calls)
+        for block, frame in self._iter_tx_frames(tx_hashes):
+            self._extract_calls(frame, contract_address, calls, block)
         self.logger.info(f"Extracted {len(calls)} calls.")
         return calls
 
+    def _get_parity_traces_from_block(
+        self, block: int
+    ) -> List[Dict[str, Any]]:
+        """
+        Gets the flat Parity traces of a block.
+        """
+        self.logger.info(f"Tracing block {block}.")
+        try:
+            return self.w3.tracing.trace_block(block)
+        except Exception as e:
+            self.logger.error(f"Error tracing block {block}: {e}")
+            return []
+
+    def _iter_parity_frames(
+        self, blocks: List[int], tx_hashes: Set[str]
+    ) -> Iterator[Tuple[int, Dict[str, Any]]]:
+        """
+        Traces blocks with trace_block, reading and writing the trace
+        cache, and yields the block number and call tree of each
+        transaction in `tx_hashes`.
+        """
+        size = self.batch_size or 1
+        cached = self._get_cached(
+            blocks, lambda b: block_key(b, PARITY_TRACER)
+        )
+        for b, traces in cached.items():
+            for tree in self._parity_call_trees(traces, tx_hashes):
+                yield b, tree
+
+        missing = [b for b in blocks if b not in cached]
+        head = None
+        for i in range(0, len(missing), size):
+            chunk = missing[i : i + size]
+            results = None
+            if len(chunk) > 1:
+                results = self._batch(self.w3.tracing.trace_block, chunk)
+            if results is None:
+                results = [
+                    self._get_parity_traces_from_block(b) for b in chunk
+                ]
+            head = self._put_cached(
+                {
+                    block_key(b, PARITY_TRACER): (b, traces)
+                    for b, traces in zip(chunk, results, strict=True)
+                    if traces
+                },
+                head,
+            )
+            for b, traces in zip(chunk, results, strict=True):
+                for tree in self._parity_call_trees(traces or [], tx_hashes):
+                    yield b, tree
+
+    def get_calls_parity(
+        self, blocks: List[int], tx_hashes: Set[str], contract_address: str
+    ) -> List[Dict[str, str]]:
+        """
+        Gets calls for a given list of blocks and contract address from
+        Parity block traces, without tracing transactions one by one.
+        Only the transactions in `tx_hashes` are considered.
+        """
+        self.logger.info(f"Getting calls for contract {contract_address}.")
+        calls = []
+        for block, frame in self._iter_parity_frames(blocks, tx_hashes):
+            self._extract_calls(frame, contract_address, calls, block)
+        self.logger.info(f"Extracted {len(calls)} calls.")
+        return calls
+
+    def _get_debug_traces_from_block(self, block: int) -> List[Dict[str, Any]]:
+        """
+        Gets the callTracer traces of all transactions in a block.
+        """
+        self.logger.info(f"Tracing block {block}.")
+        try:
+            return self.w3.debug_block.trace_block_by_number(
+                hex(block), CALL_TRACER
+            )
+        except Exception as e:
+            self.logger.error(f"Error tracing block {block}: {e}")
+            return []
+
+    def _iter_block_frames(
+        self, blocks: List[int]
+    ) -> Iterator[Tuple[int, Dict[str, Any]]]:
+        """
+        Traces blocks with debug_traceBlockByNumber, reading and writing
+        the trace cache, and yields the block number and call tree of
+        each transaction.
+        """
+        size = self.batch_size or 1
+        cached = self._get_cached(blocks, lambda b: block_key(b, CALL_TRACER))
+        for b, frames in cached.items():
+            for frame in frames:
+                yield b, self._checksum_frame(frame)
+
+        missing = [b for b in blocks if b not in cached]
+        head = None
+        for i in range(0, len(missing), size):
+            chunk = missing[i : i + size]
+            results = None
+            if len(chunk) > 1:
+                results = self._batch(
+                    lambda b: self.w3.debug_block.trace_block_by_number(
+                        hex(b), CALL_TRACER
+                    ),
+                    chunk,
+                )
+            if results is None:
+                results = [self._get_debug_traces_from_block(b) for b in chunk]
+            frames = {}
+            for b, traces in zip(chunk, results, strict=True):
+                complete = bool(traces)
+                for trace in traces or []:
+                    if trace.get("error"):
+                        complete = False
+                        self.logger.error(
+                            f"Error tracing transaction "
+                            f"{trace.get('txHash')}: {trace['error']}"
+                        )
+                if complete and self.trace_cache is not None:
+                    frames[block_key(b, CALL_TRACER)] = (
+                        b,
+                        [
+                            self._compact_frame(t["result"])
+                            for t in traces
+                            if t.get("result")
+                        ],
+                    )
+            head = self._put_cached(frames, head)
+            for b, traces in zip(chunk, results, strict=True):
+                for trace in traces or []:
+                    if trace.get("result"):
+                        yield b, self._checksum_frame(trace["result"])
+
+    def get_calls_from_blocks(
+        self, blocks: List[int], contract_address: str
+    ) -> List[Dict[str, str]]:
+        """
+        Gets calls for a given list of blocks and contract address,
+        tracing every transaction of a block in a single request.
+        """
+        self.logger.info(f"Getting calls for contract {contract_address}.")
+        calls = []
+        for block, frame in self._iter_block_frames(blocks):
+            self._extract_calls(frame, contract_address, calls, block)
+        self.logger.info(f"Extracted {len(calls)} calls.")
+        return calls
+
+    def _valid_addresses(
+        self, calls: List[Dict[str, str]], to_block
+    ) -> Set[str]:
+        """
+        Returns the addresses of the calls that are contracts.
+        Each unique address is validated once.
+        """
+        addresses = list(
+            dict.fromkeys(a for c in calls for a in (c["to"], c["from"]))
+        )
+        return self._contract_addresses(addresses, to_block)
+
+    def _contract_addresses(self, addresses: List[str], to_block) -> Set[str]:
+        """
+        Returns the unique addresses that are contracts.
+        """
+        self._prefetch_address_kinds(addresses, to_block)
+        return {a for a in addresses if self._validate_contract(a, to_block)}
+
     def _filter_contract_calls(
         self, calls: List[Dict[str, str]], to_block
     ) -> List[Dict[str, str]]:
         """
         Filters calls to contract addresses.
         """
-        return [
-            c
-            for c in calls
-            if self._validate_contract(c["to"], to_block)
-            and self._validate_contract(c["from"], to_block)
-        ]
+        valid = self._valid_addresses(calls, to_block)
+        return [c for c in calls if c["to"] in valid and c["from"] in valid]
+
+    def _iter_frames(
+        self,
+        from_block: str,
+        to_block: str,
+        contract_address: str | List[str],
+        strategy: str,
+    ) -> Iterator[Tuple[Optional[int], Dict[str, Any]]]:
+        """
+        Yields the block number and call tree of the transactions
+        of a block range in which the contract addresses send calls,
+        collected with one of `STRATEGIES`.
+        """
+        if strategy == "parity":
+            tx_blocks = self._trace_filter(
+                from_block, to_block, contract_address
+            )
+            blocks = sorted(set(tx_blocks.values()))
+            frames = self._iter_parity_frames(blocks, set(tx_blocks))
+        elif strategy == "block":
+            blocks = list(
+                range(block_number(from_block), block_number(to_block) + 1)
+            )
+            frames = self._iter_block_frames(blocks)
+        else:
+            frames = self._iter_tx_frames(
+                self._trace_filter(from_block, to_block, contract_address)
+            )
+        for frame in frames:
+            self.traced_txs += 1
+            yield frame
 
     def get_calls_from(
-        self, from_block: str, to_block: str, contract_address: str
+        self,
+        from_block: str,
+        to_block: str,
+        contract_address: str,
+        strategy: str = "transaction",
+        validation_block: Optional[str] = None,
     ) -> List[Dict[str, str]]:
         """
         Gets calls from a given block range and contract address.
+        Args:
+            from_block: Block number in hex format
+            to_block: Block number in hex format
+            contract_address: Address of the contract sending the calls
+            strategy: One of `STRATEGIES`
+            validation_block: Block number in hex format at which the
+                addresses are checked to be contracts, to_block if None.
+                Used when a range is collected in shards.
+        """
+        return self.get_call_buffer(
+            from_block,
+            to_block,
+            contract_address,
+            strategy=strategy,
+            validation_block=validation_block,
+        ).to_list()
+
+    def get_call_buffer(
+        self,
+        from_block: str,
+        to_block: str,
+        contract_address: str,
+        strategy: str = "transaction",
+        validation_block: Optional[str] = None,
+    ) -> CallBuffer:
+        """
+        Gets the same calls as `get_calls_from` in a `CallBuffer`,
+        without holding a dict per call.
         """
         self.logger.info(
             f"Getting calls from block {from_block} \
             to {to_block} for contract {contract_address}."
         )
-        if not self._validate_contract(contract_address, to_block):
+        if strategy not in STRATEGIES:
+            raise ValueError(
+                f"Unknown strategy {strategy}, expected one of {STRATEGIES}"
+            )
+        if validation_block is None:
+            validation_block = to_block
+        if not self._validate_contract(contract_address, validation_block):
+            raise ValueError("Invalid contract address or bytecode.")
+        calls = CallBuffer()
+        for block, frame in self._iter_frames(
+            from_block, to_block, contract_address, strategy
+        ):
+            self._extract_calls(frame, contract_address, calls, block)
+        self.logger.info(f"Extracted {len(calls)} calls.")
+        calls.retain(
+            self._contract_addresses(calls.addresses, validation_block)
+        )
+        return calls
+
+    def iter_calls(
+        self,
+        from_block: str,
+        to_block: str,
+        contract_address: str,
+        strategy: str = "transaction",
+        validation_block: Optional[str] = None,
+    ) -> Iterator[Dict[str, str]]:
+        """
+        Yields the calls of a given block range and contract address as
+        each transaction or block is traced, with the same arguments and
+        results as `get_calls_from`. The addresses of each transaction
+        are validated as soon as it is traced, so only the calls of one
+        transaction are held in memory.
+        Raises:
+            ValueError: On the first iteration, if the strategy is unknown
+                or the contract address is invalid
+        """
+        if strategy not in STRATEGIES:
+            raise ValueError(
+                f"Unknown strategy {strategy}, expected one of {STRATEGIES}"
+            )
+        if validation_block is None:
+            validation_block = to_block
+        if not self._validate_contract(contract_address, validation_block):
             raise ValueError("Invalid contract address or bytecode.")
-        tx_hashes = self._filter_txs_from(
-            from_block, to_block, contract_address
+        for block, frame in self._iter_frames(
+            from_block, to_block, contract_address, strategy
+        ):
+            calls = []
+            self._extract_calls(frame, contract_address, calls, block)
+            yield from self._filter_contract_calls(calls, validation_block)
+
+    def get_calls_from_many(
+        self,
+        from_block: str,
+        to_block: str,
+        contract_addresses: List[str],
+        strategy: str = "transaction",
+        validation_block: Optional[str] = None,
+    ) -> Dict[str, List[Dict[str, str]]]:
+        """
+        Gets the calls of several contracts from a given block range,
+        tracing each transaction or block once for all of them.
+        Contract addresses without valid code are skipped.
+        Args:
+            from_block: Block number in hex format
+            to_block: Block number in hex format
+            contract_addresses: Addresses of the contracts sending the calls
+            strategy: One of `STRATEGIES`
+            validation_block: Block number in hex format at which the
+                addresses are checked to be contracts, to_block if None.
+        Returns:
+            The calls of each valid contract address
+        Raises:
+            ValueError: If the strategy is unknown or no address is valid
+        """
+        self.logger.info(
+            f"Getting calls from block {from_block} to {to_block} "
+            f"for {len(contract_addresses)} contracts."
         )
-        calls = self.get_calls(tx_hashes, contract_address)
-        return self._filter_contract_calls(calls, to_block)
+        if strategy not in STRATEGIES:
+            raise ValueError(
+                f"Unknown strategy {strategy}, expected one of {STRATEGIES}"
+            )
+        if validation_block is None:
+            validation_block = to_block
+        contract_addresses = list(dict.fromkeys(contract_addresses))
+        self._prefetch_address_kinds(contract_addresses, validation_block)
+        contracts = {}
+        for a in contract_addresses:
+            if self._validate_contract(a, validation_block):
+                contracts[a.lower()] = a
+            else:
+                self.logger.warning(f"Skipping invalid contract address {a}")
+        if not contracts:
+            raise ValueError("No valid contract address or bytecode.")
+
+        calls = {a: [] for a in contracts}
+        for block, frame in self._iter_frames(
+            from_block, to_block, list(contracts.values()), strategy
+        ):
+            self._extract_calls_many(frame, calls, block)
+        valid = self._valid_addresses(
+            [c for cs in calls.values() for c in cs], validation_block
+        )
+        return {
+            contracts[a]: [
+                c for c in cs if c["to"] in valid and c["from"] in valid
+            ]
+            for a, cs in calls.items()
+        }
@@ -0,0 +1,202 @@
+import json
+import logging
+from collections import Counter
+from concurrent.futures import ThreadPoolExecutor
+
+from web3 import Web3
+
+from scsc.graph import CallGraph, CompactCallGraph
+from scsc.traces import AddressKindCache, TraceCache, TraceCollector
+from scsc.utils import (
+    validate_and_convert_address,
+    validate_and_convert_block_range,
+)
+
+
+class TransitiveSupplyChain:
+    """
+    Expands the supply chain of a contract hop by hop: the contracts it
+    calls are traced as senders over the same block range, then the
+    contracts they call, and so on. Each hop is traced in parallel and
+    the calls of a contract over a range are traced once per instance,
+    so dependencies shared by several contracts cost a single trace.
+
+    The graph sums the calls traced for each contract, so a call made in
+    a transaction sent by several traced contracts is counted once for
+    each of them.
+    """
+
+    def __init__(
+        self,
+        url: str,
+        contract_address: str,
+        batch_size: int | None = None,
+        address_cache: AddressKindCache | None = None,
+        max_depth: int | None = None,
+        trace_cache: TraceCache | None = None,
+        w3: Web3 | None = None,
+        compact: bool = False,
+    ):
+        """
+        Initializes the TransitiveSupplyChain with a URL and contract
+        address. The collector and graph options are the same as for
+        `SupplyChain`.
+        Raises:
+            ValueError: If the contract address is invalid
+        """
+        self.logger = logging.getLogger(self.__class__.__name__)
+        self.tc = TraceCollector(
+            url,
+            batch_size=batch_size,
+            address_cache=address_cache,
+            max_depth=max_depth,
+            trace_cache=trace_cache,
+            w3=w3,
+        )
+        self.contract_address = validate_and_convert_address(contract_address)
+        self._graph_class = CompactCallGraph if compact else CallGraph
+        self.cg = self._graph_class(self.contract_address)
+        # Hop at which each contract was reached, 0 for the contract
+        self.layers: dict[str, int] = {}
+        # Edge counts of the calls of each contract, keyed by
+        # (address, from_block, to_block, strategy)
+        self._memo: dict[tuple[str, str, str, str], Counter] = {}
+
+    def _contract_calls(
+        self, address: str, from_block: str, to_block: str, strategy: str
+    ) -> Counter:
+        """
+        Returns the edge counts of the calls a contract sends over a block
+        range, tracing them on the first request only. Addresses that are
+        not valid senders, such as precompiles, have no calls.
+        """
+        key = (address, from_block, to_block, strategy)
+        if key not in self._memo:
+            try:
+                counts = self.tc.get_call_buffer(
+                    from_block, to_block, address, strategy=strategy
+                ).edge_counts()
+            except ValueError as e:
+                self.logger.warning(f"Skipping {address}: {e}")
+                counts = Counter()
+            self._memo[key] = counts
+        return self._memo[key]
+
+    def expand(
+        self,
+        from_block: str | int,
+        to_block: str | int,
+        max_hops: int = 2,
+        max_contracts: int = 100,
+        workers: int = 8,
+        strategy: str = "transaction",
+    ) -> dict[str, int]:
+        """
+        Builds the layered call graph of the contract over a block range.
+        Args:
+            from_block: Block number in decimal or hex format
+            to_block: Block number in decimal or hex format
+            max_hops: Number of hops of dependencies whose own calls are
+                traced. With 0, only the calls of the contract are traced.
+            max_contracts: Maximum number of contracts traced in total.
+                When a hop does not fit, the contracts receiving the most
+                calls are traced first.
+            workers: Number of contracts traced in parallel
+            strategy: Collection strategy, one of `scsc.traces.STRATEGIES`
+        Returns:
+            The hop at which each contract of the graph was reached
+        Raises:
+            ValueError: If from_block is greater than to_block, a limit
+                is invalid or the contract address is invalid
+        """
+        if max_hops < 0:
+            raise ValueError(
+                f"max_hops must be a non-negative integer: {max_hops}"
+            )
+        if max_contracts < 1 or workers < 1:
+            raise ValueError(
+                "max_contracts and workers must be positive integers: "
+                f"{max_contracts}, {workers}"
+            )
+        from_block_hex, to_block_hex = validate_and_convert_block_range(
+            from_block, to_block
+        )
+        self.logger.info(
+            f"Expanding the supply chain from block {from_block} "
+            f"to {to_block} over {max_hops} hops."
+        )
+        self.cg = self._graph_class(self.contract_address)
+        self.layers = {self.contract_address: 0}
+        # Unlike its dependencies, the contract itself must be valid
+        key = (self.contract_address, from_block_hex, to_block_hex, strategy)
+        if key not in self._memo:
+            self._memo[key] = self.tc.get_call_buffer(
+                from_block_hex,
+                to_block_hex,
+                self.contract_address,
+                strategy=strategy,
+            ).edge_counts()
+        root = self._memo[key]
+        self.cg.add_edge_counts(root)
+        traced = 1
+        frontier_calls = root
+
+        with ThreadPoolExecutor(max_workers=workers) as executor:
+            for hop in range(1, max_hops + 2):
+                received = Counter()
+                for (_, v, _), count in frontier_calls.items():
+                    if v not in self.layers:
+                        received[v] += count
+                for address in received:
+                    self.layers[address] = hop
+                if hop > max_hops or not received:
+                    break
+                frontier = sorted(received, key=lambda a: (-received[a], a))
+                frontier = frontier[: max_contracts - traced]
+                if not frontier:
+                    break
+                self.logger.info(
+                    f"Tracing {len(frontier)} contracts at hop {hop}."
+                )
+                frontier_calls = Counter()
+                for counts in executor.map(
+                    lambda a: self._contract_calls(
+                        a, from_block_hex, to_block_hex, strategy
+                    ),
+                    frontier,
+                ):
+                    self.cg.add_edge_counts(counts)
+                    frontier_calls.update(counts)
+                traced += len(frontier)
+        self.logger.info(
+            f"Traced {traced} contracts, reached {len(self.layers)}."
+        )
+        return dict(self.layers)
+
+    def get_all_dependencies(self) -> list[str]:
+        """
+        Returns the contracts reached by the expansion, excluding the
+        contract itself, in hop order.
+        """
+        return [a for a in self.layers if a != self.contract_address]
+
+    def export_dot(self, filename: str) -> None:
+        """
+        Exports the call graph to a DOT file.
+        """
+        self.logger.info(f"Exporting call graph to DOT file: {filename}.")
+        self.cg.export_dot(filename)
+
+    def to_json(self) -> dict:
+        """
+        Converts the layered call graph to a JSON serializable format.
+        """
+        return {"layers": self.layers, "graph": self.cg.to_json()}
+
+    def export_json(self, filename: str) -> None:
+        """
+        Exports the layered call graph to a JSON file.
+        """
+        self.logger.info(f"Exporting call graph to JSON file: {filename}.")
+        with open(filename, "w") as f:
+            json.dump(self.to_json(), f)
@@ -1,6 +1,14 @@
 from scsc.utils.eth_utils import (
     validate_and_convert_address,
     validate_and_convert_block,
+    validate_and_convert_block_range,
 )
+from scsc.utils.provider import close_providers, get_web3
 
-__all__ = ["validate_and_convert_block", "validate_and_convert_address"]
+__all__ = [
+    "validate_and_convert_block",
+    "validate_and_convert_address",
+    "validate_and_convert_block_range",
+    "get_web3",
+    "close_providers",
+]
@@ -24,6 +24,26 @@ def validate_and_convert_block(block: str) -> str:
     ) from None
 
 
+def validate_and_convert_block_range(
+    from_block: str | int, to_block: str | int
+) -> tuple[str, str]:
+    """
+    Validates a block range and converts it to hex format.
+
+    Raises:
+        ValueError: If a block number is invalid
+            or from_block is greater than to_block
+    """
+    from_block_hex = validate_and_convert_block(from_block)
+    to_block_hex = validate_and_convert_block(to_block)
+
+    if int(from_block_hex, 16) > int(to_block_hex, 16):
+        raise ValueError(
+            f"from_block ({from_block}) must be less than or equal to to_block ({to_block})"
+        )
+    return from_block_hex, to_block_hex
+
+
 def validate_and_convert_address(address: str) -> str:
     """
     Validates if the address is a valid Ethereum address and converts to checksum.
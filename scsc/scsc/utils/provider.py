@@ -0,0 +1,57 @@
+import threading
+from typing import Dict, Tuple
+
+import requests
+from requests.adapters import HTTPAdapter
+from web3 import Web3
+
+# Number of keep-alive connections kept open per node URL
+POOL_SIZE = 10
+
+_providers: Dict[Tuple[str, int], Tuple[Web3, requests.Session]] = {}
+_lock = threading.Lock()
+
+
+def get_web3(url: str, pool_size: int = POOL_SIZE) -> Web3:
+    """
+    Returns the Web3 instance of a node URL shared by the whole process.
+
+    The instance is created on first use, with a session keeping up to
+    `pool_size` connections alive, and the connection to the node is
+    checked once at that point.
+
+    Args:
+        url: Ethereum node URL
+        pool_size: Maximum number of pooled connections to the node
+    Raises:
+        ValueError: If pool_size is not positive
+        ConnectionError: If the node cannot be reached
+    """
+    if pool_size < 1:
+        raise ValueError(f"pool_size must be a positive integer: {pool_size}")
+
+    key = (url, pool_size)
+    with _lock:
+        if key in _providers:
+            return _providers[key][0]
+
+        session = requests.Session()
+        adapter = HTTPAdapter(pool_connections=1, pool_maxsize=pool_size)
+        session.mount("http://", adapter)
+        session.mount("https://", adapter)
+        w3 = Web3(Web3.HTTPProvider(url, session=session))
+        if not w3.is_connected():
+            session.close()
+            raise ConnectionError("Failed to connect to the Ethereum node.")
+        _providers[key] = (w3, session)
+        return w3
+
+
+def close_providers() -> None:
+    """
+    Closes the pooled connections and empties the registry.
+    """
+    with _lock:
+        for _, session in _providers.values():
+            session.close()
+        _providers.clear()
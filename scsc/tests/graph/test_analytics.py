@@ -0,0 +1,87 @@
+import unittest
+from unittest.mock import patch
+
+import networkx as nx
+
+from scsc.graph import CallGraph, CompactCallGraph
+
+A, B, C, D, E = ("0x" + x * 40 for x in "abcde")
+
+
+def build(graph_class):
+    cg = graph_class(A)
+    cg.add_call(A, B, "CALL", 3)
+    cg.add_call(A, C, "STATICCALL")
+    cg.add_call(B, D, "CALL")
+    cg.add_call(C, D, "DELEGATECALL", 2)
+    cg.add_call(D, E, "CALL")
+    cg.add_call(E, D, "CALL")
+    return cg
+
+
+class TestGraphAnalytics(unittest.TestCase):
+    graph_class = CallGraph
+
+    def setUp(self):
+        self.cg = build(self.graph_class)
+
+    def test_pagerank_matches_networkx(self):
+        G = nx.DiGraph()
+        for u, v, types in self.cg.iter_edges():
+            G.add_edge(u, v, weight=sum(types.values()))
+        expected = nx.pagerank(G, tol=1.0e-8)
+        pagerank = self.cg.analytics.pagerank(tol=1.0e-8)
+        self.assertEqual(pagerank.keys(), expected.keys())
+        for address, rank in expected.items():
+            self.assertAlmostEqual(pagerank[address], rank, places=6)
+
+    def test_reachable(self):
+        self.assertCountEqual(self.cg.analytics.reachable(), [B, C, D, E])
+        self.assertCountEqual(self.cg.analytics.reachable(D), [E])
+        with self.assertRaises(ValueError):
+            self.cg.analytics.reachable("0x" + "f" * 40)
+
+    def test_strongly_connected_components(self):
+        components = self.cg.analytics.strongly_connected_components()
+        self.assertEqual([sorted(c) for c in components], [[D, E]])
+
+    def test_single_points_of_failure(self):
+        self.assertEqual(
+            self.cg.analytics.single_points_of_failure(), {D: [E]}
+        )
+
+    def test_articulation_points(self):
+        self.assertEqual(self.cg.analytics.articulation_points(), [D])
+
+    def test_count_change_keeps_unweighted_metrics(self):
+        analytics = self.cg.analytics
+        rank = analytics.pagerank()[B]
+        components = analytics.strongly_connected_components()
+        self.cg.add_call(A, B, "CALL", 100)
+        with patch(
+            "scsc.graph.analytics.csgraph.connected_components"
+        ) as connected_components:
+            self.assertIs(
+                analytics.strongly_connected_components(), components
+            )
+            connected_components.assert_not_called()
+        self.assertGreater(analytics.pagerank()[B], rank)
+
+    def test_structure_change_invalidates_metrics(self):
+        analytics = self.cg.analytics
+        self.assertEqual(len(analytics.strongly_connected_components()), 1)
+        self.cg.add_call(D, A, "CALL")
+        self.assertEqual(
+            sorted(analytics.strongly_connected_components()[0]),
+            sorted([A, B, C, D, E]),
+        )
+        self.cg.remove_call(D, A, "CALL")
+        self.assertEqual(len(analytics.strongly_connected_components()), 1)
+
+
+class TestCompactGraphAnalytics(TestGraphAnalytics):
+    graph_class = CompactCallGraph
+
+
+if __name__ == "__main__":
+    unittest.main()
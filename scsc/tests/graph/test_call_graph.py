@@ -2,6 +2,7 @@ import json
 import os
 import shutil
 import unittest
+from unittest.mock import patch
 
 from scsc.graph import CallGraph
 
@@ -23,6 +24,63 @@ class TestCallGraph(unittest.TestCase):
         edge_data = self.call_graph.G.edges[from_address, to_address]["types"]
         self.assertEqual(edge_data["CALL"], 1)
 
+    def test_remove_call(self):
+        self.call_graph.add_call("0x123", "0x456", "CALL")
+        self.call_graph.add_call("0x123", "0x456", "CALL")
+        self.call_graph.add_call("0x123", "0x456", "STATICCALL")
+        self.call_graph.add_call("0x456", "0x789", "CALL")
+
+        self.call_graph.remove_call("0x123", "0x456", "CALL")
+        self.assertEqual(
+            self.call_graph.G.edges["0x123", "0x456"]["types"],
+            {"CALL": 1, "STATICCALL": 1},
+        )
+        self.call_graph.remove_call("0x456", "0x789", "CALL")
+        self.assertNotIn("0x789", self.call_graph.get_all_contracts())
+        self.call_graph.remove_call("0x123", "0x456", "CALL")
+        self.call_graph.remove_call("0x123", "0x456", "STATICCALL")
+        self.assertEqual(self.call_graph.get_all_contracts(), [])
+
+    def test_add_calls(self):
+        calls = [{"from": "0x123", "to": "0x456", "type": "CALL"}] * 1000
+        calls.append({"from": "0x456", "to": "0x789", "type": "STATICCALL"})
+        with patch.object(
+            self.call_graph,
+            "_add_labeled_edge",
+            wraps=self.call_graph._add_labeled_edge,
+        ) as add_labeled_edge:
+            self.call_graph.add_calls(calls)
+        self.assertEqual(add_labeled_edge.call_count, 2)
+        self.assertEqual(
+            self.call_graph.G.edges["0x123", "0x456"]["types"], {"CALL": 1000}
+        )
+
+    def test_from_edge_counts(self):
+        cg = CallGraph.from_edge_counts(
+            "0x123",
+            {("0x123", "0x456", "CALL"): 2, ("0x123", "0x456", "CREATE"): 1},
+        )
+        self.assertEqual(cg.contract_address, "0x123")
+        self.assertEqual(
+            cg.G.edges["0x123", "0x456"]["types"], {"CALL": 2, "CREATE": 1}
+        )
+
+    def test_merge(self):
+        other = CallGraph(self.contract_address)
+        self.call_graph.add_call("0x123", "0x456", "CALL")
+        other.add_call("0x123", "0x456", "CALL")
+        other.add_call("0x123", "0x456", "STATICCALL")
+        other.add_call("0x456", "0x789", "CALL")
+
+        self.call_graph.merge(other)
+        self.assertEqual(
+            self.call_graph.G.edges["0x123", "0x456"]["types"],
+            {"CALL": 2, "STATICCALL": 1},
+        )
+        self.assertEqual(
+            self.call_graph.G.edges["0x456", "0x789"]["types"], {"CALL": 1}
+        )
+
     def test_get_callee_contracts(self):
         from_address = "0x123"
         to_address = "0x456"
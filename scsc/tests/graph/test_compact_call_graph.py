@@ -0,0 +1,110 @@
+import random
+import unittest
+
+import networkx as nx
+
+from scsc.graph import CallGraph, CompactCallGraph
+
+TYPES = ["CALL", "STATICCALL", "DELEGATECALL"]
+
+
+def _json(cg):
+    data = cg.to_json()
+    return (
+        sorted(n["id"] for n in data["nodes"]),
+        sorted(
+            (e["source"], e["target"], sorted(e["types"].items()))
+            for e in data["edges"]
+        ),
+    )
+
+
+class TestCompactCallGraph(unittest.TestCase):
+    def setUp(self):
+        self.call_graph = CompactCallGraph("0x123")
+
+    def test_add_call(self):
+        self.call_graph.add_call("0x123", "0x456", "CALL")
+        self.call_graph.add_call("0x123", "0x456", "CALL", 2)
+        self.call_graph.add_call("0x123", "0x789", "STATICCALL")
+        self.assertEqual(
+            self.call_graph.G.edges["0x123", "0x456"]["types"], {"CALL": 3}
+        )
+        self.assertEqual(
+            self.call_graph.get_callee_contracts("0x123"), ["0x456", "0x789"]
+        )
+        self.assertEqual(
+            self.call_graph.get_caller_contracts("0x789"), ["0x123"]
+        )
+        with self.assertRaises(nx.NetworkXError):
+            self.call_graph.get_callee_contracts("0xabc")
+
+    def test_remove_call(self):
+        self.call_graph.add_call("0x123", "0x456", "CALL", 2)
+        self.call_graph.add_call("0x123", "0x456", "STATICCALL")
+        self.call_graph.add_call("0x456", "0x789", "CALL")
+
+        self.call_graph.remove_call("0x123", "0x456", "CALL")
+        self.assertEqual(
+            self.call_graph.G.edges["0x123", "0x456"]["types"],
+            {"CALL": 1, "STATICCALL": 1},
+        )
+        self.call_graph.remove_call("0x456", "0x789", "CALL")
+        self.assertNotIn("0x789", self.call_graph.get_all_contracts())
+        self.assertEqual(self.call_graph.get_callee_contracts("0x456"), [])
+        self.call_graph.remove_call("0x123", "0x456", "CALL")
+        self.call_graph.remove_call("0x123", "0x456", "STATICCALL")
+        self.assertEqual(self.call_graph.get_all_contracts(), [])
+
+    def test_same_graph_as_call_graph(self):
+        rng = random.Random(0)
+        nodes = [f"0x{i}" for i in range(20)]
+        reference = CallGraph("0x0")
+        ops = []
+        for _ in range(500):
+            u, v, t = rng.choice(nodes), rng.choice(nodes), rng.choice(TYPES)
+            ops.append((u, v, t))
+            reference.add_call(u, v, t)
+            self.call_graph.add_call(u, v, t)
+        for u, v, t in rng.sample(ops, 300):
+            reference.remove_call(u, v, t)
+            self.call_graph.remove_call(u, v, t)
+
+        self.assertEqual(_json(self.call_graph), _json(reference))
+        for a in reference.get_all_contracts():
+            self.assertCountEqual(
+                self.call_graph.get_callee_contracts(a),
+                reference.get_callee_contracts(a),
+            )
+            self.assertCountEqual(
+                self.call_graph.get_caller_contracts(a),
+                reference.get_caller_contracts(a),
+            )
+
+    def test_add_calls(self):
+        self.call_graph.add_calls(
+            [{"from": "0x123", "to": "0x456", "type": "CALL"}] * 3
+        )
+        cg = CompactCallGraph.from_edge_counts(
+            "0x123", {("0x123", "0x456", "CALL"): 3}
+        )
+        self.assertEqual(_json(cg), _json(self.call_graph))
+
+    def test_merge_across_backends(self):
+        other = CallGraph("0x123")
+        other.add_call("0x123", "0x456", "CALL")
+        other.add_call("0x123", "0x456", "STATICCALL")
+        self.call_graph.add_call("0x123", "0x456", "CALL")
+        self.call_graph.merge(other)
+        self.assertEqual(
+            dict(self.call_graph.G.edges["0x123", "0x456"]["types"]),
+            {"CALL": 2, "STATICCALL": 1},
+        )
+
+        reference = CallGraph("0x123")
+        reference.merge(self.call_graph)
+        self.assertEqual(_json(reference), _json(self.call_graph))
+
+
+if __name__ == "__main__":
+    unittest.main()
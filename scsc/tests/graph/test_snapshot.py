@@ -0,0 +1,70 @@
+import os
+import shutil
+import unittest
+
+from scsc.graph import CallGraph, CompactCallGraph, read_snapshot
+
+try:
+    import pyarrow as pa
+except ImportError:  # pragma: no cover - optional dependency
+    pa = None
+
+A, B, C, D = ("0x" + x * 40 for x in "abcd")
+
+
+def _edges(cg):
+    return sorted((u, v, sorted(t.items())) for u, v, t in cg.iter_edges())
+
+
+@unittest.skipIf(pa is None, "pyarrow is not installed")
+class TestSnapshot(unittest.TestCase):
+    def setUp(self):
+        self.test_dir = "test_output"
+        os.makedirs(self.test_dir, exist_ok=True)
+        self.path = os.path.join(self.test_dir, "graph.arrow")
+        self.cg = CallGraph(A)
+        self.cg.add_call(A, B, "CALL", 3)
+        self.cg.add_call(A, B, "STATICCALL")
+        self.cg.add_call(B, C, "DELEGATECALL", 2)
+        self.cg.add_call(C, A, "CALL")
+
+    def tearDown(self):
+        shutil.rmtree(self.test_dir)
+
+    def test_round_trip(self):
+        self.cg.export_snapshot(self.path)
+        for graph_class in (CallGraph, CompactCallGraph):
+            cg = graph_class.load_snapshot(self.path)
+            self.assertEqual(cg.contract_address, A)
+            self.assertCountEqual(cg.get_all_contracts(), [A, B, C])
+            self.assertEqual(_edges(cg), _edges(self.cg))
+
+    def test_compact_round_trip(self):
+        compact = CompactCallGraph(None)
+        compact.merge(self.cg)
+        compact.remove_call(A, B, "STATICCALL")
+        compact.export_snapshot(self.path)
+        cg = CompactCallGraph.load_snapshot(self.path)
+        self.assertIsNone(cg.contract_address)
+        self.assertEqual(_edges(cg), _edges(compact))
+        self.assertEqual(cg.get_callee_contracts(A), [B])
+        cg.add_call(C, D, "CALL")
+        self.assertEqual(cg.get_caller_contracts(D), [C])
+        cg.remove_call(A, B, "CALL", 3)
+        self.assertCountEqual(cg.get_all_contracts(), [A, B, C, D])
+        self.assertEqual(cg.get_callee_contracts(A), [])
+
+    def test_empty_graph(self):
+        CallGraph(A).export_snapshot(self.path)
+        cg = CallGraph.load_snapshot(self.path)
+        self.assertEqual(cg.get_all_contracts(), [])
+
+    def test_not_a_snapshot(self):
+        with pa.ipc.new_file(self.path, pa.schema([])) as writer:
+            writer.write_table(pa.table({}))
+        with self.assertRaises(ValueError):
+            read_snapshot(self.path)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,57 @@
+import os
+import shutil
+import unittest
+from unittest.mock import patch
+
+from scsc import MultiSupplyChain
+
+A, B, C = ("0x" + x * 40 for x in "abc")
+
+
+class TestMultiSupplyChain(unittest.TestCase):
+    @patch("web3.Web3.is_connected", return_value=True)
+    def setUp(self, mock_is_connected):
+        self.supply_chains = MultiSupplyChain(
+            "http://mock.ethereum.node", [A, B, A]
+        )
+        self.a, self.b = list(self.supply_chains.graphs)
+        self.c = C.upper().replace("0X", "0x")
+        self.test_dir = "test_output"
+        os.makedirs(self.test_dir, exist_ok=True)
+
+    def tearDown(self):
+        shutil.rmtree(self.test_dir)
+
+    def test_collect_calls(self):
+        shared = {"from": self.b, "to": self.c, "type": "CALL"}
+        calls = {
+            self.a: [{"from": self.a, "to": self.b, "type": "CALL"}, shared],
+            self.b: [shared],
+        }
+        with patch.object(
+            self.supply_chains.tc, "get_calls_from_many", return_value=calls
+        ) as mock_get_calls:
+            self.supply_chains.collect_calls(1, 10)
+        mock_get_calls.assert_called_once_with(
+            "0x1", "0xa", [self.a, self.b], strategy="transaction"
+        )
+
+        dependencies = self.supply_chains.get_all_dependencies()
+        self.assertEqual(set(dependencies[self.a]), {self.b, self.c})
+        self.assertEqual(dependencies[self.b], [self.c])
+        union = self.supply_chains.union.G
+        self.assertEqual(union.edges[self.b, self.c]["types"], {"CALL": 1})
+
+        self.supply_chains.export_dot(self.test_dir)
+        self.assertEqual(
+            sorted(os.listdir(self.test_dir)),
+            sorted([f"{self.a}.dot", f"{self.b}.dot", "union.dot"]),
+        )
+
+    def test_collect_calls_invalid_range(self):
+        with self.assertRaises(ValueError):
+            self.supply_chains.collect_calls(10, 1)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,258 @@
+import asyncio
+import os
+import shutil
+import unittest
+from multiprocessing.pool import ThreadPool
+from unittest.mock import patch
+
+import scsc.supply_chain
+from scsc.graph import CallGraph
+from scsc.supply_chain import SupplyChain, _init_shard_worker
+from scsc.traces import (
+    AddressKind,
+    AddressKindCache,
+    TraceCache,
+    TraceCollector,
+)
+from scsc.traces.call_buffer import CallBuffer
+
+try:
+    import pyarrow as pa
+except ImportError:  # pragma: no cover - optional dependency
+    pa = None
+
+CONTRACT = "0x" + "a" * 40
+CALLEES = ["0x" + x * 40 for x in "bcde"]
+
+
+class TestSupplyChain(unittest.TestCase):
+    @patch("web3.Web3.is_connected", return_value=True)
+    def setUp(self, mock_is_connected):
+        self.supply_chain = SupplyChain("http://mock.ethereum.node", CONTRACT)
+        self.contract = self.supply_chain.cg.contract_address
+
+    def calls(
+        self,
+        from_block,
+        to_block,
+        contract_address,
+        strategy,
+        validation_block=None,
+    ):
+        start, end = int(from_block, 16), int(to_block, 16)
+        self.collected.append((start, end))
+        return [
+            {
+                "from": contract_address,
+                "to": CALLEES[block % 2],
+                "type": "CALL" if block % 3 else "STATICCALL",
+                "block": block,
+            }
+            for block in range(start, end + 1)
+        ]
+
+    def call_buffer(self, *args, **kwargs):
+        return CallBuffer.from_calls(self.calls(*args, **kwargs))
+
+    def edges(self):
+        return {
+            (u, v): dict(data["types"])
+            for u, v, data in self.supply_chain.cg.G.edges(data=True)
+        }
+
+    def test_update_window_collects_new_blocks_only(self):
+        self.collected = []
+        with patch.object(
+            self.supply_chain.tc,
+            "get_call_buffer",
+            side_effect=self.call_buffer,
+        ):
+            self.supply_chain.update_window(10, 19)
+            self.supply_chain.update_window(13, 22)
+            incremental = self.edges()
+
+            self.supply_chain.reset()
+            self.supply_chain.update_window(13, 22)
+            rebuilt = self.edges()
+
+        self.assertEqual(self.collected, [(10, 19), (20, 22), (13, 22)])
+        self.assertEqual(incremental, rebuilt)
+
+    def test_update_window_validation_block(self):
+        self.collected = []
+        with patch.object(
+            self.supply_chain.tc,
+            "get_call_buffer",
+            side_effect=self.call_buffer,
+        ) as get_call_buffer:
+            self.supply_chain.update_window(10, 14, validation_block=29)
+            self.supply_chain.update_window(10, 19, validation_block=29)
+            self.supply_chain.update_window(10, 24)
+
+        self.assertEqual(
+            [c.kwargs["validation_block"] for c in get_call_buffer.mock_calls],
+            ["0x1d", "0x1d", "0x18"],
+        )
+
+    def test_get_network_async_is_repeatable(self):
+        self.collected = []
+
+        async def get_calls_from(from_block, to_block, contract, **kwargs):
+            return self.calls(from_block, to_block, contract, "transaction")
+
+        atc = self.supply_chain.atc
+        with (
+            patch.object(atc, "connect"),
+            patch.object(atc, "get_calls_from", side_effect=get_calls_from),
+        ):
+            first = asyncio.run(self.supply_chain.get_network_async(10, 19))
+            second = asyncio.run(self.supply_chain.get_network_async(10, 19))
+            asyncio.run(self.supply_chain.update_window_async(13, 22))
+        self.assertEqual(first, second)
+        self.assertEqual(self.collected, [(10, 19), (20, 22)])
+
+        incremental = self.edges()
+        self.supply_chain.reset()
+        with patch.object(
+            self.supply_chain.tc,
+            "get_call_buffer",
+            side_effect=self.call_buffer,
+        ):
+            self.supply_chain.update_window(13, 22)
+        self.assertEqual(incremental, self.edges())
+
+    def test_update_window_rebuilds_disjoint_range(self):
+        self.collected = []
+        with patch.object(
+            self.supply_chain.tc,
+            "get_call_buffer",
+            side_effect=self.call_buffer,
+        ):
+            self.supply_chain.update_window(10, 10)
+            self.supply_chain.update_window(21, 21)
+
+        self.assertEqual(self.collected, [(10, 10), (21, 21)])
+        self.assertEqual(
+            self.edges(), {(self.contract, CALLEES[1]): {"STATICCALL": 1}}
+        )
+
+    @patch("scsc.supply_chain.Pool", ThreadPool)
+    @patch("web3.Web3.is_connected", return_value=True)
+    def test_collect_calls_workers(self, mock_is_connected):
+        self.collected = []
+        progress = []
+        with (
+            patch.object(
+                TraceCollector, "get_call_buffer", side_effect=self.call_buffer
+            ),
+            patch.object(
+                TraceCollector, "_validate_contract", return_value=True
+            ),
+        ):
+            self.supply_chain.collect_calls(
+                10,
+                29,
+                workers=2,
+                progress=lambda done, total: progress.append((done, total)),
+            )
+            sharded = self.edges()
+
+            self.supply_chain.reset()
+            self.supply_chain.collect_calls(10, 29)
+            sequential = self.edges()
+
+        self.assertEqual(sharded, sequential)
+        # 7 shards of at most 3 blocks, then the sequential collection
+        self.assertEqual(len(self.collected), 8)
+        self.assertEqual(progress[-1], (20, 20))
+        self.assertEqual(
+            set(self.supply_chain._block_calls), set(range(10, 30))
+        )
+
+    def test_stream_calls_stops_early(self):
+        self.collected = []
+        calls = [
+            c
+            for block in range(10, 13)
+            for c in self.calls(hex(block), hex(block), self.contract, None)
+        ]
+        with patch.object(
+            self.supply_chain.tc, "iter_calls", return_value=iter(calls)
+        ):
+            stream = self.supply_chain.stream_calls(10, 12)
+            next(stream)
+            next(stream)
+            stream.close()
+        self.assertEqual(
+            self.edges(),
+            {
+                (self.contract, CALLEES[0]): {"CALL": 1},
+                (self.contract, CALLEES[1]): {"CALL": 1},
+            },
+        )
+
+    @patch("web3.Web3.is_connected", return_value=True)
+    def test_shard_workers_share_caches(self, mock_is_connected):
+        os.makedirs("test_output", exist_ok=True)
+        self.addCleanup(shutil.rmtree, "test_output")
+        address_path = os.path.join("test_output", "addresses.db")
+        trace_path = os.path.join("test_output", "traces.db")
+        supply_chain = SupplyChain(
+            "http://mock.ethereum.node",
+            CONTRACT,
+            batch_size=10,
+            address_cache=AddressKindCache(path=address_path),
+            trace_cache=TraceCache(trace_path, finality_depth=8),
+        )
+        supply_chain.tc.address_cache.put(CALLEES[0], AddressKind.CONTRACT, 10)
+
+        _init_shard_worker(*supply_chain._shard_worker_args())
+        collector = scsc.supply_chain._shard_collector
+        self.addCleanup(setattr, scsc.supply_chain, "_shard_collector", None)
+        self.assertEqual(collector.batch_size, 10)
+        self.assertEqual(collector.trace_cache.path, trace_path)
+        self.assertEqual(collector.trace_cache.finality_depth, 8)
+        self.assertEqual(
+            collector.address_cache.get(CALLEES[0], 11), AddressKind.CONTRACT
+        )
+
+    def test_collect_calls_invalid_workers(self):
+        with self.assertRaises(ValueError):
+            self.supply_chain.collect_calls(10, 29, workers=0)
+
+    def test_async_collector_created_on_use(self):
+        self.assertIsNone(self.supply_chain._atc)
+        atc = self.supply_chain.atc
+        self.assertIs(self.supply_chain.atc, atc)
+        self.assertIs(atc.address_cache, self.supply_chain.tc.address_cache)
+        with patch.object(atc, "close") as close:
+            asyncio.run(self.supply_chain.close_async())
+        close.assert_awaited_once()
+        self.assertIsNone(self.supply_chain._atc)
+
+    @unittest.skipIf(pa is None, "pyarrow is not installed")
+    def test_snapshot_round_trip(self):
+        self.collected = []
+        path = os.path.join("test_output", "supply_chain.arrow")
+        os.makedirs("test_output", exist_ok=True)
+        self.addCleanup(shutil.rmtree, "test_output")
+        with patch.object(
+            self.supply_chain.tc,
+            "get_call_buffer",
+            side_effect=self.call_buffer,
+        ):
+            self.supply_chain.update_window(10, 19)
+        edges = self.edges()
+        self.supply_chain.export_snapshot(path)
+        self.supply_chain.reset()
+        self.supply_chain.load_snapshot(path)
+        self.assertEqual(self.edges(), edges)
+
+        other = CallGraph(CALLEES[0])
+        other.export_snapshot(path)
+        with self.assertRaises(ValueError):
+            self.supply_chain.load_snapshot(path)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,93 @@
+import threading
+import unittest
+from unittest.mock import patch
+
+from web3 import Web3
+
+from scsc import TransitiveSupplyChain
+from scsc.traces.call_buffer import CallBuffer
+
+A, B, C, D, E, F = (Web3.to_checksum_address("0x" + x * 40) for x in "abcdef")
+
+# Calls sent by each contract over the whole range
+CALLS = {
+    A: [(A, B), (A, C), (A, C)],
+    B: [(B, D)],
+    C: [(C, D), (C, F)],
+    D: [(D, E)],
+    E: [],
+    F: [],
+}
+
+
+class TestTransitiveSupplyChain(unittest.TestCase):
+    @patch("web3.Web3.is_connected", return_value=True)
+    def setUp(self, mock_is_connected):
+        self.supply_chain = TransitiveSupplyChain(
+            "http://mock.ethereum.node", A
+        )
+        self.traced = []
+        self.lock = threading.Lock()
+
+    def call_buffer(self, from_block, to_block, address, strategy):
+        with self.lock:
+            self.traced.append(address)
+        return CallBuffer.from_calls(
+            {"from": u, "to": v, "type": "CALL"} for u, v in CALLS[address]
+        )
+
+    def expand(self, **kwargs):
+        with patch.object(
+            self.supply_chain.tc,
+            "get_call_buffer",
+            side_effect=self.call_buffer,
+        ):
+            return self.supply_chain.expand(1, 10, **kwargs)
+
+    def test_expand(self):
+        layers = self.expand(max_hops=3)
+        self.assertEqual(layers, {A: 0, B: 1, C: 1, D: 2, F: 2, E: 3})
+        self.assertCountEqual(self.traced, [A, B, C, D, F, E])
+        self.assertEqual(
+            self.supply_chain.cg.G.edges[A, C]["types"], {"CALL": 2}
+        )
+        self.assertIn((D, E), self.supply_chain.cg.G.edges)
+
+    def test_expand_is_memoized(self):
+        self.expand(max_hops=1)
+        self.expand(max_hops=2)
+        # A, B and C are traced once, D and F by the second expansion
+        self.assertEqual(sorted(self.traced), sorted([A, B, C, D, F]))
+
+    def test_expand_max_hops(self):
+        layers = self.expand(max_hops=0)
+        self.assertEqual(layers, {A: 0, B: 1, C: 1})
+        self.assertEqual(self.traced, [A])
+
+    def test_expand_max_contracts(self):
+        layers = self.expand(max_hops=3, max_contracts=2)
+        # C receives the most calls, so it is traced before B
+        self.assertEqual(self.traced, [A, C])
+        self.assertEqual(layers, {A: 0, B: 1, C: 1, D: 2, F: 2})
+
+    def test_expand_skips_invalid_dependencies(self):
+        def call_buffer(from_block, to_block, address, strategy):
+            if address == B:
+                raise ValueError("Invalid contract address or bytecode.")
+            return self.call_buffer(from_block, to_block, address, strategy)
+
+        with patch.object(
+            self.supply_chain.tc, "get_call_buffer", side_effect=call_buffer
+        ):
+            layers = self.supply_chain.expand(1, 10, max_hops=1)
+        self.assertEqual(layers, {A: 0, B: 1, C: 1, D: 2, F: 2})
+
+    def test_expand_invalid_limits(self):
+        with self.assertRaises(ValueError):
+            self.supply_chain.expand(1, 10, max_hops=-1)
+        with self.assertRaises(ValueError):
+            self.supply_chain.expand(1, 10, workers=0)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,70 @@
+import os
+import shutil
+import unittest
+
+from scsc.traces import AddressKind, AddressKindCache
+
+ADDRESS = "0x" + "ab" * 20
+
+
+class TestAddressKindCache(unittest.TestCase):
+    def setUp(self):
+        self.cache = AddressKindCache(maxsize=2)
+        self.test_dir = "test_output"
+        os.makedirs(self.test_dir, exist_ok=True)
+
+    def tearDown(self):
+        shutil.rmtree(self.test_dir)
+
+    def test_precompile(self):
+        self.assertEqual(
+            self.cache.get("0x" + "0" * 39 + "1", "0x10"),
+            AddressKind.PRECOMPILE,
+        )
+
+    def test_contract_valid_for_later_blocks(self):
+        self.cache.put(ADDRESS, AddressKind.CONTRACT, "0x10")
+        self.assertEqual(self.cache.get(ADDRESS, 20), AddressKind.CONTRACT)
+        self.assertIsNone(self.cache.get(ADDRESS, 15))
+
+    def test_eoa_valid_for_earlier_blocks(self):
+        self.cache.put(
+            ADDRESS.upper().replace("0X", "0x"), AddressKind.EOA, 16
+        )
+        self.assertEqual(self.cache.get(ADDRESS, "0x0f"), AddressKind.EOA)
+        self.assertIsNone(self.cache.get(ADDRESS, 17))
+
+    def test_block_tag(self):
+        self.cache.put(ADDRESS, AddressKind.CONTRACT, "latest")
+        self.assertIsNone(self.cache.get(ADDRESS, "latest"))
+
+    def test_lru_eviction(self):
+        a, b, c = ("0x" + x * 40 for x in "abc")
+        self.cache.put(a, AddressKind.CONTRACT, 1)
+        self.cache.put(b, AddressKind.CONTRACT, 1)
+        self.cache.get(a, 1)
+        self.cache.put(c, AddressKind.CONTRACT, 1)
+        self.assertEqual(len(self.cache), 2)
+        self.assertIsNone(self.cache.get(b, 1))
+        self.assertEqual(self.cache.get(a, 1), AddressKind.CONTRACT)
+
+    def test_persistent_tier(self):
+        path = os.path.join(self.test_dir, "addresses.db")
+        cache = AddressKindCache(path=path)
+        cache.put_many(
+            {
+                ADDRESS: AddressKind.CONTRACT,
+                "0x" + "cd" * 20: AddressKind.EMPTY,
+            },
+            100,
+        )
+        cache.close()
+
+        cache = AddressKindCache(path=path)
+        self.assertEqual(cache.get(ADDRESS, 200), AddressKind.CONTRACT)
+        self.assertEqual(cache.get("0x" + "cd" * 20, 50), AddressKind.EMPTY)
+        cache.close()
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,193 @@
+import asyncio
+import unittest
+from unittest.mock import AsyncMock, MagicMock, patch
+
+from web3.exceptions import Web3RPCError
+
+from scsc.traces import AsyncTraceCollector
+
+
+class TestAsyncTraceCollector(unittest.IsolatedAsyncioTestCase):
+    def setUp(self):
+        self.trace_collector = AsyncTraceCollector(
+            url="http://mock.ethereum.node", max_concurrency=2
+        )
+        self.mock_w3 = MagicMock()
+        self.trace_collector.w3 = self.mock_w3
+
+    def test_init_invalid_max_concurrency(self):
+        with self.assertRaises(ValueError):
+            AsyncTraceCollector("http://mock.ethereum.node", max_concurrency=0)
+
+    async def test_connect_failure(self):
+        self.mock_w3.is_connected = AsyncMock(return_value=False)
+        with self.assertRaises(ConnectionError):
+            await self.trace_collector.connect()
+
+    async def test_filter_txs_from(self):
+        self.mock_w3.manager.coro_request = AsyncMock(
+            return_value=[
+                {"transactionHash": "0x1", "type": "call"},
+                {"transactionHash": "0x2", "type": "call"},
+            ]
+        )
+        tx_hashes = await self.trace_collector._filter_txs_from(
+            "0x1", "0xa", "0x123"
+        )
+        self.assertEqual(tx_hashes, {"0x1", "0x2"})
+
+    async def test_filter_txs_from_splits_failed_chunks(self):
+        async def coro_request(method, params):
+            start = int(params[0]["fromBlock"], 16)
+            end = int(params[0]["toBlock"], 16)
+            if end > start:
+                raise Exception("query timeout exceeded")
+            return [{"transactionHash": f"0x{start:x}", "type": "call"}]
+
+        self.mock_w3.manager.coro_request = coro_request
+        tx_hashes = await self.trace_collector._filter_txs_from(
+            "0x1", "0x4", "0x123"
+        )
+        self.assertEqual(tx_hashes, {"0x1", "0x2", "0x3", "0x4"})
+
+    async def test_filter_txs_from_reports_failed_block(self):
+        self.mock_w3.manager.coro_request = AsyncMock(
+            side_effect=Exception("response too large")
+        )
+        with self.assertRaises(RuntimeError):
+            await self.trace_collector._filter_txs_from("0x1", "0x2", "0x123")
+
+    async def test_filter_txs_from_unsupported_method(self):
+        self.mock_w3.manager.coro_request = AsyncMock(
+            side_effect=Web3RPCError(
+                "the method trace_filter does not exist/is not available",
+                rpc_response={"error": {"code": -32601}},
+            )
+        )
+        with self.assertRaises(RuntimeError):
+            await self.trace_collector._filter_txs_from(
+                "0x1", "0x1b58", "0x123"
+            )
+        self.mock_w3.manager.coro_request.assert_awaited_once()
+
+    async def test_get_calls_bounded_concurrency(self):
+        in_flight = 0
+        max_in_flight = 0
+
+        async def trace_transaction(tx_hash, config):
+            nonlocal in_flight, max_in_flight
+            in_flight += 1
+            max_in_flight = max(max_in_flight, in_flight)
+            await asyncio.sleep(0.01)
+            in_flight -= 1
+            return {
+                "from": "0x1",
+                "to": "0x2",
+                "type": "call",
+                "calls": [{"from": "0x2", "to": "0x3", "type": "call"}],
+            }
+
+        self.mock_w3.geth.debug.trace_transaction = trace_transaction
+        calls = await self.trace_collector.get_calls(
+            ["0xa", "0xb", "0xc", "0xd", "0xe"], "0x1"
+        )
+        self.assertEqual(len(calls), 10)
+        self.assertEqual(max_in_flight, 2)
+
+    async def test_get_calls_from_tx_error(self):
+        self.mock_w3.geth.debug.trace_transaction = AsyncMock(
+            side_effect=Exception("trace failed")
+        )
+        res = await self.trace_collector._get_calls_from_tx(
+            "0x1", asyncio.Semaphore(1)
+        )
+        self.assertEqual(res, {})
+
+    async def test_filter_contract_calls_batches_addresses(self):
+        contract = "0x" + "11" * 20
+        eoa = "0x" + "22" * 20
+        codes = {contract: b"\x60\x80", eoa: b""}
+
+        async def get_code(address, block_identifier):
+            return codes[address]
+
+        requests = []
+
+        async def async_execute():
+            results = await asyncio.gather(*requests)
+            requests.clear()
+            return results
+
+        batch = MagicMock()
+        batch.add.side_effect = requests.append
+        batch.async_execute = async_execute
+        self.mock_w3.batch_requests.return_value.__aenter__.return_value = (
+            batch
+        )
+        self.mock_w3.eth.get_code = AsyncMock(side_effect=get_code)
+        self.mock_w3.eth.get_transaction_count = AsyncMock(return_value=3)
+
+        calls = [
+            {"from": contract, "to": contract, "type": "CALL"},
+            {"from": contract, "to": eoa, "type": "CALL"},
+        ] * 10
+        res = await self.trace_collector._filter_contract_calls(calls, "0x10")
+
+        self.assertEqual(len(res), 10)
+        self.assertEqual(self.mock_w3.batch_requests.call_count, 2)
+        self.assertEqual(self.mock_w3.eth.get_code.await_count, 2)
+
+    @patch.object(AsyncTraceCollector, "_prefetch_address_kinds")
+    @patch.object(AsyncTraceCollector, "_trace_filter")
+    @patch.object(AsyncTraceCollector, "_validate_contract")
+    async def test_get_calls_from(
+        self, mock_validate_contract, mock_trace_filter, mock_prefetch
+    ):
+        mock_validate_contract.side_effect = lambda address, block: (
+            address != "0xeoa"
+        )
+        mock_trace_filter.return_value = {"0x123": 3}
+        self.mock_w3.geth.debug.trace_transaction = AsyncMock(
+            return_value={
+                "from": "0xabc",
+                "to": "0xdef",
+                "type": "call",
+                "calls": [{"from": "0xabc", "to": "0xeoa", "type": "call"}],
+            }
+        )
+        result = await self.trace_collector.get_calls_from(
+            "0x1", "0x5", "0xabc"
+        )
+        self.assertEqual(
+            result,
+            [{"from": "0xabc", "to": "0xdef", "type": "call", "block": 3}],
+        )
+
+    @patch.object(AsyncTraceCollector, "_prefetch_address_kinds")
+    @patch.object(AsyncTraceCollector, "_trace_filter")
+    @patch.object(AsyncTraceCollector, "_validate_contract")
+    async def test_iter_calls(
+        self, mock_validate_contract, mock_trace_filter, mock_prefetch
+    ):
+        mock_validate_contract.return_value = True
+        mock_trace_filter.return_value = {"0x1": 1, "0x2": 2, "0x3": 3}
+        self.mock_w3.geth.debug.trace_transaction = AsyncMock(
+            return_value={"from": "0xabc", "to": "0xdef", "type": "call"}
+        )
+        calls = [
+            c
+            async for c in self.trace_collector.iter_calls(
+                "0x1", "0x5", "0xabc"
+            )
+        ]
+        self.assertCountEqual(
+            calls,
+            [
+                {"from": "0xabc", "to": "0xdef", "type": "call", "block": b}
+                for b in (1, 2, 3)
+            ],
+        )
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,59 @@
+import unittest
+
+from scsc.traces.call_buffer import CallBuffer
+
+A, B, C = ("0x" + x * 40 for x in "abc")
+CALLS = [
+    {"from": A, "to": B, "type": "CALL", "block": 1},
+    {"from": A, "to": B, "type": "CALL", "block": 1},
+    {"from": B, "to": C, "type": "STATICCALL", "block": 2},
+    {"from": A, "to": B, "type": "CALL", "block": 2},
+    {"from": A, "to": None, "type": "CREATE2", "block": 2},
+    {"from": B, "to": C, "type": "AUTHCALL"},
+]
+
+
+class TestCallBuffer(unittest.TestCase):
+    def setUp(self):
+        self.buffer = CallBuffer.from_calls(CALLS)
+
+    def test_round_trip(self):
+        self.assertEqual(len(self.buffer), len(CALLS))
+        self.assertEqual(self.buffer.to_list(), CALLS)
+
+    def test_addresses_are_interned(self):
+        self.assertEqual(len(self.buffer.addresses), 4)
+        self.assertEqual(self.buffer.intern(A), self.buffer.intern(A))
+        self.assertEqual(self.buffer.addresses[self.buffer.intern(C)], C)
+
+    def test_edge_counts(self):
+        self.assertEqual(
+            self.buffer.edge_counts(),
+            {
+                (A, B, "CALL"): 3,
+                (B, C, "STATICCALL"): 1,
+                (A, None, "CREATE2"): 1,
+                (B, C, "AUTHCALL"): 1,
+            },
+        )
+
+    def test_block_edge_counts(self):
+        counts = self.buffer.block_edge_counts()
+        self.assertEqual(counts[1], {(A, B, "CALL"): 2})
+        self.assertEqual(
+            counts[2],
+            {
+                (B, C, "STATICCALL"): 1,
+                (A, B, "CALL"): 1,
+                (A, None, "CREATE2"): 1,
+            },
+        )
+        self.assertEqual(counts[None], {(B, C, "AUTHCALL"): 1})
+
+    def test_retain(self):
+        self.buffer.retain({A, B})
+        self.assertEqual(self.buffer.to_list(), [CALLS[0], CALLS[1], CALLS[3]])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,145 @@
+import os
+import shutil
+import unittest
+
+from scsc.traces import ParquetTraceSource
+
+try:
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+except ImportError:  # pragma: no cover - optional dependency
+    pa = None
+
+A = "0x" + "aa" * 20
+B = "0x" + "bb" * 20
+C = "0x" + "cc" * 20
+D = "0x" + "dd" * 20
+E = "0x" + "ee" * 20
+
+
+def _row(tx, block, trace_address, sender, receiver, call_type="call"):
+    return {
+        "action_from": bytes.fromhex(sender[2:]),
+        "action_to": bytes.fromhex(receiver[2:]) if receiver else None,
+        "action_type": "call" if call_type else "create",
+        "action_call_type": call_type,
+        "result_address": None,
+        "trace_address": trace_address,
+        "transaction_hash": bytes([tx]) * 32,
+        "block_number": block,
+    }
+
+
+# Transaction 1: E -> A -> B -> C, A -> D (delegate)
+# Transaction 2: E -> B -> A -> C (static), B -> C
+# Transaction 3: E -> C -> D, at block 12
+ROWS = [
+    _row(1, 10, "", E, A),
+    _row(1, 10, "0", A, B),
+    _row(1, 10, "0_0", B, C),
+    _row(1, 10, "1", A, D, "delegate_call"),
+    _row(2, 11, "", E, B),
+    _row(2, 11, "0", B, A),
+    _row(2, 11, "0_0", A, C, "static_call"),
+    _row(2, 11, "1", B, C),
+    _row(3, 12, "", E, C),
+    _row(3, 12, "0", C, D),
+]
+
+
+def _calls(calls):
+    return sorted(
+        (c["from"].lower(), c["to"].lower(), c["type"]) for c in calls
+    )
+
+
+@unittest.skipIf(pa is None, "pyarrow is not installed")
+class TestParquetTraceSource(unittest.TestCase):
+    def setUp(self):
+        self.test_dir = "test_output"
+        os.makedirs(self.test_dir, exist_ok=True)
+        self.path = os.path.join(self.test_dir, "ethereum__traces__10.parquet")
+        pq.write_table(pa.Table.from_pylist(ROWS), self.path)
+
+    def tearDown(self):
+        shutil.rmtree(self.test_dir)
+
+    def test_get_calls_from(self):
+        source = ParquetTraceSource(self.path)
+        self.assertEqual(
+            _calls(source.get_calls_from(A)),
+            [
+                (A, B, "CALL"),
+                (A, C, "STATICCALL"),
+                (A, D, "DELEGATECALL"),
+                (B, C, "CALL"),
+            ],
+        )
+
+    def test_get_calls_from_block_range(self):
+        source = ParquetTraceSource(self.path)
+        self.assertEqual(
+            _calls(source.get_calls_from(C, "0xb", 12)), [(C, D, "CALL")]
+        )
+        self.assertEqual(source.get_calls_from(C, to_block=11), [])
+
+    def test_calls_are_tagged_with_blocks(self):
+        source = ParquetTraceSource(self.path)
+        self.assertEqual(
+            {c["block"] for c in source.get_calls_from(B)}, {10, 11}
+        )
+
+    def test_max_depth(self):
+        source = ParquetTraceSource(self.path, max_depth=1)
+        self.assertEqual(
+            _calls(source.get_calls_from(A)),
+            [(A, B, "CALL"), (A, D, "DELEGATECALL")],
+        )
+
+    def test_glob_pattern(self):
+        source = ParquetTraceSource(
+            os.path.join(self.test_dir, "ethereum__traces__*.parquet")
+        )
+        self.assertEqual(source.table.num_rows, len(ROWS))
+
+    def test_get_call_graph(self):
+        cg = ParquetTraceSource(self.path).get_call_graph(A)
+        edges = {(u.lower(), v.lower()) for u, v in cg.G.edges()}
+        self.assertEqual(edges, {(A, B), (A, C), (A, D), (B, C)})
+
+    def test_creations_and_selfdestructs(self):
+        rows = [
+            _row(4, 13, "", E, A),
+            {
+                **_row(4, 13, "0", A, None, None),
+                "action_creation_method": "create2",
+                "result_address": bytes.fromhex(B[2:]),
+            },
+            {
+                **_row(4, 13, "1", A, None, None),
+                "action_type": "suicide",
+                "action_refund_address": bytes.fromhex(C[2:]),
+            },
+        ]
+        rows = [
+            {
+                "action_creation_method": None,
+                "action_refund_address": None,
+                **r,
+            }
+            for r in rows
+        ]
+        path = os.path.join(self.test_dir, "ethereum__traces__13.parquet")
+        pq.write_table(pa.Table.from_pylist(rows), path)
+        self.assertEqual(
+            _calls(ParquetTraceSource(path).get_calls_from(A)),
+            [(A, B, "CREATE2"), (A, C, "SELFDESTRUCT")],
+        )
+
+    def test_invalid_address(self):
+        with self.assertRaises(ValueError):
+            ParquetTraceSource(self.path).get_calls_from("0x123")
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,83 @@
+import os
+import shutil
+import unittest
+
+from scsc.traces import TraceCache
+from scsc.traces.trace_cache import block_key, tx_key
+
+CONFIG = {"tracer": "callTracer"}
+FRAME = {
+    "from": "0x1",
+    "to": "0x2",
+    "type": "CALL",
+    "calls": [{"from": "0x2", "to": "0x3", "type": "CALL"}],
+}
+
+
+class TestTraceCache(unittest.TestCase):
+    def setUp(self):
+        self.test_dir = "test_output"
+        os.makedirs(self.test_dir, exist_ok=True)
+        self.path = os.path.join(self.test_dir, "traces.db")
+        self.cache = TraceCache(self.path, finality_depth=10)
+
+    def tearDown(self):
+        self.cache.close()
+        shutil.rmtree(self.test_dir)
+
+    def test_round_trip(self):
+        self.cache.put(tx_key("0xAB", CONFIG), FRAME)
+        self.assertEqual(self.cache.get(tx_key("0xab", CONFIG)), FRAME)
+        self.assertIsNone(self.cache.get(block_key(1, CONFIG)))
+
+    def test_keys_depend_on_tracer_config(self):
+        self.assertNotEqual(
+            tx_key("0xab", CONFIG), tx_key("0xab", {"tracer": "prestate"})
+        )
+
+    def test_persistent(self):
+        self.cache.put(block_key(5, CONFIG), [FRAME])
+        self.cache.close()
+        self.cache = TraceCache(self.path)
+        self.assertEqual(self.cache.get(block_key(5, CONFIG)), [FRAME])
+        self.assertEqual(len(self.cache), 1)
+
+    def test_is_final(self):
+        self.assertTrue(self.cache.is_final(90, 100))
+        self.assertFalse(self.cache.is_final(91, 100))
+        self.assertFalse(self.cache.is_final(None, 100))
+
+    def test_evicts_least_recently_used(self):
+        self.cache.put("a", FRAME)
+        self.cache.max_bytes = self.cache.size * 2
+        self.cache.put("b", FRAME)
+        self.cache.get("a")
+        self.cache.put("c", FRAME)
+        self.assertIsNotNone(self.cache.get("a"))
+        self.assertIsNone(self.cache.get("b"))
+        self.assertIsNotNone(self.cache.get("c"))
+        self.assertLessEqual(self.cache.size, self.cache.max_bytes)
+
+    def test_shared_file(self):
+        self.cache.put("a", FRAME)
+        size = self.cache.size
+        other = TraceCache(self.path, max_bytes=size * 2)
+        self.addCleanup(other.close)
+        self.cache.max_bytes = size * 2
+        other.put("b", FRAME)
+        self.assertEqual(self.cache.size, size * 2)
+        self.cache.get("a")
+        other.put("c", FRAME)
+        # The entry read through the other connection is kept
+        self.assertIsNotNone(self.cache.get("a"))
+        self.assertIsNone(self.cache.get("b"))
+        self.assertEqual(len(self.cache), 2)
+        self.assertEqual(other.size, size * 2)
+
+    def test_invalid_max_bytes(self):
+        with self.assertRaises(ValueError):
+            TraceCache(self.path, max_bytes=0)
+
+
+if __name__ == "__main__":
+    unittest.main()
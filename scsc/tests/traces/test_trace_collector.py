@@ -1,10 +1,34 @@
 import unittest
-from unittest.mock import patch
+from concurrent.futures import ThreadPoolExecutor
+from unittest.mock import PropertyMock, patch
 
 from web3 import Web3
+from web3.exceptions import Web3RPCError
 from web3.providers.eth_tester import EthereumTesterProvider
 
-from scsc.traces import TraceCollector
+from scsc.graph import CallGraph
+from scsc.traces import AddressKind, TraceCache, TraceCollector
+
+
+class FakeBatch:
+    """
+    Minimal stand-in for the web3 request batcher.
+    """
+
+    def __init__(self):
+        self.requests = []
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *args):
+        return False
+
+    def add(self, request):
+        self.requests.append(request)
+
+    def execute(self):
+        return self.requests
 
 
 class TestTraceCollector(unittest.TestCase):
@@ -22,18 +46,30 @@ class TestTraceCollector(unittest.TestCase):
 
         self.trace_collector.w3 = self.mock_w3
 
+    def test_init_shared_web3_from_threads(self):
+        w3 = Web3(EthereumTesterProvider())
+        with ThreadPoolExecutor(max_workers=8) as executor:
+            collectors = list(
+                executor.map(
+                    lambda _: TraceCollector("http://mock", w3=w3), range(32)
+                )
+            )
+        self.assertTrue(all(c.w3.debug_block for c in collectors))
+
     def test_init_connection_failure(self):
         with patch("web3.Web3.is_connected", return_value=False):
             with self.assertRaises(ConnectionError):
                 TraceCollector("http://mock.ethereum.node")
 
     @patch.object(
-        TraceCollector, "_filter_txs_from", return_value={"0x123", "0x456"}
+        TraceCollector,
+        "_trace_filter",
+        return_value={"0x123": 1000, "0x456": 1001},
     )
     @patch.object(TraceCollector, "_validate_contract", return_value=True)
     @patch("web3.Web3")
     def test_get_calls_from(
-        self, MockWeb3, mock_validate_contract, mock_filter_txs_from
+        self, MockWeb3, mock_validate_contract, mock_trace_filter
     ):
         # Mock tracing.trace_filter to return sample data
         mock_w3_instance = MockWeb3.return_value
@@ -64,6 +100,7 @@ class TestTraceCollector(unittest.TestCase):
         self.assertEqual(result[0]["from"], "0xabc")
         self.assertEqual(result[0]["to"], "0xdef")
         self.assertEqual(result[0]["type"], "call")
+        self.assertEqual(self.trace_collector.traced_txs, 2)
 
         # Verify that _validate_contract was called
         mock_validate_contract.assert_called_with(contract_address, to_block)
@@ -84,6 +121,55 @@ class TestTraceCollector(unittest.TestCase):
         tx_hashes = self.trace_collector._filter_txs_from(1, 10, "0x123")
         self.assertEqual(tx_hashes, {"0x1", "0x2"})
 
+    @patch("web3.Web3")
+    def test_filter_txs_from_chunks_and_pages(self, MockWeb3):
+        def trace_filter(params):
+            start = int(params["fromBlock"], 16)
+            end = int(params["toBlock"], 16)
+            if end - start >= 4:
+                raise Exception("query timeout exceeded")
+            traces = [
+                {"transactionHash": f"0x{b:x}{i}", "type": "call"}
+                for b in range(start, end + 1)
+                for i in range(3)
+            ]
+            return traces[params["after"] :][: params["count"]]
+
+        mock_w3_instance = MockWeb3.return_value
+        mock_w3_instance.tracing.trace_filter.side_effect = trace_filter
+        self.trace_collector.w3 = mock_w3_instance
+        self.trace_collector.filter_chunk_size = 6
+        self.trace_collector.filter_page_size = 2
+
+        tx_hashes = self.trace_collector._filter_txs_from("0x1", "0xc", "0x1")
+        self.assertEqual(
+            tx_hashes, {f"0x{b:x}{i}" for b in range(1, 13) for i in range(3)}
+        )
+
+    @patch("web3.Web3")
+    def test_filter_txs_from_reports_failed_block(self, MockWeb3):
+        mock_w3_instance = MockWeb3.return_value
+        mock_w3_instance.tracing.trace_filter.side_effect = Exception(
+            "response too large"
+        )
+        self.trace_collector.w3 = mock_w3_instance
+
+        with self.assertRaises(RuntimeError):
+            self.trace_collector._filter_txs_from("0x1", "0x4", "0x1")
+
+    @patch("web3.Web3")
+    def test_filter_txs_from_unsupported_method(self, MockWeb3):
+        mock_w3_instance = MockWeb3.return_value
+        mock_w3_instance.tracing.trace_filter.side_effect = Web3RPCError(
+            "the method trace_filter does not exist/is not available",
+            rpc_response={"error": {"code": -32601}},
+        )
+        self.trace_collector.w3 = mock_w3_instance
+
+        with self.assertRaises(RuntimeError):
+            self.trace_collector._filter_txs_from("0x1", "0x1b58", "0x1")
+        mock_w3_instance.tracing.trace_filter.assert_called_once()
+
     @patch("web3.Web3")
     def test_get_calls_from_tx(self, MockWeb3):
         # Mock geth.debug.trace_transaction to return sample data
@@ -125,6 +211,86 @@ class TestTraceCollector(unittest.TestCase):
         self.assertEqual(calls[0]["from"], "0x1")
         self.assertEqual(calls[1]["from"], "0x2")
 
+    def test_extract_calls_recursive_contract_once(self):
+        # The contract calls itself through a proxy
+        call = {
+            "from": "0x1",
+            "to": "0x2",
+            "type": "call",
+            "calls": [
+                {
+                    "from": "0x2",
+                    "to": "0x1",
+                    "type": "delegatecall",
+                    "calls": [{"from": "0x1", "to": "0x3", "type": "call"}],
+                }
+            ],
+        }
+        calls = []
+        self.trace_collector._extract_calls(call, "0x1", calls)
+        self.assertEqual(
+            [(c["from"], c["to"]) for c in calls],
+            [("0x1", "0x2"), ("0x2", "0x1"), ("0x1", "0x3")],
+        )
+
+    def test_extract_calls_deep_tree(self):
+        call = {"from": "0x1", "to": "0x1", "type": "call"}
+        frame = call
+        for _ in range(5000):
+            frame["calls"] = [{"from": "0x1", "to": "0x1", "type": "call"}]
+            frame = frame["calls"][0]
+        calls = []
+        self.trace_collector._extract_calls(call, "0x1", calls)
+        self.assertEqual(len(calls), 5001)
+
+    def test_extract_calls_max_depth(self):
+        self.trace_collector.max_depth = 1
+        call = {
+            "from": "0x2",
+            "to": "0x1",
+            "type": "call",
+            "calls": [
+                {
+                    "from": "0x1",
+                    "to": "0x3",
+                    "type": "call",
+                    "calls": [{"from": "0x3", "to": "0x4", "type": "call"}],
+                }
+            ],
+        }
+        calls = []
+        self.trace_collector._extract_calls(call, "0x1", calls)
+        self.assertEqual(calls, [{"from": "0x1", "to": "0x3", "type": "call"}])
+
+    def test_extract_calls_many(self):
+        call = {
+            "from": "0x1",
+            "to": "0x2",
+            "type": "CALL",
+            "calls": [
+                {
+                    "from": "0x2",
+                    "to": "0x3",
+                    "type": "CALL",
+                    "calls": [{"from": "0x3", "to": "0x2", "type": "CALL"}],
+                },
+                {"from": "0x1", "to": "0x4", "type": "CALL"},
+            ],
+        }
+        calls = {"0x2": [], "0x3": [], "0x5": []}
+        self.trace_collector._extract_calls_many(call, calls)
+        self.assertEqual(
+            [(c["from"], c["to"]) for c in calls["0x2"]],
+            [("0x2", "0x3"), ("0x3", "0x2")],
+        )
+        self.assertEqual(calls["0x3"], [calls["0x2"][1]])
+        self.assertIs(calls["0x3"][0], calls["0x2"][1])
+        self.assertEqual(calls["0x5"], [])
+
+    def test_init_invalid_max_depth(self):
+        with self.assertRaises(ValueError):
+            TraceCollector("http://mock.ethereum.node", max_depth=-1)
+
     @patch("web3.Web3")
     def test_get_calls(self, MockWeb3):
         # Mock geth.debug.trace_transaction to return sample data
@@ -144,6 +310,325 @@ class TestTraceCollector(unittest.TestCase):
         self.assertEqual(len(calls), 1)
         self.assertEqual(calls[0]["from"], "0x1")
 
+    @patch("web3.Web3")
+    def test_get_calls_batched(self, MockWeb3):
+        mock_w3_instance = MockWeb3.return_value
+        mock_w3_instance.geth.debug.trace_transaction.return_value = {
+            "from": "0x1",
+            "to": "0x2",
+            "type": "call",
+            "calls": [{"from": "0x2", "to": "0x3", "type": "call"}],
+        }
+        mock_w3_instance.batch_requests.side_effect = FakeBatch
+        self.trace_collector.w3 = mock_w3_instance
+
+        tx_hashes = ["0x1", "0x2", "0x3"]
+        sequential = self.trace_collector.get_calls(tx_hashes, "0x1")
+
+        self.trace_collector.batch_size = 2
+        batched = self.trace_collector.get_calls(tx_hashes, "0x1")
+        self.assertEqual(batched, sequential)
+        self.assertEqual(mock_w3_instance.batch_requests.call_count, 2)
+
+    @patch("web3.Web3")
+    def test_get_calls_from_txs_batch_error(self, MockWeb3):
+        def trace_transaction(tx_hash, config):
+            if tx_hash == "0x2":
+                raise Exception("trace failed")
+            return {"calls": []}
+
+        mock_w3_instance = MockWeb3.return_value
+        mock_w3_instance.geth.debug.trace_transaction.side_effect = (
+            trace_transaction
+        )
+        mock_w3_instance.batch_requests.side_effect = FakeBatch
+        self.trace_collector.w3 = mock_w3_instance
+
+        res = self.trace_collector._get_calls_from_txs(["0x1", "0x2"])
+        self.assertEqual(res, [{"calls": []}, {}])
+
+    @patch("web3.Web3")
+    def test_filter_contract_calls_once_per_address(self, MockWeb3):
+        contract = "0x" + "11" * 20
+        eoa = "0x" + "22" * 20
+        precompile = "0x" + "0" * 39 + "1"
+        codes = {contract: b"\x60\x80", eoa: b""}
+
+        mock_w3_instance = MockWeb3.return_value
+        mock_w3_instance.eth.get_code.side_effect = (
+            lambda address, block_identifier: codes[address]
+        )
+        mock_w3_instance.eth.get_transaction_count.return_value = 3
+        mock_w3_instance.batch_requests.side_effect = FakeBatch
+        self.trace_collector.w3 = mock_w3_instance
+
+        calls = [
+            {"from": contract, "to": contract, "type": "CALL"},
+            {"from": contract, "to": eoa, "type": "CALL"},
+            {"from": contract, "to": precompile, "type": "STATICCALL"},
+        ] * 50
+        res = self.trace_collector._filter_contract_calls(calls, "0x10")
+
+        self.assertEqual(len(res), 50)
+        self.assertEqual(mock_w3_instance.batch_requests.call_count, 2)
+        self.assertEqual(mock_w3_instance.eth.get_code.call_count, 2)
+        self.assertEqual(
+            self.trace_collector.address_cache.get(eoa, "0x10"),
+            AddressKind.EOA,
+        )
+
+        # A second pass is answered from the cache
+        self.trace_collector._filter_contract_calls(calls, "0x10")
+        self.assertEqual(mock_w3_instance.eth.get_code.call_count, 2)
+
+    @patch.object(TraceCollector, "_validate_contract", return_value=True)
+    @patch("web3.Web3")
+    def test_strategies_build_same_call_graph(
+        self, MockWeb3, mock_validate_contract
+    ):
+        eoa, contract, t1, t2, t3 = (
+            Web3.to_checksum_address("0x" + x * 40) for x in "e1a2b"
+        )
+
+        def parity(path, frm, to, call_type="call", tx="0xaa"):
+            return {
+                "action": {"from": frm, "to": to, "callType": call_type},
+                "blockNumber": 5 if tx == "0xaa" else 6,
+                "traceAddress": path,
+                "transactionHash": tx,
+                "type": "call",
+            }
+
+        debug_traces = {
+            "0xaa": {
+                "from": eoa,
+                "to": contract,
+                "type": "CALL",
+                "calls": [
+                    {
+                        "from": contract,
+                        "to": t1,
+                        "type": "CALL",
+                        "calls": [
+                            {"from": t1, "to": t2, "type": "STATICCALL"},
+                            {
+                                "from": t1,
+                                "to": contract,
+                                "type": "CALL",
+                                "calls": [
+                                    {
+                                        "from": contract,
+                                        "to": t2,
+                                        "type": "CALL",
+                                    }
+                                ],
+                            },
+                        ],
+                    },
+                    {"from": contract, "to": t3, "type": "DELEGATECALL"},
+                ],
+            },
+            "0xbb": {
+                "from": eoa,
+                "to": contract,
+                "type": "CALL",
+                "calls": [{"from": contract, "to": t3, "type": "CALL"}],
+            },
+        }
+        block_traces = {
+            5: [
+                parity([], eoa, contract),
+                parity([0], contract, t1),
+                parity([0, 0], t1, t2, "staticcall"),
+                parity([0, 1], t1, contract),
+                parity([0, 1, 0], contract, t2),
+                parity([1], contract, t3, "delegatecall"),
+                parity([], eoa, t1, tx="0xcc"),
+                {"action": {"author": eoa}, "type": "reward"},
+            ],
+            6: [
+                parity([], eoa, contract, tx="0xbb"),
+                parity([0], contract, t3, tx="0xbb"),
+            ],
+        }
+        mock_w3_instance = MockWeb3.return_value
+        mock_w3_instance.tracing.trace_filter.return_value = [
+            parity([0], contract, t1),
+            parity([0, 1, 0], contract, t2),
+            parity([1], contract, t3, "delegatecall"),
+            parity([0], contract, t3, tx="0xbb"),
+        ]
+        mock_w3_instance.geth.debug.trace_transaction.side_effect = (
+            lambda tx_hash, config: debug_traces[tx_hash]
+        )
+        mock_w3_instance.tracing.trace_block.side_effect = block_traces.get
+
+        def lower(frame):
+            return {
+                **frame,
+                "from": frame["from"].lower(),
+                "to": frame["to"].lower(),
+                "calls": [lower(c) for c in frame.get("calls", [])],
+            }
+
+        debug_blocks = {
+            "0x5": [
+                {"txHash": "0xaa", "result": lower(debug_traces["0xaa"])},
+                {"txHash": "0xcc", "error": "execution timeout"},
+            ],
+            "0x6": [{"txHash": "0xbb", "result": lower(debug_traces["0xbb"])}],
+        }
+        mock_w3_instance.debug_block.trace_block_by_number.side_effect = (
+            lambda block, config: debug_blocks[block]
+        )
+        self.trace_collector.w3 = mock_w3_instance
+
+        graphs = {}
+        for strategy in ("transaction", "parity", "block"):
+            cg = CallGraph(contract)
+            for c in self.trace_collector.get_calls_from(
+                "0x5", "0x6", contract, strategy=strategy
+            ):
+                cg.add_call(c["from"], c["to"], c["type"])
+            graphs[strategy] = cg
+        expected = sorted(graphs["transaction"].G.edges(data=True))
+        self.assertEqual(len(expected), 5)
+        self.assertEqual(sorted(graphs["parity"].G.edges(data=True)), expected)
+        self.assertEqual(sorted(graphs["block"].G.edges(data=True)), expected)
+        self.assertEqual(mock_w3_instance.tracing.trace_block.call_count, 2)
+
+    def test_get_calls_from_unknown_strategy(self):
+        with self.assertRaises(ValueError):
+            self.trace_collector.get_calls_from(
+                "0x1", "0x2", "0x123", strategy="unknown"
+            )
+
+    @patch("web3.Web3")
+    def test_get_calls_trace_cache(self, MockWeb3):
+        cache = TraceCache(":memory:", finality_depth=10)
+        self.trace_collector.trace_cache = cache
+        mock_w3_instance = MockWeb3.return_value
+        mock_w3_instance.eth.block_number = 100
+        mock_w3_instance.geth.debug.trace_transaction.return_value = {
+            "from": "0x1",
+            "to": "0x2",
+            "type": "CALL",
+            "calls": [{"from": "0x2", "to": "0x3", "type": "CALL"}],
+        }
+        self.trace_collector.w3 = mock_w3_instance
+
+        tx_blocks = {"0xaa": 50, "0xbb": 95}
+        first = self.trace_collector.get_calls(tx_blocks, "0x1")
+        second = self.trace_collector.get_calls(tx_blocks, "0x1")
+        self.assertEqual(first, second)
+        self.assertEqual(len(cache), 1)
+        # Only the transaction of the recent block is traced again
+        self.assertEqual(
+            mock_w3_instance.geth.debug.trace_transaction.call_count, 3
+        )
+
+    @patch("web3.Web3")
+    def test_trace_cache_written_per_batch(self, MockWeb3):
+        cache = TraceCache(":memory:", finality_depth=10)
+        self.trace_collector.trace_cache = cache
+        mock_w3_instance = MockWeb3.return_value
+        type(mock_w3_instance.eth).block_number = block_number = PropertyMock(
+            return_value=100
+        )
+        mock_w3_instance.geth.debug.trace_transaction.return_value = {
+            "from": "0x1",
+            "to": "0x2",
+            "type": "CALL",
+        }
+        self.trace_collector.w3 = mock_w3_instance
+
+        frames = self.trace_collector._iter_tx_frames(
+            {"0xaa": 1, "0xbb": 2, "0xcc": 3}
+        )
+        next(frames)
+        # The first transaction is cached although the iteration stopped
+        self.assertEqual(len(cache), 1)
+        list(frames)
+        self.assertEqual(len(cache), 3)
+        block_number.assert_called_once()
+
+    @patch.object(TraceCollector, "_prefetch_address_kinds")
+    @patch.object(TraceCollector, "_validate_contract")
+    @patch("web3.Web3")
+    def test_get_calls_from_many(
+        self, MockWeb3, mock_validate_contract, mock_prefetch
+    ):
+        eoa, a, b, c = (
+            Web3.to_checksum_address("0x" + x * 40) for x in "eabc"
+        )
+        mock_validate_contract.side_effect = lambda address, block: (
+            address != eoa
+        )
+        mock_w3_instance = MockWeb3.return_value
+        mock_w3_instance.tracing.trace_filter.return_value = [
+            {"transactionHash": "0x1", "blockNumber": 1, "type": "call"},
+            {"transactionHash": "0x1", "blockNumber": 1, "type": "call"},
+        ]
+        mock_w3_instance.geth.debug.trace_transaction.return_value = {
+            "from": eoa,
+            "to": a,
+            "type": "CALL",
+            "calls": [
+                {
+                    "from": a,
+                    "to": b,
+                    "type": "CALL",
+                    "calls": [{"from": b, "to": c, "type": "CALL"}],
+                }
+            ],
+        }
+        self.trace_collector.w3 = mock_w3_instance
+
+        calls = self.trace_collector.get_calls_from_many(
+            "0x1", "0x2", [a, b, eoa]
+        )
+        self.assertEqual(set(calls), {a, b})
+        self.assertEqual(len(calls[a]), 2)
+        self.assertEqual(len(calls[b]), 1)
+        params = mock_w3_instance.tracing.trace_filter.call_args[0][0]
+        self.assertEqual(params["fromAddress"], [a, b])
+        mock_w3_instance.geth.debug.trace_transaction.assert_called_once()
+
+    @patch.object(TraceCollector, "_validate_contract", return_value=True)
+    @patch("web3.Web3")
+    def test_iter_calls_streams_transactions(
+        self, MockWeb3, mock_validate_contract
+    ):
+        mock_w3_instance = MockWeb3.return_value
+        mock_w3_instance.tracing.trace_filter.return_value = [
+            {"transactionHash": f"0x{i}", "blockNumber": i, "type": "call"}
+            for i in range(1, 4)
+        ]
+        mock_w3_instance.geth.debug.trace_transaction.return_value = {
+            "from": "0xabc",
+            "to": "0xdef",
+            "type": "call",
+        }
+        self.trace_collector.w3 = mock_w3_instance
+
+        calls = self.trace_collector.iter_calls("0x1", "0x3", "0xabc")
+        first = next(calls)
+        self.assertEqual((first["from"], first["to"]), ("0xabc", "0xdef"))
+        mock_w3_instance.geth.debug.trace_transaction.assert_called_once()
+        self.assertEqual(len(list(calls)), 2)
+
+    def test_iter_calls_unknown_strategy(self):
+        with self.assertRaises(ValueError):
+            next(
+                self.trace_collector.iter_calls(
+                    "0x1", "0x2", "0xabc", strategy="unknown"
+                )
+            )
+
+    def test_init_invalid_batch_size(self):
+        with self.assertRaises(ValueError):
+            TraceCollector("http://mock.ethereum.node", batch_size=0)
+
 
 if __name__ == "__main__":
     unittest.main()
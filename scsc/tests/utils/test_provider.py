@@ -0,0 +1,47 @@
+import unittest
+from unittest.mock import patch
+
+from scsc.traces import TraceCollector
+from scsc.utils import close_providers, get_web3
+
+URL = "http://mock.ethereum.node"
+
+
+class TestProvider(unittest.TestCase):
+    def tearDown(self):
+        close_providers()
+
+    @patch("web3.Web3.is_connected", return_value=True)
+    def test_get_web3_shared(self, mock_is_connected):
+        w3 = get_web3(URL, pool_size=4)
+        self.assertIs(get_web3(URL, pool_size=4), w3)
+        self.assertIsNot(get_web3(URL, pool_size=8), w3)
+        self.assertEqual(mock_is_connected.call_count, 2)
+
+        session = (
+            w3.provider._request_session_manager.cache_and_return_session(URL)
+        )
+        self.assertEqual(session.get_adapter(URL)._pool_maxsize, 4)
+
+    def test_get_web3_connection_failure(self):
+        with patch("web3.Web3.is_connected", return_value=False):
+            with self.assertRaises(ConnectionError):
+                get_web3(URL)
+        with patch("web3.Web3.is_connected", return_value=True):
+            self.assertIsNotNone(get_web3(URL))
+
+    def test_get_web3_invalid_pool_size(self):
+        with self.assertRaises(ValueError):
+            get_web3(URL, pool_size=0)
+
+    @patch("web3.Web3.is_connected", return_value=True)
+    def test_trace_collector_reuses_web3(self, mock_is_connected):
+        w3 = get_web3(URL)
+        tc = TraceCollector(URL, w3=w3)
+        self.assertIs(tc.w3, w3)
+        self.assertTrue(hasattr(w3, "debug_block"))
+        self.assertEqual(mock_is_connected.call_count, 1)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -3,6 +3,8 @@ from pydantic_settings import BaseSettings
 class Settings(BaseSettings):
     # Ethereum Node Configuration
     eth_node_url: str
+    # Number of keep-alive connections to the Ethereum node per worker
+    eth_node_pool_size: int = 10
 
     # Database Configuration
     database_url: str
@@ -13,10 +15,28 @@ class Settings(BaseSettings):
 
     # maximum block range for analysis
     MAX_BLOCK_RANGE: int = 7000
+    # Number of analyses run at once per worker, further ones wait
+    analysis_workers: int = 4
+    # Background analysis jobs: number run at once per worker, blocks
+    # collected between progress updates, maximum block range and
+    # seconds without progress after which a running job is resumed
+    job_workers: int = 2
+    job_chunk_blocks: int = 100
+    max_job_block_range: int = 100000
+    job_stale_seconds: int = 3600
+    # Maximum total size in bytes of the cached networks of final ranges
+    result_cache_max_size: int = 256 * 1024 * 1024
 
     # Logging Configuration
     log_level: str = "INFO"
 
+    # Label resolution: addresses per database or Allium lookup, seconds
+    # before addresses without a label are looked up again and size of
+    # the in-process label cache
+    label_batch_size: int = 500
+    label_negative_ttl: int = 7 * 24 * 3600
+    label_cache_size: int = 100000
+
     # Allium API Key
     allium_api_key: str
 
@@ -26,11 +46,21 @@ class Settings(BaseSettings):
         # Map environment variables to class attributes
         fields = {
             "eth_node_url": "ETH_NODE_URL",
+            "eth_node_pool_size": "ETH_NODE_POOL_SIZE",
             "database_url": "DATABASE_URL",
             "api_host": "API_HOST",
             "api_port": "API_PORT",
+            "analysis_workers": "ANALYSIS_WORKERS",
+            "job_workers": "JOB_WORKERS",
+            "job_chunk_blocks": "JOB_CHUNK_BLOCKS",
+            "max_job_block_range": "MAX_JOB_BLOCK_RANGE",
+            "job_stale_seconds": "JOB_STALE_SECONDS",
+            "result_cache_max_size": "RESULT_CACHE_MAX_SIZE",
             "log_level": "LOG_LEVEL",
             "allium_api_key": "ALLIUM_API_KEY",
+            "label_batch_size": "LABEL_BATCH_SIZE",
+            "label_negative_ttl": "LABEL_NEGATIVE_TTL",
+            "label_cache_size": "LABEL_CACHE_SIZE",
         }
 
 
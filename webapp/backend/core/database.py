@@ -1,6 +1,8 @@
 from sqlmodel import SQLModel, create_engine, Session
 from core.config import settings
 from models.label import Label
+from models.job import AnalysisJob  # noqa: F401
+from models.network_cache import CachedNetwork  # noqa: F401
 
 
 engine = create_engine(settings.database_url, echo=True)  # Set echo=False to reduce logs
@@ -35,3 +35,11 @@ class NotFoundError(HTTPException):
             status_code=status.HTTP_404_NOT_FOUND, detail=detail
         )
 
+
+class ConflictError(HTTPException):
+    """Exception raised when a resource is not in the requested state."""
+
+    def __init__(self, detail: str):
+        super().__init__(
+            status_code=status.HTTP_409_CONFLICT, detail=detail
+        )
@@ -9,7 +9,8 @@ def get_labels(addresses: List[str], ALLIUM_API_KEY: str) -> Optional[Dict[str,
         addresses: List of Ethereum addresses to lookup
 
     Returns:
-        dict: Dictionary mapping addresses to their labels
+        dict: Dictionary mapping the lowercased addresses to their labels,
+            empty if none is labeled, or None if the lookup failed
     """
     try:
         params = ""
@@ -28,7 +29,7 @@ def get_labels(addresses: List[str], ALLIUM_API_KEY: str) -> Optional[Dict[str,
 
         print(response.json())
         json = response.json()
-        if 'data' in json and len(json['data']) > 0:
+        if 'data' in json:
             labels = {item['address']: item['name'] for item in json['data']}
             return labels
         else:
@@ -0,0 +1,25 @@
+from scsc.utils import close_providers, get_web3
+from web3 import Web3
+
+from core.config import settings
+
+
+def get_w3() -> Web3:
+    """
+    Returns the Web3 instance of the configured Ethereum node, shared by
+    all requests of the process so that connections are kept alive and
+    the node is only checked once.
+
+    Raises:
+        ConnectionError: If the node cannot be reached
+    """
+    return get_web3(
+        settings.eth_node_url, pool_size=settings.eth_node_pool_size
+    )
+
+
+def close_w3() -> None:
+    """
+    Closes the pooled connections to the Ethereum node.
+    """
+    close_providers()
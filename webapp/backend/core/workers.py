@@ -0,0 +1,79 @@
+import asyncio
+from functools import partial
+from typing import Any, Callable, Dict, Hashable, TypeVar
+
+import anyio
+from anyio import to_thread
+
+from core.config import settings
+
+T = TypeVar("T")
+
+_limiters: Dict[str, anyio.CapacityLimiter] = {}
+
+# Analyses running in the pool, by the key of their request
+_in_flight: Dict[Hashable, asyncio.Future] = {}
+
+
+def _get_limiter(name: str, total_tokens: int) -> anyio.CapacityLimiter:
+    """
+    Returns the limiter of a worker pool. It is created on first use
+    since it must be bound to the event loop.
+    """
+    if name not in _limiters:
+        _limiters[name] = anyio.CapacityLimiter(total_tokens)
+    return _limiters[name]
+
+
+def get_analysis_limiter() -> anyio.CapacityLimiter:
+    """
+    Returns the limiter bounding the analyses running at once.
+    """
+    return _get_limiter("analysis", settings.analysis_workers)
+
+
+def get_job_limiter() -> anyio.CapacityLimiter:
+    """
+    Returns the limiter bounding the background jobs running at once,
+    separate from the analyses so that long jobs do not hold up requests.
+    """
+    return _get_limiter("job", settings.job_workers)
+
+
+async def run_analysis(func: Callable[..., T], *args: Any, **kwargs: Any) -> T:
+    """
+    Runs a blocking analysis in a worker thread, so that the event loop
+    keeps serving other requests while it waits on the Ethereum node, the
+    label API and the database. At most `ANALYSIS_WORKERS` analyses run
+    at once, further requests wait for a free worker.
+    """
+    return await to_thread.run_sync(
+        partial(func, *args, **kwargs), limiter=get_analysis_limiter()
+    )
+
+
+async def run_analysis_once(
+    key: Hashable, func: Callable[..., T], *args: Any, **kwargs: Any
+) -> T:
+    """
+    Runs a blocking analysis like `run_analysis`, unless one with the same
+    key is already running, in which case its result is awaited instead.
+    Concurrent identical requests thus cost a single analysis. A request
+    that is cancelled does not cancel the analysis shared with others.
+    """
+    future = _in_flight.get(key)
+    if future is None:
+        future = asyncio.ensure_future(run_analysis(func, *args, **kwargs))
+        _in_flight[key] = future
+        future.add_done_callback(lambda _: _in_flight.pop(key, None))
+    return await asyncio.shield(future)
+
+
+async def run_job(func: Callable[..., T], *args: Any, **kwargs: Any) -> T:
+    """
+    Runs a blocking background job in a worker thread. At most
+    `JOB_WORKERS` jobs run at once, further jobs wait in queue order.
+    """
+    return await to_thread.run_sync(
+        partial(func, *args, **kwargs), limiter=get_job_limiter()
+    )
@@ -0,0 +1,84 @@
+from datetime import datetime
+from typing import Any, List
+
+from sqlalchemy import update
+from sqlmodel import Session, select
+
+from models.job import AnalysisJob, AnalysisJobCreate, JobStatus
+
+
+def create_job(session: Session, job_data: AnalysisJobCreate) -> AnalysisJob:
+    job = AnalysisJob(**job_data.model_dump())
+    session.add(job)
+    session.commit()
+    session.refresh(job)
+    return job
+
+
+def get_job(session: Session, job_id: str) -> AnalysisJob | None:
+    return session.get(AnalysisJob, job_id)
+
+
+def update_job(
+    session: Session, job: AnalysisJob, **fields: Any
+) -> AnalysisJob:
+    for name, value in fields.items():
+        setattr(job, name, value)
+    job.last_updated = datetime.now()
+    session.add(job)
+    session.commit()
+    session.refresh(job)
+    return job
+
+
+def get_unfinished_jobs(session: Session) -> List[AnalysisJob]:
+    stmt = (
+        select(AnalysisJob)
+        .where(AnalysisJob.status.in_([JobStatus.QUEUED, JobStatus.RUNNING]))
+        .order_by(AnalysisJob.date_added)
+    )
+    return list(session.exec(stmt).all())
+
+
+def claim_job(
+    session: Session,
+    job_id: str,
+    expected: JobStatus,
+    owner: str,
+    updated_before: datetime | None = None,
+) -> bool:
+    """
+    Marks a job as running by `owner` if it still has the `expected`
+    status and, if `updated_before` is given, was last updated before it.
+    The check and the update are a single statement, so that at most one
+    worker claims a job. Returns whether the job was claimed.
+    """
+    stmt = update(AnalysisJob).where(
+        AnalysisJob.id == job_id, AnalysisJob.status == expected
+    )
+    if updated_before is not None:
+        stmt = stmt.where(AnalysisJob.last_updated < updated_before)
+    result = session.execute(
+        stmt.values(
+            status=JobStatus.RUNNING, owner=owner, last_updated=datetime.now()
+        )
+    )
+    session.commit()
+    return result.rowcount == 1
+
+
+def update_owned_job(
+    session: Session, job_id: str, owner: str, **fields: Any
+) -> bool:
+    """
+    Updates a job if it is still owned by `owner`. The check and the
+    update are a single statement, so that a worker whose job was taken
+    over does not overwrite it. Returns whether the job was updated.
+    """
+    result = session.execute(
+        update(AnalysisJob)
+        .where(AnalysisJob.id == job_id, AnalysisJob.owner == owner)
+        .values(**fields, last_updated=datetime.now())
+    )
+    session.commit()
+    return result.rowcount == 1
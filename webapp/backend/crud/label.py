@@ -1,7 +1,14 @@
+from sqlalchemy.dialects import postgresql, sqlite
 from sqlmodel import Session, select
-from models.label import Label, LabelCreate, LabelUpdate, AddressList
+from models.label import (
+    Label,
+    LabelCreate,
+    LabelUpdate,
+    AddressList,
+    UnlabeledAddress,
+)
 from datetime import datetime
-from typing import List, Dict
+from typing import Dict, Iterable, List
 
 def create_label(session: Session, label_data: LabelCreate) -> Label:
     label = Label(**label_data.model_dump())
@@ -32,4 +39,68 @@ def update_label(session: Session, address: str, label_data: LabelUpdate) -> Lab
 def get_labels(session: Session, addresses: AddressList) -> List[Label]:
     stmt = select(Label).where(Label.address.in_(addresses.addresses))
     result = session.exec(stmt).all()
-    return {row.address: row.label for row in result}
\ No newline at end of file
+    return {row.address: row.label for row in result}
+
+
+def get_unlabeled(
+    session: Session, addresses: AddressList, since: datetime
+) -> Dict[str, datetime]:
+    stmt = select(UnlabeledAddress).where(
+        UnlabeledAddress.address.in_(addresses.addresses),
+        UnlabeledAddress.last_checked >= since,
+    )
+    result = session.exec(stmt).all()
+    return {row.address: row.last_checked for row in result}
+
+
+def _insert(session: Session):
+    if session.get_bind().dialect.name == "postgresql":
+        return postgresql.insert
+    return sqlite.insert
+
+
+def upsert_labels(session: Session, labels: Dict[str, str]) -> None:
+    """
+    Inserts or updates labels in one statement, without committing.
+    """
+    if not labels:
+        return
+    now = datetime.now()
+    stmt = _insert(session)(Label).values(
+        [
+            {
+                "address": address,
+                "label": label,
+                "date_added": now,
+                "last_updated": now,
+            }
+            for address, label in labels.items()
+        ]
+    )
+    session.execute(
+        stmt.on_conflict_do_update(
+            index_elements=[Label.address],
+            set_={
+                "label": stmt.excluded.label,
+                "last_updated": stmt.excluded.last_updated,
+            },
+        )
+    )
+
+
+def upsert_unlabeled(session: Session, addresses: Iterable[str]) -> None:
+    """
+    Records addresses as checked without a label in one statement,
+    without committing.
+    """
+    now = datetime.now()
+    rows = [{"address": a, "last_checked": now} for a in addresses]
+    if not rows:
+        return
+    stmt = _insert(session)(UnlabeledAddress).values(rows)
+    session.execute(
+        stmt.on_conflict_do_update(
+            index_elements=[UnlabeledAddress.address],
+            set_={"last_checked": stmt.excluded.last_checked},
+        )
+    )
@@ -0,0 +1,72 @@
+from datetime import datetime
+from typing import Any, Dict
+
+from sqlalchemy import delete, func, tuple_
+from sqlalchemy.exc import IntegrityError
+from sqlmodel import Session, select
+
+from models.network_cache import CachedNetwork
+
+
+def get_cached_network(
+    session: Session,
+    address: str,
+    from_block: int,
+    to_block: int,
+    engine_version: str,
+) -> Dict[str, Any] | None:
+    entry = session.get(
+        CachedNetwork, (address, from_block, to_block, engine_version)
+    )
+    if not entry:
+        return None
+    entry.last_accessed = datetime.now()
+    session.add(entry)
+    session.commit()
+    return entry.network
+
+
+def create_cached_network(session: Session, entry: CachedNetwork) -> None:
+    session.add(entry)
+    try:
+        session.commit()
+    except IntegrityError:
+        # Stored meanwhile by a concurrent analysis of the same range
+        session.rollback()
+
+
+def prune_cached_networks(session: Session, max_size: int) -> int:
+    """
+    Deletes the least recently accessed networks until the total size of
+    the cache is at most `max_size` bytes, and returns their number.
+    """
+    total = session.exec(
+        select(func.coalesce(func.sum(CachedNetwork.size), 0))
+    ).one()
+    if total <= max_size:
+        return 0
+    stmt = select(
+        CachedNetwork.address,
+        CachedNetwork.from_block,
+        CachedNetwork.to_block,
+        CachedNetwork.engine_version,
+        CachedNetwork.size,
+    ).order_by(CachedNetwork.last_accessed)
+    pruned = []
+    for *key, size in session.exec(stmt).all():
+        if total <= max_size:
+            break
+        total -= size
+        pruned.append(tuple(key))
+    session.execute(
+        delete(CachedNetwork).where(
+            tuple_(
+                CachedNetwork.address,
+                CachedNetwork.from_block,
+                CachedNetwork.to_block,
+                CachedNetwork.engine_version,
+            ).in_(pruned)
+        )
+    )
+    session.commit()
+    return len(pruned)
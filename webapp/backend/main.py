@@ -1,10 +1,14 @@
+import asyncio
+
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
 from contextlib import asynccontextmanager
 
 from core.logging import setup_logging
 from core.database import create_db_and_tables
-from routers import analysis, health, info
+from core.provider import close_w3
+from routers import analysis, health, info, jobs
+from services.job_service import resume_jobs, watch_jobs
 
 # Setup logging
 setup_logging()
@@ -12,10 +16,16 @@ setup_logging()
 
 @asynccontextmanager
 async def lifespan(app: FastAPI):
-    # Startup: create tables
+    # Startup: create tables, queue the unfinished analysis jobs and
+    # watch for jobs left by stopped workers
     create_db_and_tables()
+    await resume_jobs()
+    watcher = asyncio.create_task(watch_jobs())
     yield
-    # Shutdown: add cleanup here if needed
+    # Shutdown: stop watching jobs and close the connections to the
+    # Ethereum node
+    watcher.cancel()
+    close_w3()
 
 # Create FastAPI app
 app = FastAPI(
@@ -40,6 +50,7 @@ app.add_middleware(
 app.include_router(health.router)
 app.include_router(analysis.router)
 app.include_router(info.router)
+app.include_router(jobs.router)
 
 
 @app.get("/")
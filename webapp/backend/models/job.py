@@ -0,0 +1,43 @@
+from datetime import datetime
+from enum import Enum
+from typing import Any, Dict, Optional
+from uuid import uuid4
+
+from sqlalchemy import JSON, Column
+from sqlmodel import Field, SQLModel
+
+
+class JobStatus(str, Enum):
+    QUEUED = "queued"
+    RUNNING = "running"
+    DONE = "done"
+    FAILED = "failed"
+
+
+class AnalysisJob(SQLModel, table=True):
+    id: str = Field(default_factory=lambda: uuid4().hex, primary_key=True)
+    address: str = Field(index=True)
+    # Requested range, resolved to the latest blocks when the job starts
+    # if not given
+    from_block: Optional[int] = None
+    to_block: Optional[int] = None
+    status: JobStatus = Field(default=JobStatus.QUEUED, index=True)
+    # Worker process running the job, which refreshes `last_updated`
+    # after each chunk of blocks
+    owner: Optional[str] = None
+    blocks_done: int = 0
+    blocks_total: int = 0
+    txs_traced: int = 0
+    error: Optional[str] = None
+    # Dependency network of the contract once the job is done
+    result: Optional[Dict[str, Any]] = Field(
+        default=None, sa_column=Column(JSON)
+    )
+    date_added: datetime = Field(default_factory=datetime.now)
+    last_updated: datetime = Field(default_factory=datetime.now)
+
+
+class AnalysisJobCreate(SQLModel):
+    address: str
+    from_block: Optional[int] = None
+    to_block: Optional[int] = None
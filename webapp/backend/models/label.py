@@ -10,6 +10,13 @@ class Label(SQLModel, table=True):
     last_updated: datetime = Field(default_factory=datetime.now)
 
 
+class UnlabeledAddress(SQLModel, table=True):
+    """Address found without a label, looked up again after a TTL."""
+
+    address: str = Field(primary_key=True)
+    last_checked: datetime = Field(default_factory=datetime.now)
+
+
 class LabelCreate(SQLModel):
     address: str
     label: str
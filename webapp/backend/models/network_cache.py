@@ -0,0 +1,18 @@
+from datetime import datetime
+from typing import Any, Dict
+
+from sqlalchemy import JSON, Column
+from sqlmodel import Field, SQLModel
+
+
+class CachedNetwork(SQLModel, table=True):
+    address: str = Field(primary_key=True)
+    from_block: int = Field(primary_key=True)
+    to_block: int = Field(primary_key=True)
+    # Version of the analysis engine that computed the network
+    engine_version: str = Field(primary_key=True)
+    network: Dict[str, Any] = Field(sa_column=Column(JSON, nullable=False))
+    # Size of the serialized network in bytes
+    size: int
+    date_added: datetime = Field(default_factory=datetime.now)
+    last_accessed: datetime = Field(default_factory=datetime.now, index=True)
@@ -1,8 +1,8 @@
-from fastapi import APIRouter, Query, status, Depends
-from sqlalchemy.orm import Session
+from anyio import to_thread
+from fastapi import APIRouter, Query, status
 from loguru import logger
 
-from core.database import get_session
+from core.workers import run_analysis_once
 from schemas.analysis import (
     ContractDependenciesRequest,
     ContractDependenciesResponse,
@@ -11,6 +11,7 @@ from schemas.analysis import (
 )
 from schemas.response import ErrorResponse
 from services.analysis_service import (
+    analysis_key,
     analyze_contract_dependencies,
     calculate_contract_risk,
 )
@@ -42,10 +43,10 @@ async def get_contract_dependencies(
     address: str,
     from_block: str = Query(None, description="Start block"),
     to_block: str = Query(None, description="End block"),
-    session: Session = Depends(get_session),
 ):
     """
-    Get the dependency network for a contract.
+    Get the dependency network for a contract. Identical requests made
+    while an analysis is running share its result.
 
     - **address**: Ethereum contract address
     - **from_block**: Optional start block for analysis
@@ -55,11 +56,17 @@ async def get_contract_dependencies(
         address=address, from_block=from_block, to_block=to_block
     )
 
-    network = analyze_contract_dependencies(
-        session=session,
+    # The latest block is fetched off the event loop if no range is given
+    key = await to_thread.run_sync(
+        analysis_key, request.address, request.from_block, request.to_block
+    )
+    _, from_block, to_block = key
+    network = await run_analysis_once(
+        key,
+        analyze_contract_dependencies,
         address=request.address,
-        from_block=request.from_block,
-        to_block=request.to_block,
+        from_block=from_block,
+        to_block=to_block,
     )
 
     return ContractDependenciesResponse(
@@ -69,6 +76,7 @@ async def get_contract_dependencies(
         n_nodes=network["n_nodes"],
         nodes=network["nodes"],
         edges=network["edges"],
+        cached=network.get("cached", False),
     )
 
 
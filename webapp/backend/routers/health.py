@@ -1,8 +1,7 @@
 from fastapi import APIRouter, status
 from loguru import logger
-from web3 import Web3
 
-from core.config import settings
+from core.provider import get_w3
 
 router = APIRouter(
     prefix="/health",
@@ -29,13 +28,15 @@ async def health_check():
     summary="Ethereum node health check",
     description="Check if the Ethereum node connection is working.",
 )
-async def eth_node_health_check():
+def eth_node_health_check():
     """
     Check if the Ethereum node connection is working.
     """
     try:
-        w3 = Web3(Web3.HTTPProvider(settings.eth_node_url))
-        connected = w3.is_connected()
+        try:
+            connected = get_w3().is_connected()
+        except ConnectionError:
+            connected = False
         return {
             "status": "healthy",
             "eth_node": "connected" if connected else "disconnected",
@@ -31,7 +31,7 @@ router = APIRouter(
     summary="Get latest block number",
     description="Fetch the latest block number from the Ethereum network.",
 )
-async def get_latest_block():
+def get_latest_block():
     """
     Get the latest block number from the Ethereum network.
     """
@@ -61,7 +61,7 @@ async def get_latest_block():
     summary="Get deployment information",
     description="Fetch deployment information for a given contract address.",
 )
-async def get_deployment_info(
+def get_deployment_info(
     address: str,
     session: Session = Depends(get_session),
 ):
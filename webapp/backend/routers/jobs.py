@@ -0,0 +1,119 @@
+from fastapi import APIRouter, Depends, status
+from sqlalchemy.orm import Session
+
+from core.database import get_session
+from models.job import AnalysisJob
+from schemas.analysis import ContractDependenciesResponse
+from schemas.job import AnalysisJobRequest, AnalysisJobResponse
+from schemas.response import ErrorResponse
+from services.job_service import get_job_result, get_job_status, submit_job
+
+router = APIRouter(
+    prefix="/v1/jobs",
+    tags=["jobs"],
+)
+
+
+def _job_response(job: AnalysisJob) -> AnalysisJobResponse:
+    return AnalysisJobResponse(
+        job_id=job.id,
+        address=job.address,
+        status=job.status,
+        from_block=job.from_block,
+        to_block=job.to_block,
+        blocks_done=job.blocks_done,
+        blocks_total=job.blocks_total,
+        txs_traced=job.txs_traced,
+        error=job.error,
+        created_at=job.date_added,
+        updated_at=job.last_updated,
+    )
+
+
+@router.post(
+    "",
+    response_model=AnalysisJobResponse,
+    responses={
+        422: {
+            "description": "Input validation error",
+            "model": ErrorResponse,
+        },
+    },
+    status_code=status.HTTP_202_ACCEPTED,
+    summary="Submit a dependency analysis job",
+    description="Queue the dependency analysis of a contract in the background and return its job ID.",
+)
+async def submit_analysis_job(request: AnalysisJobRequest):
+    """
+    Submit a background dependency analysis, for block ranges too wide
+    to be analyzed within a request.
+
+    - **address**: Ethereum contract address
+    - **from_block**: Optional start block for analysis
+    - **to_block**: Optional end block for analysis
+    """
+    job = await submit_job(
+        address=request.address,
+        from_block=request.from_block,
+        to_block=request.to_block,
+    )
+    return _job_response(job)
+
+
+@router.get(
+    "/{job_id}",
+    response_model=AnalysisJobResponse,
+    responses={
+        404: {
+            "description": "Job not found",
+            "model": ErrorResponse,
+        },
+    },
+    status_code=status.HTTP_200_OK,
+    summary="Get analysis job status",
+    description="Return the status and progress of an analysis job.",
+)
+def get_analysis_job(job_id: str, session: Session = Depends(get_session)):
+    """
+    Get the status and progress of an analysis job, to be polled until
+    it is done or failed.
+    """
+    return _job_response(get_job_status(session, job_id))
+
+
+@router.get(
+    "/{job_id}/result",
+    response_model=ContractDependenciesResponse,
+    responses={
+        404: {
+            "description": "Job not found",
+            "model": ErrorResponse,
+        },
+        409: {
+            "description": "Job not done yet",
+            "model": ErrorResponse,
+        },
+        500: {
+            "description": "Job failed",
+            "model": ErrorResponse,
+        },
+    },
+    status_code=status.HTTP_200_OK,
+    summary="Get analysis job result",
+    description="Return the dependency network computed by a finished analysis job.",
+)
+def get_analysis_job_result(
+    job_id: str, session: Session = Depends(get_session)
+):
+    """
+    Get the dependency network computed by an analysis job.
+    """
+    network = get_job_result(session, job_id)
+    return ContractDependenciesResponse(
+        address=network["contract_address"],
+        from_block=network["from_block"],
+        to_block=network["to_block"],
+        n_nodes=network["n_nodes"],
+        nodes=network["nodes"],
+        edges=network["edges"],
+    )
@@ -20,6 +20,9 @@ class ContractDependenciesResponse(BaseModel):
     n_nodes: int
     nodes: Dict[str, str]
     edges: List[Dict[str, Any]]
+    cached: bool = Field(
+        False, description="Whether the network was served from cache"
+    )
 
 
 class ContractRiskRequest(BaseModel):
@@ -0,0 +1,30 @@
+from datetime import datetime
+from typing import Optional
+
+from pydantic import BaseModel, Field
+
+from models.job import JobStatus
+
+
+class AnalysisJobRequest(BaseModel):
+    """Request model for background dependency analysis jobs."""
+
+    address: str = Field(..., description="Contract address to analyze")
+    from_block: Optional[str] = Field(None, description="Start block")
+    to_block: Optional[str] = Field(None, description="End block")
+
+
+class AnalysisJobResponse(BaseModel):
+    """Response model for the status and progress of an analysis job."""
+
+    job_id: str
+    address: str
+    status: JobStatus
+    from_block: Optional[int] = None
+    to_block: Optional[int] = None
+    blocks_done: int = Field(..., description="Blocks collected so far")
+    blocks_total: int = Field(..., description="Blocks in the range")
+    txs_traced: int = Field(..., description="Transactions traced so far")
+    error: Optional[str] = None
+    created_at: datetime
+    updated_at: datetime
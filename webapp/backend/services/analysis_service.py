@@ -1,7 +1,14 @@
-from typing import Any, Dict, Optional, List
+import json
+from importlib.metadata import PackageNotFoundError, version
+from typing import Any, Dict, Optional, Tuple
 
 from loguru import logger
 from scsc.supply_chain import SupplyChain
+from scsc.traces.trace_cache import FINALITY_DEPTH
+from scsc.utils import (
+    validate_and_convert_block,
+    validate_and_convert_block_range,
+)
 
 from sqlmodel import Session
 
@@ -9,16 +16,28 @@ from sqlmodel import Session
 
 from core.config import settings
 from core.exceptions import InputValidationError, InternalServerError
-from core.metadata import get_labels
-from core.database import get_session
+from core.provider import get_w3
+from core.database import engine
 import crud.label
+import crud.network_cache
+from models.network_cache import CachedNetwork
+from services.label_service import resolve_labels
+
+try:
+    # Networks computed by other versions of scsc are not served from cache
+    ENGINE_VERSION = version("scsc")
+except PackageNotFoundError:
+    ENGINE_VERSION = "unknown"
+
+# Blocks analyzed when no block range is given
+DEFAULT_BLOCKS = 10
 
 
 def analyze_contract_dependencies(
-    session: Session,
     address: str,
-    from_block: Optional[str] = None,
-    to_block: Optional[str] = None,
+    from_block: Optional[str | int] = None,
+    to_block: Optional[str | int] = None,
+    session: Optional[Session] = None,
 ) -> Dict[str, Any]:
     """
     Analyze contract dependencies.
@@ -27,6 +46,8 @@ def analyze_contract_dependencies(
         address: Contract address to analyze
         from_block: Start block (optional)
         to_block: End block (optional)
+        session: Database session (optional), one is opened for the
+            analysis if not given, since it may outlive the request
 
     Returns:
         Dict containing the analysis results
@@ -40,11 +61,10 @@ def analyze_contract_dependencies(
         logger.info(f"Analyzing contract {address}")
 
         _validate_block_range(from_block, to_block)
-        sc = SupplyChain(settings.eth_node_url, address)
-        network = sc.get_network(from_block, to_block)
-        network["nodes"] = _process_node_labels(session, network)
-        logger.info(f"Analysis completed for {address}")
-        return network
+        if session is None:
+            with Session(engine) as session:
+                return _analyze(session, address, from_block, to_block)
+        return _analyze(session, address, from_block, to_block)
 
     except ValueError as e:
         logger.error(f"Analyze contract dependencies: {e}")
@@ -53,6 +73,109 @@ def analyze_contract_dependencies(
         logger.error(f"Internal server error: {e}")
         raise InternalServerError(f"Failed to analyze contract: {str(e)}") from e
 
+def _analyze(
+    session: Session,
+    address: str,
+    from_block: Optional[str | int],
+    to_block: Optional[str | int],
+) -> Dict[str, Any]:
+    """
+    Serves the network of a final block range from the result cache, or
+    computes it, storing it in the cache if the range is final.
+    """
+    key = final_range_key(address, from_block, to_block)
+    if key is not None:
+        network = crud.network_cache.get_cached_network(
+            session, *key, ENGINE_VERSION
+        )
+        if network is not None:
+            logger.info(f"Analysis served from cache for {address}")
+            return {**network, "cached": True}
+
+    sc = SupplyChain(settings.eth_node_url, address, w3=get_w3())
+    network = sc.get_network(from_block, to_block)
+    network["nodes"] = process_node_labels(session, network)
+    logger.info(f"Analysis completed for {address}")
+    if key is not None:
+        cache_network(session, key, network)
+    return {**network, "cached": False}
+
+
+def analysis_key(
+    address: str, from_block: Optional[str], to_block: Optional[str]
+) -> Tuple[str, Any, Any]:
+    """
+    Returns the key identifying the analysis of a request: the lower-case
+    address and the block numbers as integers, the latest blocks being
+    resolved if no block range is given, so that equivalent requests
+    share one analysis. Invalid block numbers are kept as given for the
+    analysis to reject them.
+
+    Raises:
+        InternalServerError: If the latest block cannot be fetched
+    """
+    if from_block is None and to_block is None:
+        try:
+            to_block = get_w3().eth.block_number
+        except Exception as e:
+            logger.error(f"Internal server error: {e}")
+            raise InternalServerError(
+                f"Failed to get the latest block: {str(e)}"
+            ) from e
+        from_block = to_block - DEFAULT_BLOCKS
+    return address.lower(), _block_key(from_block), _block_key(to_block)
+
+
+def _block_key(block: Optional[str | int]) -> Optional[str | int]:
+    try:
+        return int(validate_and_convert_block(block), 16)
+    except ValueError:
+        return block
+
+
+def final_range_key(
+    address: str,
+    from_block: Optional[str | int],
+    to_block: Optional[str | int],
+) -> Optional[Tuple[str, int, int]]:
+    """
+    Returns the cache key of a block range if all its blocks are final,
+    None otherwise.
+    """
+    if from_block is None or to_block is None:
+        return None
+    from_block_hex, to_block_hex = validate_and_convert_block_range(
+        from_block, to_block
+    )
+    end = int(to_block_hex, 16)
+    if end > get_w3().eth.block_number - FINALITY_DEPTH:
+        return None
+    return address.lower(), int(from_block_hex, 16), end
+
+
+def cache_network(
+    session: Session, key: Tuple[str, int, int], network: Dict[str, Any]
+) -> None:
+    """
+    Stores the network of a final block range in the result cache, then
+    prunes the least recently used networks beyond the size limit.
+    """
+    entry = CachedNetwork(
+        address=key[0],
+        from_block=key[1],
+        to_block=key[2],
+        engine_version=ENGINE_VERSION,
+        network=network,
+        size=len(json.dumps(network)),
+    )
+    crud.network_cache.create_cached_network(session, entry)
+    pruned = crud.network_cache.prune_cached_networks(
+        session, settings.result_cache_max_size
+    )
+    if pruned:
+        logger.info(f"Pruned {pruned} networks from the result cache.")
+
+
 def _validate_block_range(from_block: Optional[str], to_block: Optional[str]) -> None:
     """Validate the block range if provided."""
     if to_block is not None and from_block is not None:
@@ -64,44 +187,15 @@ def _validate_block_range(from_block: Optional[str], to_block: Optional[str]) ->
         except ValueError:
             raise ValueError("Block numbers must be valid integers")
 
-def _process_node_labels(session: Session, network: Optional[Dict[str, Any]]) -> List[str]:
+def process_node_labels(session: Session, network: Optional[Dict[str, Any]]) -> Dict[str, str]:
     if not network:
             raise Exception("No network data found")
     if "nodes" not in network:
         raise Exception("No nodes found in network data")
     if not isinstance(network["nodes"], list):
         raise Exception("Nodes data is not a list")
-    nodes = network["nodes"]
     logger.info("Processing node labels.")
-    logger.info("Fetching labels from database.")
-    stored_labels = crud.label.get_labels(
-        session, crud.label.AddressList(addresses=nodes)
-    )
-    logger.info(f"Stored labels: {stored_labels}")
-
-    logger.info("Labels fetched from database.")
-    missing_addresses = set(nodes) - set(stored_labels.keys())
-    
-    if not missing_addresses:
-            return stored_labels
-
-    # Fetch and store missing labels
-    allium_labels = get_labels(list(missing_addresses), settings.allium_api_key)
-    new_labels = {}
-
-    for addr in missing_addresses:
-        if allium_labels and addr.lower() in allium_labels:
-            label = allium_labels[addr.lower()]
-            new_labels[addr] = label
-            logger.info(f"Label for {addr}: {label}")
-            crud.label.create_label(
-                session,
-                crud.label.LabelCreate(address=addr, label=label)
-            )
-            logger.info(f"Label {label} for {addr} stored in database.")
-        else:
-            new_labels[addr] = addr
-    return {**stored_labels, **new_labels}
+    return resolve_labels(session, network["nodes"])
 
 def calculate_contract_risk(address: str) -> Dict[str, Any]:
     """
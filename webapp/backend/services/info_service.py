@@ -7,6 +7,7 @@ from sqlmodel import Session
 from core.config import settings
 from core.exceptions import InternalServerError, NotFoundError, InputValidationError
 from core.metadata import get_deployment
+from core.provider import get_w3
 
 import crud.deployment
 from models.deployment import DeploymentCreate
@@ -19,8 +20,7 @@ def get_latest_block_number() -> int:
         Latest block number
     """
     try:
-        w3 = Web3(Web3.HTTPProvider(settings.eth_node_url))
-        latest_block = w3.eth.get_block_number()
+        latest_block = get_w3().eth.get_block_number()
         return latest_block
     except Exception as e:
         logger.error(f"Error fetching latest block: {e}")
@@ -0,0 +1,259 @@
+import asyncio
+import os
+import socket
+from datetime import datetime, timedelta
+from typing import Any, Dict, List, Optional, Tuple
+
+from anyio import to_thread
+from loguru import logger
+from scsc.supply_chain import SupplyChain
+from scsc.utils import (
+    validate_and_convert_address,
+    validate_and_convert_block_range,
+)
+from sqlmodel import Session
+
+import crud.job
+from core.config import settings
+from core.database import engine
+from core.exceptions import (
+    ConflictError,
+    InputValidationError,
+    InternalServerError,
+    NotFoundError,
+)
+from core.provider import get_w3
+from core.workers import run_job
+from models.job import AnalysisJob, AnalysisJobCreate, JobStatus
+from services.analysis_service import (
+    DEFAULT_BLOCKS,
+    cache_network,
+    final_range_key,
+    process_node_labels,
+)
+
+# Owner of the jobs claimed by this process
+WORKER_ID = f"{socket.gethostname()}:{os.getpid()}"
+
+# Tasks of the jobs queued and running in this process by job ID,
+# referenced until they finish
+_tasks: Dict[str, asyncio.Task] = {}
+
+
+def _validate_job(
+    address: str, from_block: Optional[str], to_block: Optional[str]
+) -> AnalysisJobCreate:
+    """
+    Validates the address and block range of a job.
+
+    Raises:
+        InputValidationError: If the input is invalid
+    """
+    try:
+        address = validate_and_convert_address(address)
+        if from_block is None and to_block is None:
+            return AnalysisJobCreate(address=address)
+        if from_block is None or to_block is None:
+            raise ValueError("Both from_block and to_block must be given.")
+        from_block_hex, to_block_hex = validate_and_convert_block_range(
+            from_block, to_block
+        )
+        start, end = int(from_block_hex, 16), int(to_block_hex, 16)
+        if end - start > settings.max_job_block_range:
+            raise ValueError(
+                f"Block range exceeds maximum limit of "
+                f"{settings.max_job_block_range} blocks."
+            )
+        return AnalysisJobCreate(
+            address=address, from_block=start, to_block=end
+        )
+    except ValueError as e:
+        raise InputValidationError(str(e)) from e
+
+
+def _create_job(job_data: AnalysisJobCreate) -> AnalysisJob:
+    with Session(engine) as session:
+        return crud.job.create_job(session, job_data)
+
+
+def enqueue_job(job_id: str, status: JobStatus = JobStatus.QUEUED) -> None:
+    """
+    Schedules a job with the given status on the job workers of this
+    process, unless it is already scheduled.
+    """
+    if job_id in _tasks:
+        return
+    task = asyncio.get_running_loop().create_task(
+        run_job(execute_job, job_id, status)
+    )
+    _tasks[job_id] = task
+    task.add_done_callback(lambda _: _tasks.pop(job_id, None))
+
+
+async def submit_job(
+    address: str, from_block: Optional[str], to_block: Optional[str]
+) -> AnalysisJob:
+    """
+    Stores a dependency analysis job and queues it.
+
+    Args:
+        address: Contract address to analyze
+        from_block: Start block (optional)
+        to_block: End block (optional)
+
+    Returns:
+        The queued job
+
+    Raises:
+        InputValidationError: If the input is invalid
+    """
+    job_data = _validate_job(address, from_block, to_block)
+    job = await to_thread.run_sync(_create_job, job_data)
+    enqueue_job(job.id)
+    logger.info(f"Queued analysis job {job.id} for {job.address}")
+    return job
+
+
+def _stale_before() -> datetime:
+    return datetime.now() - timedelta(seconds=settings.job_stale_seconds)
+
+
+def _resumable_jobs() -> List[Tuple[str, JobStatus]]:
+    stale_before = _stale_before()
+    with Session(engine) as session:
+        jobs = crud.job.get_unfinished_jobs(session)
+    return [
+        (job.id, job.status)
+        for job in jobs
+        if job.status == JobStatus.QUEUED or job.last_updated < stale_before
+    ]
+
+
+async def resume_jobs() -> None:
+    """
+    Queues again the jobs left queued and the running jobs without
+    progress for `JOB_STALE_SECONDS`, whose worker presumably stopped,
+    which start over from their first block. Every process may queue the
+    same jobs: each one is run by the first worker to claim it.
+    """
+    jobs = await to_thread.run_sync(_resumable_jobs)
+    for job_id, status in jobs:
+        enqueue_job(job_id, status)
+    if jobs:
+        logger.info(f"Resumed {len(jobs)} analysis jobs.")
+
+
+async def watch_jobs() -> None:
+    """
+    Resumes the unfinished jobs every `JOB_STALE_SECONDS` until
+    cancelled, so that the jobs of stopped workers are taken over.
+    """
+    while True:
+        await asyncio.sleep(settings.job_stale_seconds)
+        try:
+            await resume_jobs()
+        except Exception as e:
+            logger.error(f"Failed to resume analysis jobs: {e}")
+
+
+def _block_range(job: AnalysisJob) -> Tuple[int, int]:
+    if job.from_block is not None and job.to_block is not None:
+        return job.from_block, job.to_block
+    latest_block = get_w3().eth.block_number
+    return latest_block - DEFAULT_BLOCKS, latest_block
+
+
+def execute_job(job_id: str, status: JobStatus = JobStatus.QUEUED) -> None:
+    """
+    Claims a job that still has the given status, or is stale if it is
+    running, then runs it, collecting its block range in chunks of
+    `JOB_CHUNK_BLOCKS` blocks and storing its progress after each chunk,
+    then stores the labeled dependency network. The job is abandoned if
+    another worker takes it over. Errors are stored in the job rather
+    than raised.
+    """
+    with Session(engine) as session:
+        updated_before = (
+            _stale_before() if status == JobStatus.RUNNING else None
+        )
+        if not crud.job.claim_job(
+            session, job_id, status, WORKER_ID, updated_before
+        ):
+            return
+        job = crud.job.get_job(session, job_id)
+
+        def update(**fields: Any) -> bool:
+            if crud.job.update_owned_job(session, job_id, WORKER_ID, **fields):
+                return True
+            logger.warning(f"Analysis job {job_id} was taken over")
+            return False
+
+        try:
+            start, end = _block_range(job)
+            if not update(
+                from_block=start,
+                to_block=end,
+                blocks_done=0,
+                blocks_total=end - start + 1,
+                txs_traced=0,
+                error=None,
+            ):
+                return
+            logger.info(f"Running analysis job {job_id} for {job.address}")
+            sc = SupplyChain(settings.eth_node_url, job.address, w3=get_w3())
+            for chunk_start in range(
+                start, end + 1, settings.job_chunk_blocks
+            ):
+                chunk_end = min(
+                    chunk_start + settings.job_chunk_blocks - 1, end
+                )
+                # Extends the collected range without collecting it again,
+                # checking addresses at the end of the job's range like
+                # the analysis of the whole range
+                sc.update_window(start, chunk_end, validation_block=end)
+                if not update(
+                    blocks_done=chunk_end - start + 1,
+                    txs_traced=sc.tc.traced_txs,
+                ):
+                    return
+            network = sc.get_network(start, end)
+            network["nodes"] = process_node_labels(session, network)
+            key = final_range_key(job.address, start, end)
+            if key is not None:
+                cache_network(session, key, network)
+            if update(status=JobStatus.DONE, result=network):
+                logger.info(f"Analysis job {job_id} completed")
+        except Exception as e:
+            logger.error(f"Analysis job {job_id} failed: {e}")
+            session.rollback()
+            update(status=JobStatus.FAILED, error=str(e))
+
+
+def get_job_status(session: Session, job_id: str) -> AnalysisJob:
+    """
+    Get a job with its status and progress.
+
+    Raises:
+        NotFoundError: If there is no such job
+    """
+    job = crud.job.get_job(session, job_id)
+    if job is None:
+        raise NotFoundError(f"No analysis job found with ID {job_id}")
+    return job
+
+
+def get_job_result(session: Session, job_id: str) -> Dict[str, Any]:
+    """
+    Get the dependency network computed by a job.
+
+    Raises:
+        NotFoundError: If there is no such job
+        ConflictError: If the job is not done
+        InternalServerError: If the job failed
+    """
+    job = get_job_status(session, job_id)
+    if job.status == JobStatus.FAILED:
+        raise InternalServerError(f"Analysis job failed: {job.error}")
+    if job.status != JobStatus.DONE:
+        raise ConflictError(f"Analysis job is {job.status.value}")
+    return job.result
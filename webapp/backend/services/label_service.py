@@ -0,0 +1,153 @@
+import threading
+from collections import OrderedDict
+from datetime import datetime, timedelta
+from typing import Dict, Iterable, List, Optional, Tuple
+
+from loguru import logger
+from sqlmodel import Session
+
+import crud.label
+from core.config import settings
+from core.metadata import get_labels
+from models.label import AddressList
+
+
+class LabelCache:
+    """
+    In-process LRU cache of address labels, in front of the label tables.
+    Addresses without a label are cached as None until their TTL expires.
+    """
+
+    def __init__(self, max_size: int, negative_ttl: timedelta):
+        self.max_size = max_size
+        self.negative_ttl = negative_ttl
+        # Label, or None with the time the address was checked
+        self._entries: OrderedDict[str, Tuple[Optional[str], datetime]] = (
+            OrderedDict()
+        )
+        self._lock = threading.Lock()
+
+    def get(self, address: str) -> Tuple[bool, Optional[str]]:
+        """
+        Returns whether the address is cached and its label.
+        """
+        with self._lock:
+            entry = self._entries.get(address)
+            if entry is None:
+                return False, None
+            label, checked = entry
+            if label is None and checked < datetime.now() - self.negative_ttl:
+                del self._entries[address]
+                return False, None
+            self._entries.move_to_end(address)
+            return True, label
+
+    def put(
+        self,
+        address: str,
+        label: Optional[str],
+        checked: Optional[datetime] = None,
+    ) -> None:
+        with self._lock:
+            self._entries[address] = (label, checked or datetime.now())
+            self._entries.move_to_end(address)
+            while len(self._entries) > self.max_size:
+                self._entries.popitem(last=False)
+
+
+label_cache = LabelCache(
+    settings.label_cache_size,
+    timedelta(seconds=settings.label_negative_ttl),
+)
+
+
+def _chunks(items: List[str], size: int) -> Iterable[List[str]]:
+    for i in range(0, len(items), size):
+        yield items[i : i + size]
+
+
+def resolve_labels(
+    session: Session, addresses: Iterable[str]
+) -> Dict[str, str]:
+    """
+    Resolve the labels of addresses, from the in-process cache, then the
+    database, then Allium, in chunks of `LABEL_BATCH_SIZE` addresses.
+
+    Labels found on Allium and addresses found without a label are stored
+    in one transaction, the latter so that they are only looked up again
+    after `LABEL_NEGATIVE_TTL` seconds.
+
+    Args:
+        session: Database session
+        addresses: Addresses to label
+
+    Returns:
+        dict: Dictionary mapping each address to its label, or to itself
+            if it has none
+    """
+    addresses = list(dict.fromkeys(addresses))
+    labels: Dict[str, str] = {}
+    missing = []
+    for address in addresses:
+        cached, label = label_cache.get(address)
+        if not cached:
+            missing.append(address)
+        else:
+            labels[address] = label or address
+    if not missing:
+        return labels
+
+    since = datetime.now() - timedelta(seconds=settings.label_negative_ttl)
+    unknown = []
+    for chunk in _chunks(missing, settings.label_batch_size):
+        stored = crud.label.get_labels(session, AddressList(addresses=chunk))
+        unlabeled = crud.label.get_unlabeled(
+            session, AddressList(addresses=chunk), since
+        )
+        for address in chunk:
+            if address in stored:
+                labels[address] = stored[address]
+                label_cache.put(address, stored[address])
+            elif address in unlabeled:
+                labels[address] = address
+                label_cache.put(address, None, unlabeled[address])
+            else:
+                unknown.append(address)
+    logger.info(
+        f"Labels of {len(addresses) - len(unknown)} addresses found in "
+        f"cache, {len(unknown)} to fetch."
+    )
+    if not unknown:
+        return labels
+
+    new_labels = {}
+    unlabeled = []
+    for chunk in _chunks(unknown, settings.label_batch_size):
+        fetched = get_labels(chunk, settings.allium_api_key)
+        if fetched is None:
+            # Lookup failed, the chunk is not remembered as unlabeled
+            labels.update((address, address) for address in chunk)
+            continue
+        for address in chunk:
+            label = fetched.get(address.lower())
+            if label:
+                new_labels[address] = label
+            else:
+                unlabeled.append(address)
+
+    for chunk in _chunks(list(new_labels), settings.label_batch_size):
+        crud.label.upsert_labels(session, {a: new_labels[a] for a in chunk})
+    for chunk in _chunks(unlabeled, settings.label_batch_size):
+        crud.label.upsert_unlabeled(session, chunk)
+    session.commit()
+    for address, label in new_labels.items():
+        labels[address] = label
+        label_cache.put(address, label)
+    for address in unlabeled:
+        labels[address] = address
+        label_cache.put(address, None)
+    logger.info(
+        f"Stored {len(new_labels)} new labels and "
+        f"{len(unlabeled)} unlabeled addresses."
+    )
+    return labels